@@ -0,0 +1,198 @@
+"""Reproducible benchmark suite for the hot paths of the Data Analysis & Visualization Tool.
+
+Times CSV loading, every chart builder (including Agg rasterisation, which is
+what canvas.draw() costs), every matrix operation and the regression
+train/score pipeline on seeded synthetic data, and records peak traced memory
+for each. Results are written as JSON and can be compared to a baseline run.
+
+    python benchmark.py --sizes small medium --output results.json
+    python benchmark.py --sizes large --baseline results.json --fail-threshold 0.2
+
+Each benchmark runs once to warm up, is timed `--repeats` times without tracing
+(min and median are reported), then runs once more under tracemalloc to
+measure peak memory.
+"""
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from engine import charts, dataset, matrix, model
+
+# name: (rows, numeric columns, categorical columns, square matrix size)
+SIZES = {
+    'small': (1_000, 5, 1, 64),
+    'medium': (100_000, 20, 2, 256),
+    'large': (1_000_000, 50, 2, 1024),
+    'wide': (10_000, 1_000, 2, 512),
+    'huge': (5_000_000, 100, 2, 2048),
+}
+
+
+def time_call(func, repeats):
+    """Return (min seconds, median seconds) over `repeats` untraced calls"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def run_benchmark(name, size, func, repeats, **info):
+    func()  # warm-up: first-use imports and caches are not part of the measurement
+    seconds_min, seconds_median = time_call(func, repeats)
+    # One outermost measurement; the measure_call timings inside fit/predict fold their peaks into it
+    _, _, peak = model.measure_call(func)
+    result = {
+        'name': name,
+        'size': size,
+        'seconds_min': seconds_min,
+        'seconds_median': seconds_median,
+        'repeats': repeats,
+        'peak_bytes': peak,
+    }
+    result.update(info)
+    print(f"  {name:<32}{seconds_median * 1000:>12.2f} ms{peak / 1e6:>12.1f} MB", file=sys.stderr)
+    return result
+
+
+def render_chart(builder, df):
+    fig = builder(df)
+    FigureCanvasAgg(fig).draw()
+
+
+def benchmark_size(size, repeats, models):
+    n_rows, n_numeric, n_categorical, matrix_size = SIZES[size]
+    print(f"[{size}] {n_rows} rows x {n_numeric + n_categorical + 1} columns", file=sys.stderr)
+    df = dataset.generate_synthetic_dataset(n_rows, n_numeric, n_categorical)
+    shape = {'rows': n_rows, 'columns': df.shape[1]}
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, f'{size}.csv')
+        df.to_csv(csv_path, index=False)
+        results.append(run_benchmark('load_csv', size, lambda: dataset.read_dataset(csv_path), repeats, **shape))
+        sample = dataset.sniff_file(csv_path)
+        results.append(run_benchmark(
+            'load_regression_columns', size,
+            lambda: dataset.load_regression_columns(csv_path, 'Target', sample), repeats, **shape))
+
+    for chart_name, builder in charts.CHART_BUILDERS.items():
+        try:
+            render_chart(builder, df)
+        except Exception as e:
+            print(f"  chart_{chart_name:<26}skipped: {e}", file=sys.stderr)
+            continue
+        results.append(run_benchmark(f'chart_{chart_name}', size,
+                                     lambda b=builder: render_chart(b, df), repeats, **shape))
+
+    rng = np.random.default_rng(42)
+    a = rng.standard_normal((matrix_size, matrix_size))
+    b = rng.standard_normal((matrix_size, matrix_size))
+    for op in matrix.MATRIX_OPERATIONS:
+        results.append(run_benchmark(f'matrix_{op}', size,
+                                     lambda op=op: matrix.matrix_operation(op, a, b), repeats,
+                                     rows=matrix_size, columns=matrix_size))
+
+    X = df[[f'Feature_{i + 1}' for i in range(n_numeric)]]
+    y = df['Target']
+    results.append(run_benchmark('regression_split', size, lambda: model.split_regression(X, y), repeats, **shape))
+    split = model.split_regression(X, y)
+    for name in models:
+        run = model.fit_registered_estimator(name, split)
+        if run is None:
+            print(f"  train_{name:<26}skipped: exceeds memory budget", file=sys.stderr)
+            continue
+        results.append(run_benchmark(f'train_{name}', size,
+                                     lambda name=name: model.fit_registered_estimator(name, split), repeats,
+                                     r2=run['metrics']['r2'], **shape))
+        results.append(run_benchmark(f'score_{name}', size,
+                                     lambda run=run: model.predict_run(run, X), repeats, **shape))
+    predictions = split['y_test'] * 0.9
+    results.append(run_benchmark('metrics', size,
+                                 lambda: model.regression_metrics(split['y_test'], predictions),
+                                 repeats, **shape))
+    return results
+
+
+def environment():
+    import pandas as pd
+    import sklearn
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+        'sklearn': sklearn.__version__,
+    }
+
+
+def compare(results, baseline_path, threshold):
+    """Print median-time ratios against a baseline file; return the regressed benchmark keys"""
+    with open(baseline_path) as f:
+        baseline = {(r['name'], r['size']): r for r in json.load(f)['results']}
+
+    regressions = []
+    print(f"\n{'benchmark':<40}{'baseline ms':>14}{'current ms':>14}{'ratio':>9}", file=sys.stderr)
+    for r in results:
+        key = (r['name'], r['size'])
+        if key not in baseline:
+            continue
+        old = baseline[key]['seconds_median']
+        ratio = r['seconds_median'] / old if old > 0 else float('inf')
+        flag = '  REGRESSION' if ratio > 1 + threshold else ''
+        if flag:
+            regressions.append(f"{r['name']}[{r['size']}]")
+        print(f"{r['name'] + '[' + r['size'] + ']':<40}{old * 1000:>14.2f}"
+              f"{r['seconds_median'] * 1000:>14.2f}{ratio:>9.2f}{flag}", file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the data analysis hot paths")
+    parser.add_argument('--sizes', nargs='+', default=['small', 'medium'], choices=list(SIZES))
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--models', nargs='+', default=['Linear Regression'],
+                        choices=list(model.ESTIMATOR_REGISTRY))
+    parser.add_argument('--output', help="write results JSON here (default: stdout)")
+    parser.add_argument('--baseline', help="results JSON from an earlier run to compare against")
+    parser.add_argument('--fail-threshold', type=float, default=0.1,
+                        help="median slowdown vs baseline that counts as a regression (default: 0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        results.extend(benchmark_size(size, args.repeats, args.models))
+
+    report = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.fail_threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
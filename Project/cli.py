@@ -0,0 +1,245 @@
+"""Headless command-line / batch mode for the Data Analysis & Visualization Tool.
+
+Runs matrix operations, chart export and regression training/scoring without
+starting Tk, using matplotlib's non-interactive Agg backend.
+
+    python cli.py matrix multiply a.txt b.txt
+    python cli.py chart sales.csv q2.csv --type bar pie --format svg --out-dir charts
+    python cli.py chart sales.csv q2.csv --report weekly.pdf
+    python cli.py regress data.csv --target Price --model Ridge --score new.csv --predictions out.csv
+    python cli.py --jobs 8 run jobs.json
+
+A job file is a JSON list of tasks (or {"tasks": [...]}); each task is an object
+with "task" set to "matrix", "chart" or "regress" and the same keys as the
+matching subcommand's options. Independent tasks run in parallel processes.
+An "export" task ("inputs", "charts", "format", "out_dir", "dpi", "report")
+renders every chart of every input in parallel and can write a combined
+PDF report; `chart --report` runs one.
+"""
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from engine import charts, dataset, export, features, matrix, model, summary
+
+
+def run_matrix_task(task):
+    with open(task['a']) as f:
+        a = matrix.parse_matrix_text(f.read())
+    b = None
+    if task.get('b'):
+        with open(task['b']) as f:
+            b = matrix.parse_matrix_text(f.read())
+
+    result = matrix.matrix_operation(task['op'], a, b)
+
+    report = {'task': 'matrix', 'op': task['op']}
+    if task.get('output'):
+        np.savetxt(task['output'], np.atleast_2d(result))
+        report['output'] = task['output']
+    else:
+        report['result'] = np.asarray(result).tolist()
+    return report
+
+
+def run_chart_task(task):
+    chart_types = task.get('charts') or ['all']
+    if 'all' in chart_types:
+        chart_types = list(charts.CHART_BUILDERS)
+    fmt = task.get('format', 'png')
+    out_dir = task.get('out_dir', '.')
+    os.makedirs(out_dir, exist_ok=True)
+
+    df = dataset.read_dataset(task['input'])
+    stem = os.path.splitext(os.path.basename(task['input']))[0]
+    summaries = summary.ColumnSummaries(df, exact=task.get('exact_stats', False))
+
+    written = []
+    skipped = {}
+    for chart in chart_types:
+        try:
+            fig = charts.CHART_BUILDERS[chart](df, summaries=summaries)
+        except Exception as e:
+            skipped[chart] = str(e)
+            continue
+        path = os.path.join(out_dir, f"{stem}_{chart}.{fmt}")
+        fig.savefig(path, dpi=task.get('dpi', 300), bbox_inches='tight')
+        written.append(path)
+
+    return {'task': 'chart', 'input': task['input'], 'written': written, 'skipped': skipped}
+
+
+def run_export_task(task):
+    chart_types = task.get('charts') or ['all']
+    if 'all' in chart_types:
+        chart_types = None
+    results = export.batch_export([(os.path.basename(path), path) for path in task['inputs']], chart_types,
+                                  task.get('format', 'png'), task.get('out_dir', '.'), task.get('dpi', 300),
+                                  task.get('report'), exact=task.get('exact_stats', False), jobs=task.get('jobs'))
+    return {
+        'task': 'export',
+        'written': [r['path'] for r in results if 'path' in r],
+        'skipped': {f"{r['dataset']}:{r['chart']}": r['error'] for r in results if 'error' in r},
+        'report': task.get('report'),
+    }
+
+
+def run_regress_task(task):
+    compact = task.get('compact', False)
+    impute = task.get('impute', 'drop')
+    pipeline = None
+    if task['input'] == 'california':
+        X, y = dataset.load_california_housing()
+        if compact:
+            X = dataset.downcast_features(X)
+    else:
+        sample = dataset.sniff_file(task['input'])
+        feature_dtype = np.float32 if compact else np.float64
+        if impute == 'drop':
+            X, y = dataset.load_regression_columns(task['input'], task['target'], sample, feature_dtype)
+        else:
+            df = dataset.load_feature_frame(task['input'], task['target'], sample, feature_dtype, text=False)
+            X, y, pipeline = features.engineer_features(df, task['target'], feature_dtype, encode_text=False,
+                                                        impute=impute, indicators=task.get('indicators', False))
+
+    split = model.split_regression(X, y, dtype=np.float32 if compact else np.float64, pipeline=pipeline)
+    name = task.get('model', 'Linear Regression')
+    run = model.fit_registered_estimator(name, split, task.get('memory_budget', 0.5))
+    if run is None:
+        raise MemoryError(f"{name} is estimated to exceed the available memory budget")
+
+    result = {
+        'task': 'regress',
+        'input': task['input'],
+        'model': name,
+        'samples': len(X),
+        'features': len(split['feature_names']),
+        'fit_time': run['fit_time'],
+        'predict_time': run['predict_time'],
+        'metrics': run['metrics'],
+    }
+
+    if task.get('score'):
+        columns = split['feature_names'] if pipeline is None else pipeline.numeric + pipeline.categorical
+        new_X = dataset.read_columns(task['score'], dataset.sniff_file(task['score']), usecols=columns)
+        predictions = model.predict_run(run, new_X)
+        out_path = task.get('predictions') or os.path.splitext(task['score'])[0] + '_predictions.csv'
+        pd.DataFrame({'prediction': predictions}).to_csv(out_path, index=False)
+        result['predictions'] = out_path
+    return result
+
+
+TASK_RUNNERS = {
+    'matrix': run_matrix_task,
+    'chart': run_chart_task,
+    'export': run_export_task,
+    'regress': run_regress_task,
+}
+
+
+def run_task(task):
+    """Run one task dict and return a JSON-serialisable result; errors are reported, not raised"""
+    try:
+        result = TASK_RUNNERS[task['task']](task)
+        result['status'] = 'ok'
+    except Exception as e:
+        result = {'task': task.get('task'), 'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+    return result
+
+
+def run_tasks(tasks, jobs=None):
+    """Run tasks across up to `jobs` worker processes, preserving order"""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(tasks) <= 1:
+        return [run_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+        return list(pool.map(run_task, tasks))
+
+
+def load_job_file(path):
+    with open(path) as f:
+        jobs = json.load(f)
+    return jobs['tasks'] if isinstance(jobs, dict) else jobs
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Headless Data Analysis & Visualization Tool")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="worker processes for parallel tasks (default: all cores)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    matrix_cmd = sub.add_parser('matrix', help="matrix operations on text/CSV matrix files")
+    matrix_cmd.add_argument('op', choices=matrix.MATRIX_OPERATIONS)
+    matrix_cmd.add_argument('a')
+    matrix_cmd.add_argument('b', nargs='?')
+    matrix_cmd.add_argument('--output', help="write the result here instead of printing it")
+
+    chart_cmd = sub.add_parser('chart', help="render charts for one or more data files")
+    chart_cmd.add_argument('inputs', nargs='+')
+    chart_cmd.add_argument('--type', dest='charts', nargs='+', default=['all'],
+                           choices=['all'] + list(charts.CHART_BUILDERS))
+    chart_cmd.add_argument('--format', default='png', choices=['png', 'svg', 'pdf'])
+    chart_cmd.add_argument('--out-dir', default='.')
+    chart_cmd.add_argument('--dpi', type=int, default=300)
+    chart_cmd.add_argument('--exact-stats', action='store_true',
+                           help="exact quantiles and histograms instead of streaming approximations")
+    chart_cmd.add_argument('--report', help="also write every chart as one page of this PDF file")
+
+    regress_cmd = sub.add_parser('regress', help="train and optionally score a regression model")
+    regress_cmd.add_argument('input', help="data file, or 'california' for the built-in dataset")
+    regress_cmd.add_argument('--target', help="target column (required for file input)")
+    regress_cmd.add_argument('--model', default='Linear Regression', choices=list(model.ESTIMATOR_REGISTRY))
+    regress_cmd.add_argument('--compact', action='store_true', help="store features as float32")
+    regress_cmd.add_argument('--memory-budget', type=float, default=0.5,
+                             help="fraction of available memory a model may use")
+    regress_cmd.add_argument('--impute', default='drop', choices=['drop'] + list(features.IMPUTE_STRATEGIES),
+                             help="fill missing feature values instead of dropping rows (default: drop)")
+    regress_cmd.add_argument('--missing-indicators', action='store_true',
+                             help="with --impute, add a 0/1 feature per column that had missing values")
+    regress_cmd.add_argument('--score', help="data file of new rows to predict")
+    regress_cmd.add_argument('--predictions', help="output CSV for --score predictions")
+
+    run_cmd = sub.add_parser('run', help="run every task in a JSON job file")
+    run_cmd.add_argument('job_file')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'matrix':
+        tasks = [{'task': 'matrix', 'op': args.op, 'a': args.a, 'b': args.b, 'output': args.output}]
+    elif args.command == 'chart' and args.report:
+        tasks = [{'task': 'export', 'inputs': args.inputs, 'charts': args.charts, 'format': args.format,
+                  'out_dir': args.out_dir, 'dpi': args.dpi, 'exact_stats': args.exact_stats,
+                  'report': args.report, 'jobs': args.jobs}]
+    elif args.command == 'chart':
+        tasks = [{'task': 'chart', 'input': path, 'charts': args.charts, 'format': args.format,
+                  'out_dir': args.out_dir, 'dpi': args.dpi, 'exact_stats': args.exact_stats}
+                 for path in args.inputs]
+    elif args.command == 'regress':
+        if args.input != 'california' and not args.target:
+            build_parser().error("--target is required for CSV input")
+        tasks = [{'task': 'regress', 'input': args.input, 'target': args.target, 'model': args.model,
+                  'compact': args.compact, 'memory_budget': args.memory_budget,
+                  'impute': args.impute, 'indicators': args.missing_indicators,
+                  'score': args.score, 'predictions': args.predictions}]
+    else:
+        tasks = load_job_file(args.job_file)
+
+    results = run_tasks(tasks, args.jobs)
+    for result in results:
+        print(json.dumps(result))
+    return 0 if all(r['status'] == 'ok' for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
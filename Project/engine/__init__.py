@@ -0,0 +1,21 @@
+"""GUI-independent compute core for the Data Analysis & Visualization Tool.
+
+    engine.dataset      - file loading and built-in / generated datasets
+    engine.matrix       - matrix parsing and arithmetic
+    engine.charts       - matplotlib figure builders (no Tk, any backend)
+    engine.model        - regression training, scoring and metrics
+    engine.diagnostics  - residual, leverage and heteroscedasticity diagnostics
+    engine.features     - encoding, imputation and interaction features
+    engine.table        - sorted/filtered virtual view for the data grid
+    engine.summary      - per-column aggregate cache for charts
+    engine.sketch       - streaming quantile sketch and histogram
+    engine.workspace    - named datasets with LRU spill to an on-disk cache
+    engine.progressive  - live charts updated chunk by chunk while loading
+    engine.interactive  - decimated, blitted redraws while panning large plots
+    engine.export       - parallel batch chart export and PDF reports
+    engine.lazy         - deferred imports
+    engine.profiling    - timing/memory spans and Chrome trace export
+
+MatrixGUI, the command line and worker processes all call into these modules,
+so none of them needs a display.
+"""
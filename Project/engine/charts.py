@@ -0,0 +1,266 @@
+"""Chart builders.
+
+Each builder takes a DataFrame and returns a matplotlib Figure, or raises
+ValueError when the data has no suitable columns. Figures are created without
+pyplot, so they can be embedded in Tk or saved from any backend.
+
+Builders also accept `columns`, a user selection of column names to plot
+(default: the first suitable columns), and `summaries`, an
+engine.summary.ColumnSummaries cache. Histograms and box plots are always
+drawn from column summaries (a temporary cache is built when none is
+given). Bar and pie charts plot one value per category (sum, mean or count,
+see engine.summary.group_aggregate), keeping the largest categories and
+folding the rest into 'Other'; the aggregates are cached in `summaries`.
+"""
+import numpy as np
+import pandas as pd
+from matplotlib import colormaps
+from matplotlib.figure import Figure
+
+from engine.profiling import tracer
+from engine.summary import ColumnSummaries, box_stats, category_codes
+
+DEFAULT_CHART_COLOR = "#2d5f8d"
+BAR_CATEGORIES = 15
+PIE_CATEGORIES = 8
+
+@tracer.traced('detect_dtypes')
+def numeric_columns(df):
+    """Names of the numeric columns of df, in order"""
+    return df.select_dtypes(include=[np.number]).columns.tolist()
+
+def is_categorical(dtype):
+    """True for pandas categoricals, string dtypes and Python-object columns"""
+    return (isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(dtype)
+            or pd.api.types.is_object_dtype(dtype))
+
+def categorical_columns(df):
+    return [col for col, dtype in df.dtypes.items() if is_categorical(dtype)]
+
+def select_columns(df, columns=None):
+    """(numeric, categorical) column names from a selection, or from all of df"""
+    numeric_cols = numeric_columns(df)
+    categorical_cols = categorical_columns(df)
+    if columns is None:
+        return numeric_cols, categorical_cols
+    return ([col for col in columns if col in numeric_cols],
+            [col for col in columns if col in categorical_cols])
+
+@tracer.traced('build_bar_chart')
+def build_bar_chart(df, color=DEFAULT_CHART_COLOR, columns=None, summaries=None, agg=None):
+    numeric_cols, categorical_cols = select_columns(df, columns)
+    agg = agg or 'sum'
+    
+    if not categorical_cols or (agg != 'count' and not numeric_cols):
+        raise ValueError("CSV must have categorical and numeric columns")
+    
+    categorical_col = categorical_cols[0]
+    numeric_col = None if agg == 'count' else numeric_cols[0]
+    if summaries is None:
+        summaries = ColumnSummaries(df)
+    totals = summaries.grouped(categorical_col, numeric_col, agg, BAR_CATEGORIES)
+    
+    fig = Figure(figsize=(10, 6), dpi=100)
+    ax = fig.add_subplot(111)
+    ax.bar(totals.index.astype(str), totals.to_numpy(), color=color)
+    if numeric_col is None:
+        ax.set_title(f'Count by {categorical_col}', fontweight='bold')
+        ax.set_ylabel('Count')
+    else:
+        ax.set_title(f'{agg.capitalize()} of {numeric_col} by {categorical_col}', fontweight='bold')
+        ax.set_ylabel(f'{numeric_col} ({agg})')
+    ax.tick_params(axis='x', rotation=45)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+@tracer.traced('build_scatter_plot')
+def build_scatter_plot(df, color=DEFAULT_CHART_COLOR, columns=None, summaries=None):
+    numeric_cols, categorical_cols = select_columns(df, columns)
+    
+    if len(numeric_cols) < 2:
+        raise ValueError("CSV needs at least 2 numeric columns")
+    
+    x_col = numeric_cols[0]
+    y_col = numeric_cols[1]
+    categorical_col = categorical_cols[0] if categorical_cols else None
+    
+    fig = Figure(figsize=(10, 6), dpi=100)
+    ax = fig.add_subplot(111)
+    
+    if categorical_col is not None:
+        codes, labels = category_codes(df[categorical_col])
+        x = df[x_col].to_numpy()
+        y = df[y_col].to_numpy()
+        for code, category in enumerate(labels):
+            rows = codes == code
+            ax.scatter(x[rows], y[rows], label=str(category), s=100, alpha=0.6)
+        ax.legend()
+    else:
+        ax.scatter(df[x_col], df[y_col], s=100, alpha=0.6, color=color)
+    
+    ax.set_title(f'{y_col} vs {x_col}', fontweight='bold')
+    ax.set_xlabel(x_col)
+    ax.set_ylabel(y_col)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+@tracer.traced('build_line_chart')
+def build_line_chart(df, color=DEFAULT_CHART_COLOR, columns=None, summaries=None):
+    numeric_cols, _ = select_columns(df, columns)
+    
+    if len(numeric_cols) == 0:
+        raise ValueError("No numeric columns found")
+    
+    fig = Figure(figsize=(10, 6), dpi=100)
+    ax = fig.add_subplot(111)
+    
+    for col in (numeric_cols if columns else numeric_cols[:3]):
+        ax.plot(df.index, df[col], label=col, marker='o', markersize=3)
+    
+    ax.set_title('Line Chart', fontweight='bold')
+    ax.set_xlabel('Index')
+    ax.set_ylabel('Value')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+@tracer.traced('build_histogram')
+def build_histogram(df, color=DEFAULT_CHART_COLOR, columns=None, summaries=None):
+    numeric_cols, _ = select_columns(df, columns)
+    
+    if len(numeric_cols) == 0:
+        raise ValueError("No numeric columns found")
+    
+    fig = Figure(figsize=(10, 6), dpi=100)
+    ax = fig.add_subplot(111)
+    
+    if summaries is None:
+        summaries = ColumnSummaries(df)
+    for col in (numeric_cols if columns else numeric_cols[:3]):
+        summary = summaries.get(col)
+        if summary['count']:
+            counts, edges = summary['histogram']
+            ax.stairs(counts, edges, fill=True, alpha=0.6, label=col)
+    
+    ax.set_title('Histogram', fontweight='bold')
+    ax.set_xlabel('Value')
+    ax.set_ylabel('Frequency')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+@tracer.traced('build_heatmap')
+def build_heatmap(df, color=DEFAULT_CHART_COLOR, columns=None, summaries=None):
+    fig = Figure(figsize=(10, 6), dpi=100)
+    ax = fig.add_subplot(111)
+    
+    numeric_df = df[select_columns(df, columns)[0]]
+    corr = numeric_df.corr()
+    
+    im = ax.imshow(corr, cmap='Blues', aspect='auto')
+    ax.set_xticks(range(len(corr.columns)))
+    ax.set_yticks(range(len(corr.columns)))
+    ax.set_xticklabels(corr.columns, rotation=45, ha='right')
+    ax.set_yticklabels(corr.columns)
+    ax.set_title('Correlation Heatmap', fontweight='bold')
+    
+    for i in range(len(corr)):
+        for j in range(len(corr)):
+            ax.text(j, i, f'{corr.iloc[i, j]:.2f}', ha='center', va='center', 
+                   color='white' if abs(corr.iloc[i, j]) > 0.5 else 'black', fontsize=9)
+    
+    fig.colorbar(im, ax=ax)
+    fig.tight_layout()
+    return fig
+
+@tracer.traced('build_pie_chart')
+def build_pie_chart(df, color=DEFAULT_CHART_COLOR, columns=None, summaries=None, agg=None):
+    numeric_cols, categorical_cols = select_columns(df, columns)
+    agg = agg or 'count'
+    
+    if not categorical_cols:
+        raise ValueError("No categorical columns found for pie chart")
+    if agg == 'mean':
+        raise ValueError("Pie charts need a sum or count aggregation")
+    if agg == 'sum' and not numeric_cols:
+        raise ValueError("No numeric column to sum for pie chart")
+    
+    col = categorical_cols[0]
+    numeric_col = numeric_cols[0] if agg == 'sum' else None
+    if summaries is None:
+        summaries = ColumnSummaries(df)
+    value_counts = summaries.grouped(col, numeric_col, agg, PIE_CATEGORIES)
+    if (value_counts < 0).any():
+        raise ValueError(f"Pie chart needs non-negative sums; '{numeric_col}' has negative totals")
+    
+    fig = Figure(figsize=(8, 6), dpi=100)
+    ax = fig.add_subplot(111)
+    
+    colors = colormaps['Set3'](np.linspace(0, 1, len(value_counts)))
+    ax.pie(value_counts.to_numpy(), labels=value_counts.index.astype(str), autopct='%1.1f%%',
+          colors=colors, startangle=90)
+    ax.set_title(f'Pie Chart: {col}' if numeric_col is None else f'Pie Chart: {numeric_col} by {col}',
+                 fontweight='bold')
+    fig.tight_layout()
+    return fig
+
+@tracer.traced('build_box_plot')
+def build_box_plot(df, color=DEFAULT_CHART_COLOR, columns=None, summaries=None):
+    numeric_cols, _ = select_columns(df, columns)
+    
+    if len(numeric_cols) == 0:
+        raise ValueError("No numeric columns found")
+    
+    fig = Figure(figsize=(10, 6), dpi=100)
+    ax = fig.add_subplot(111)
+    
+    if summaries is None:
+        summaries = ColumnSummaries(df)
+    plotted = numeric_cols if columns else numeric_cols[:5]
+    stats = [box_stats(summaries.get(col), col) for col in plotted]
+    ax.bxp([s for s in stats if s is not None])
+    
+    ax.set_title('Box Plot', fontweight='bold')
+    ax.set_ylabel('Value')
+    ax.grid(True, alpha=0.3)
+    ax.tick_params(axis='x', rotation=45)
+    
+    fig.tight_layout()
+    return fig
+
+@tracer.traced('build_area_chart')
+def build_area_chart(df, color=DEFAULT_CHART_COLOR, columns=None, summaries=None):
+    numeric_cols, _ = select_columns(df, columns)
+    
+    if len(numeric_cols) == 0:
+        raise ValueError("No numeric columns found")
+    
+    fig = Figure(figsize=(10, 6), dpi=100)
+    ax = fig.add_subplot(111)
+    
+    for col in (numeric_cols if columns else numeric_cols[:3]):
+        ax.fill_between(df.index, 0, df[col], alpha=0.5, label=col)
+    
+    ax.set_title('Area Chart', fontweight='bold')
+    ax.set_xlabel('Index')
+    ax.set_ylabel('Value')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    
+    fig.tight_layout()
+    return fig
+
+CHART_BUILDERS = {
+    'bar': build_bar_chart,
+    'scatter': build_scatter_plot,
+    'line': build_line_chart,
+    'histogram': build_histogram,
+    'heatmap': build_heatmap,
+    'pie': build_pie_chart,
+    'box': build_box_plot,
+    'area': build_area_chart,
+}
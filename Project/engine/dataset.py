@@ -0,0 +1,470 @@
+"""Dataset loading: file readers, built-in and generated datasets"""
+import bz2
+import csv
+import functools
+import gzip
+import importlib.util
+import lzma
+import operator
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from engine.profiling import tracer
+
+SAMPLE_SALES_DATA = {
+    'Product': ['Laptop', 'Mouse', 'Monitor', 'Keyboard', 'Webcam', 'Headset'],
+    'Category': ['Electronics', 'Accessories', 'Electronics', 'Accessories', 'Accessories', 'Accessories'],
+    'Units_Sold': [50, 150, 80, 120, 90, 110],
+    'Revenue': [60000, 3750, 24000, 9000, 4500, 8800]
+}
+
+# A text column becomes a pandas categorical when at most this fraction of its values are distinct
+CATEGORY_MAX_RATIO = 0.5
+
+def encode_categoricals(df, max_ratio=CATEGORY_MAX_RATIO):
+    """Convert low-cardinality text columns to pandas categoricals with sorted categories.
+    
+    Each column is hashed once with pd.factorize; the codes become the
+    categorical's storage, so grouping and filtering work on small integers
+    instead of Python strings. Other columns are left as they are.
+    """
+    encoded = {}
+    for col, dtype in df.dtypes.items():
+        if not (pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)):
+            continue
+        try:
+            codes, uniques = pd.factorize(df[col], sort=True)
+            if len(uniques) > max_ratio * len(df):
+                continue
+            encoded[col] = pd.Categorical.from_codes(codes, categories=uniques)
+        except (TypeError, ValueError):
+            continue  # mixed types that cannot be sorted or do not form valid categories
+    if encoded:
+        df = df.copy(deep=False)
+        for col, values in encoded.items():
+            df[col] = values
+    return df
+
+def sample_sales_data():
+    """Small built-in dataset for the visualization tab"""
+    return encode_categoricals(pd.DataFrame(SAMPLE_SALES_DATA))
+
+# Non-CSV formats by file extension; every other file is read as CSV, compressed or not
+FILE_FORMATS = {
+    '.parquet': 'parquet', '.pq': 'parquet',
+    '.feather': 'feather', '.arrow': 'feather',
+    '.xlsx': 'excel', '.xlsm': 'excel', '.xls': 'excel',
+}
+# Leading bytes of the compressed containers pd.read_csv can decompress
+COMPRESSION_MAGIC = {
+    b'\x1f\x8b': 'gzip',
+    b'BZh': 'bz2',
+    b'\xfd7zXZ\x00': 'xz',
+    b'PK\x03\x04': 'zip',
+    b'\x28\xb5\x2f\xfd': 'zstd',
+}
+
+# Bytes read from the start of a CSV file to sniff its encoding, delimiter and header
+SNIFF_BYTES = 64 * 1024
+CSV_DELIMITERS = ',;\t|'
+
+# pyarrow's multi-threaded CSV reader when it is installed, else pandas' C parser
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') is not None else 'c'
+
+def _require(module, what):
+    if importlib.util.find_spec(module) is None:
+        raise ImportError(f"Reading {what} requires the optional '{module}' package (pip install {module})")
+
+def file_format(file_path):
+    """'parquet', 'feather', 'excel' or 'csv', from the extension or else the file's magic bytes"""
+    fmt = FILE_FORMATS.get(os.path.splitext(file_path)[1].lower())
+    if fmt is not None:
+        return fmt
+    with open(file_path, 'rb') as f:
+        head = f.read(6)
+    if head.startswith(b'PAR1'):
+        return 'parquet'
+    if head.startswith(b'ARROW1'):
+        return 'feather'
+    return 'csv'
+
+def csv_compression(file_path):
+    """pd.read_csv compression name of a CSV file from its magic bytes, or None"""
+    with open(file_path, 'rb') as f:
+        head = f.read(6)
+    for magic, name in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+def _read_head(file_path, compression, size):
+    """First `size` bytes of a file's decompressed content"""
+    if compression is None:
+        with open(file_path, 'rb') as f:
+            return f.read(size)
+    if compression == 'zip':
+        with zipfile.ZipFile(file_path) as archive, archive.open(archive.namelist()[0]) as f:
+            return f.read(size)
+    if compression == 'zstd':
+        _require('zstandard', 'zstd-compressed files')
+        import zstandard
+        with open(file_path, 'rb') as raw, zstandard.ZstdDecompressor().stream_reader(raw) as f:
+            return f.read(size)
+    opener = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}[compression]
+    with opener(file_path, 'rb') as f:
+        return f.read(size)
+
+def _arrow_dataset(file_path, fmt):
+    """pyarrow.dataset view of a Parquet or Feather file; reads nothing but the footer/schema"""
+    _require('pyarrow', f"{fmt.capitalize()} files")
+    import pyarrow.dataset as ds
+    return ds.dataset(file_path, format=fmt)
+
+def _number_type(text):
+    """int or float when `text` parses as that number, else None"""
+    for kind in (int, float):
+        try:
+            kind(text)
+            return kind
+        except ValueError:
+            pass
+    return None
+
+def _data_types(rows, n_columns):
+    """Number type of each column over `rows`: int, float (ints and floats mixed), or None for text"""
+    types = []
+    for col in range(n_columns):
+        kinds = {_number_type(row[col]) for row in rows if col < len(row) and row[col] != ''}
+        if not kinds or None in kinds:
+            types.append(None)
+        else:
+            types.append(float if float in kinds else int)
+    return types
+
+def sniff_format(file_path, sample_bytes=SNIFF_BYTES):
+    """Compression, encoding, delimiter and header row of a CSV file, as pd.read_csv keywords.
+    
+    Compressed files are sniffed on their decompressed content. The encoding
+    is taken from a byte order mark, else UTF-8 if the sample decodes as
+    UTF-8, else Latin-1 (which accepts any bytes). Delimiter and header come
+    from csv.Sniffer on the complete lines of the sample; the first row is
+    taken as the header unless it also reads as a row of data.
+    """
+    compression = csv_compression(file_path)
+    raw = _read_head(file_path, compression, sample_bytes)
+    
+    if raw.startswith(b'\xef\xbb\xbf'):
+        encoding = 'utf-8-sig'
+    elif raw.startswith((b'\xff\xfe', b'\xfe\xff')):
+        encoding = 'utf-16'
+    else:
+        encoding = 'utf-8'
+        try:
+            # A sample cut mid-character decodes once the incomplete tail is dropped
+            raw[:raw.rfind(b'\n') + 1 or len(raw)].decode('utf-8')
+        except UnicodeDecodeError:
+            encoding = 'latin-1'
+    
+    text = raw.decode(encoding, errors='replace')
+    if len(raw) == sample_bytes and '\n' in text:
+        text = text[:text.rfind('\n')]
+    
+    options = {'sep': ',', 'encoding': encoding, 'header': 0, 'compression': compression}
+    try:
+        options['sep'] = csv.Sniffer().sniff(text, delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        pass
+    # A header of numbers (years, sensor IDs) is still a header, so the first
+    # row is only read as data when it is all numbers, each of the number type
+    # of the values below it, and csv.Sniffer agrees; integer names over float
+    # data keep the header
+    rows = list(csv.reader(text.splitlines(), delimiter=options['sep']))
+    if len(rows) > 1:
+        first = [_number_type(field) for field in rows[0]]
+        if None not in first and first == _data_types(rows[1:], len(first)):
+            try:
+                if not csv.Sniffer().has_header(text):
+                    options['header'] = None
+            except csv.Error:
+                pass
+    return options
+
+def csv_dtypes(sample):
+    """Explicit parser dtypes for the columns a sample DataFrame types unambiguously.
+    
+    Numeric columns keep their sampled dtype and text columns are read as
+    text. Columns that are empty in the sample and boolean columns are left
+    to inference.
+    """
+    dtypes = {}
+    for col, dtype in sample.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype) or sample[col].isna().all():
+            continue
+        if pd.api.types.is_numeric_dtype(dtype):
+            dtypes[col] = dtype
+        else:
+            dtypes[col] = str
+    return dtypes
+
+def _is_text_dtype(dtype):
+    return not pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtype))
+
+def coerce_dtypes(df, dtypes):
+    """Convert each column to its dtype in `dtypes` where all its values convert; the rest keep their type"""
+    for col, dtype in dtypes.items():
+        if col in df.columns and df[col].dtype != dtype:
+            try:
+                df[col] = df[col].astype(dtype)
+            except (ValueError, TypeError):
+                pass
+    return df
+
+def read_typed(read, dtypes):
+    """Call read(dtypes), falling back to pandas inference for columns the data contradicts.
+    
+    dtypes usually come from a sample, so a later row can hold text in a
+    column that looked numeric, or a missing value in an integer column. The
+    parser then fails without naming the column, so the file is read again
+    with only the text dtypes fixed, and the other columns are converted one
+    by one where their values allow.
+    """
+    try:
+        return read(dtypes)
+    except (ValueError, TypeError):
+        text = {col: dtype for col, dtype in dtypes.items() if _is_text_dtype(dtype)}
+        with tracer.span('infer_dtypes', columns=len(dtypes) - len(text)):
+            return coerce_dtypes(read(text), dtypes)
+
+def csv_options(sample):
+    """pd.read_csv format keywords recorded on a sample by sniff_csv"""
+    options = dict(sample.attrs.get('csv_format', {}))
+    if options.get('header', 0) is None:
+        options['names'] = list(sample.columns)
+    return options
+
+def read_csv_fast(file_path, sample, usecols=None, dtype=None):
+    """Read a CSV with the format sniffed into `sample`, explicit dtypes and the fastest engine"""
+    dtypes = csv_dtypes(sample) if dtype is None else dtype
+    if usecols is not None:
+        dtypes = {col: dtypes[col] for col in usecols if col in dtypes}
+    options = csv_options(sample)
+    with tracer.span('parse_csv', path=file_path, engine=CSV_ENGINE, columns=len(dtypes)):
+        return read_typed(lambda types: pd.read_csv(file_path, usecols=usecols, dtype=types,
+                                                    engine=CSV_ENGINE, **options), dtypes)
+
+def read_dataset(file_path):
+    """Read a data file for the visualization tab; low-cardinality text columns become categoricals"""
+    df = read_columns(file_path, sniff_file(file_path))
+    with tracer.span('encode_categoricals'):
+        return encode_categoricals(df)
+
+CHUNK_ROWS = 100_000
+
+def read_dataset_chunks(file_path, chunksize=CHUNK_ROWS):
+    """Read a data file as a stream of DataFrame chunks, for progressive loading.
+    
+    Parquet and Feather files are streamed as record batches; Excel workbooks
+    cannot be read incrementally and arrive as a single chunk.
+    """
+    fmt = file_format(file_path)
+    if fmt == 'excel':
+        yield pd.read_excel(file_path)
+        return
+    if fmt != 'csv':
+        for batch in _arrow_dataset(file_path, fmt).to_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+    
+    sample = sniff_csv(file_path)
+    # Only text dtypes are fixed: a retry is not possible mid-stream, and text never fails to parse
+    dtypes = {col: dtype for col, dtype in csv_dtypes(sample).items() if _is_text_dtype(dtype)}
+    with pd.read_csv(file_path, chunksize=chunksize, dtype=dtypes, **csv_options(sample)) as reader:
+        yield from reader
+
+def combine_chunks(chunks):
+    """Assemble chunks from read_dataset_chunks into the dataset read_dataset would return"""
+    if not chunks:
+        raise ValueError("The file has no data rows")
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    with tracer.span('encode_categoricals'):
+        return encode_categoricals(df)
+
+def generate_regression_sample(n_samples=100, seed=42):
+    """Random linear regression data with three features, as (X, y)"""
+    rng = np.random.RandomState(seed)
+    X = rng.randn(n_samples, 3)
+    coefficients = np.array([2.5, -1.2, 0.8])
+    y = X @ coefficients + rng.randn(n_samples) * 0.5
+    return pd.DataFrame(X, columns=['Feature_1', 'Feature_2', 'Feature_3']), pd.Series(y, name='Target')
+
+def generate_synthetic_dataset(n_rows, n_numeric, n_categorical=1, n_categories=8, seed=42):
+    """Seeded synthetic table for benchmarks and load tests.
+
+    Has n_numeric float columns (Feature_1..n), n_categorical string columns
+    (Category_1..n, each with n_categories labels) and a linear 'Target' with noise.
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_rows, n_numeric))
+    coefficients = rng.uniform(-3, 3, n_numeric)
+
+    df = pd.DataFrame(X, columns=[f'Feature_{i + 1}' for i in range(n_numeric)])
+    labels = np.array([f'Group_{i}' for i in range(n_categories)], dtype=object)
+    for i in range(n_categorical):
+        df[f'Category_{i + 1}'] = labels[rng.integers(0, n_categories, n_rows)]
+    df['Target'] = X @ coefficients + rng.standard_normal(n_rows) * 0.5
+    return df
+
+SNIFF_ROWS = 1000
+
+def sniff_csv(file_path, nrows=SNIFF_ROWS):
+    """Phase 1 for CSV files: sniff the CSV format and read a small sample.
+    
+    The sniffed pd.read_csv keywords are kept in sample.attrs['csv_format'] for
+    the full read. A file without a header row gets columns Column1, Column2, …
+    """
+    with tracer.span('sniff_csv', path=file_path, rows=nrows):
+        options = sniff_format(file_path)
+        sample = pd.read_csv(file_path, nrows=nrows, **options)
+        if options['header'] is None:
+            sample.columns = [f'Column{i + 1}' for i in range(sample.shape[1])]
+        sample.attrs['csv_format'] = options
+        return sample
+
+def sniff_file(file_path, nrows=SNIFF_ROWS):
+    """Phase 1 of the loaders for any supported file: a small sample of its rows.
+    
+    The file format is kept in sample.attrs['file_format'] for read_columns.
+    Parquet and Feather samples come from the first record batches only.
+    """
+    fmt = file_format(file_path)
+    if fmt == 'csv':
+        sample = sniff_csv(file_path, nrows)
+    else:
+        with tracer.span('sniff_file', path=file_path, format=fmt, rows=nrows):
+            if fmt == 'excel':
+                sample = pd.read_excel(file_path, nrows=nrows)
+            else:
+                sample = _arrow_dataset(file_path, fmt).head(nrows).to_pandas()
+    sample.attrs['file_format'] = fmt
+    return sample
+
+def read_columns(file_path, sample, usecols=None, dtype=None, dropna=False):
+    """Phase 2 of the loaders: read the usecols columns (default all) of a file sniffed into `sample`.
+    
+    Parquet and Feather files are scanned through pyarrow.dataset, which reads
+    only the projected columns. With dropna, rows with a null in any read
+    column are dropped; for Parquet and Feather the filter is pushed down into
+    the scan, which also skips row groups whose statistics show no valid rows.
+    """
+    fmt = sample.attrs.get('file_format', 'csv')
+    if fmt in ('parquet', 'feather'):
+        data = _arrow_dataset(file_path, fmt)
+        columns = None if usecols is None else list(usecols)
+        row_filter = None
+        if dropna:
+            import pyarrow.dataset as ds
+            row_filter = functools.reduce(operator.and_, (ds.field(col).is_valid()
+                                                          for col in columns or data.schema.names))
+        with tracer.span('scan_' + fmt, path=file_path, columns=len(columns or data.schema.names)):
+            df = data.to_table(columns=columns, filter=row_filter).to_pandas()
+        return coerce_dtypes(df, dtype) if dtype else df
+    
+    if fmt == 'excel':
+        with tracer.span('parse_excel', path=file_path):
+            df = read_typed(lambda types: pd.read_excel(file_path, usecols=usecols, dtype=types), dtype or {})
+    else:
+        df = read_csv_fast(file_path, sample, usecols, dtype)
+    return drop_missing(df) if dropna else df
+
+def drop_missing(df):
+    """Rows of df without a null in any column, found in a single pass"""
+    with tracer.span('drop_missing'):
+        keep = df.notna().all(axis=1).to_numpy()
+        return df if keep.all() else df[keep]
+
+def load_regression_columns(file_path, target_col, sample, feature_dtype=np.float64):
+    """Phase 2 of the regression loader: read only the target and numeric features.
+    
+    Numeric feature columns are picked from the phase 1 sample and read with an
+    explicit dtype, so the parser never infers types or materialises unused
+    columns. A column with non-numeric values past the sample rows is left
+    out. Rows with a null in any used column are dropped in a single pass.
+    Returns (X, y).
+    """
+    if target_col not in sample.columns:
+        raise ValueError(f"Column '{target_col}' not found")
+    
+    with tracer.span('detect_dtypes'):
+        feature_cols = [col for col in sample.select_dtypes(include=[np.number]).columns
+                        if col != target_col]
+    if not feature_cols:
+        raise ValueError("No numeric features found in the data")
+    
+    dtypes = {col: feature_dtype for col in feature_cols}
+    if pd.api.types.is_numeric_dtype(sample[target_col]):
+        dtypes[target_col] = np.float64
+    
+    # Nulls are filtered in the scan only for columnar files, whose column types cannot change past the sample
+    pushdown = sample.attrs.get('file_format') in ('parquet', 'feather')
+    df = read_columns(file_path, sample, usecols=feature_cols + [target_col], dtype=dtypes, dropna=pushdown)
+    
+    failed = [col for col in feature_cols if not pd.api.types.is_numeric_dtype(df[col])]
+    if len(failed) == len(feature_cols):
+        raise ValueError("No numeric features found in the data")
+    df = drop_missing(df.drop(columns=failed))
+    
+    y = df.pop(target_col)
+    return df, y
+
+def load_feature_frame(file_path, target_col, sample, feature_dtype=np.float64, text=True):
+    """Read the target and every candidate feature column for engine.features.
+    
+    Like load_regression_columns, column types come from the phase 1 sample:
+    numeric columns are read with an explicit dtype and text columns (unless
+    text=False) straight into pandas categoricals. A column that is empty in
+    the sample is typed once it has been read. Missing values are kept for
+    the feature pipeline to impute.
+    """
+    if target_col not in sample.columns:
+        raise ValueError(f"Column '{target_col}' not found")
+    
+    dtypes = {}
+    unknown = []
+    with tracer.span('detect_dtypes'):
+        for col, dtype in sample.dtypes.items():
+            if col == target_col:
+                dtypes[col] = np.float64 if pd.api.types.is_numeric_dtype(dtype) else dtype
+            elif sample[col].isna().all():
+                unknown.append(col)
+            elif pd.api.types.is_numeric_dtype(dtype):
+                dtypes[col] = feature_dtype
+            elif text and (pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)):
+                dtypes[col] = 'category'
+    
+    df = read_columns(file_path, sample, usecols=list(dtypes) + unknown, dtype=dtypes)
+    for col in unknown:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype(feature_dtype)
+        elif text and not df[col].isna().all():
+            df[col] = df[col].astype('category')
+        else:
+            del df[col]
+    return df
+
+def downcast_features(X):
+    """Store float and integer feature columns as float32, the dtype compact-precision training uses"""
+    dtypes = {col: np.float32 for col, dtype in X.dtypes.items()
+              if pd.api.types.is_float_dtype(dtype) or pd.api.types.is_integer_dtype(dtype)}
+    return X.astype(dtypes, copy=False)
+
+def load_california_housing():
+    """Return the California Housing features and target as (X, y)"""
+    from sklearn.datasets import fetch_california_housing
+    
+    data = fetch_california_housing()
+    X = pd.DataFrame(data.data, columns=data.feature_names)
+    y = pd.Series(data.target, name='Price')
+    return X, y
@@ -0,0 +1,262 @@
+"""Residual diagnostics for a fitted regression run.
+
+Everything is computed with vectorized NumPy over the full test or training
+set and reduced to fixed-size arrays (histogram counts, quantile pairs, 2-D
+bin counts, a bounded sample of points) before drawing, so the plots cost
+about the same for a thousand rows as for millions.
+
+Leverage comes from the hat-matrix diagonal h_ii = ||x_i R^-1||^2, where R is
+the QR factor of the training design [1, X]. R is accumulated over row
+chunks (TSQR), so the n x p orthogonal factor is never held in memory, and
+the diagonal is cached in the split because it does not depend on the model.
+"""
+import numpy as np
+
+from engine.profiling import tracer
+
+CHUNK_ROWS = 1 << 16
+RESIDUAL_BINS = 50
+QQ_POINTS = 512
+GRID_BINS = 60
+# Above this many rows, scatters are drawn as 2-D bin counts
+MAX_POINTS = 5000
+FEATURE_PLOTS = 9
+
+def _design_chunks(X, y=None, squares=False):
+    """[1, X] (then X**2 and y, if given) in float64 row chunks"""
+    for start in range(0, len(X), CHUNK_ROWS):
+        block = np.asarray(X[start:start + CHUNK_ROWS], dtype=np.float64)
+        columns = [np.ones(len(block)), block]
+        if squares:
+            columns.append(block ** 2)
+        if y is not None:
+            columns.append(np.asarray(y[start:start + CHUNK_ROWS], dtype=np.float64))
+        yield np.column_stack(columns)
+
+def design_r(X, y=None, squares=False):
+    """R factor of the QR decomposition of the _design_chunks matrix, accumulated chunk by chunk"""
+    R = np.zeros((0, 1 + X.shape[1] * (2 if squares else 1) + (y is not None)))
+    for block in _design_chunks(X, y, squares):
+        R = np.linalg.qr(np.vstack([R, block]), mode='r')
+    return R
+
+def hat_diagonal(X):
+    """Leverages of the rows of X in a least-squares fit with intercept"""
+    R_inv = np.linalg.pinv(design_r(X))
+    leverages = []
+    for block in _design_chunks(X):
+        q = block @ R_inv
+        leverages.append(np.einsum('ij,ij->i', q, q))
+    return np.concatenate(leverages)
+
+def leverage(split):
+    """Hat-matrix diagonal of the training design, cached in the split dict"""
+    if 'hat_diagonal' not in split:
+        with tracer.span('hat_diagonal', rows=len(split['X_train_scaled'])):
+            split['hat_diagonal'] = hat_diagonal(split['X_train_scaled'])
+    return split['hat_diagonal']
+
+def influence(residuals, hat, n_params):
+    """(studentized residuals, Cook's distances) from residuals and leverages"""
+    n = residuals.size
+    s2 = float(residuals @ residuals) / max(n - n_params, 1)
+    one_minus_h = np.maximum(1.0 - hat, 1e-12)
+    studentized = residuals / np.sqrt(s2 * one_minus_h)
+    cooks = studentized ** 2 * hat / (n_params * one_minus_h)
+    return studentized, cooks
+
+def breusch_pagan(residuals, X):
+    """Koenker's studentized Breusch-Pagan test: (LM statistic, p-value).
+
+    Squared residuals are regressed on X and X**2 (White's test without cross
+    terms), so variance that grows with |x| in both directions is detected too.
+    """
+    from scipy import stats
+    u = residuals.astype(np.float64) ** 2
+    # The last diagonal entry of R for [1, X, X**2, u] is the residual norm of regressing u on the rest
+    sse = design_r(X, u, squares=True)[-1, -1] ** 2
+    sst = float(((u - u.mean()) ** 2).sum())
+    r2 = 1.0 - sse / sst if sst > 0 else 0.0
+    lm = u.size * r2
+    return lm, float(stats.chi2.sf(lm, 2 * X.shape[1]))
+
+def goldfeld_quandt(residuals, order_by, fraction=1 / 3):
+    """Residual variance of the top over the bottom `fraction` of rows ordered by order_by: (F, p-value)"""
+    from scipy import stats
+    k = int(residuals.size * fraction)
+    if k < 2:
+        return float('nan'), float('nan')
+    order = np.argpartition(order_by, (k, residuals.size - k))
+    low, high = residuals[order[:k]], residuals[order[-k:]]
+    f = float(high @ high) / max(float(low @ low), 1e-300)
+    return f, float(stats.f.sf(f, k, k))
+
+def normal_qq(residuals, points=QQ_POINTS):
+    """(theoretical, sample) quantiles of the standardized residuals at `points` probabilities"""
+    from scipy.special import ndtri
+    probs = (np.arange(points) + 0.5) / points
+    std = residuals.std() or 1.0
+    sample = np.quantile((residuals - residuals.mean()) / std, probs)
+    return ndtri(probs), sample
+
+def binned_trend(x, y, bins=GRID_BINS):
+    """Mean of y in equal-width bins of x, as (bin centers, means) of the non-empty bins"""
+    edges = np.linspace(x.min(), x.max(), bins + 1)
+    index = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, bins - 1)
+    counts = np.bincount(index, minlength=bins)
+    sums = np.bincount(index, weights=y, minlength=bins)
+    filled = counts > 0
+    return ((edges[:-1] + edges[1:]) / 2)[filled], sums[filled] / counts[filled]
+
+def density(x, y, bins=GRID_BINS):
+    """Scatter points when there are few, else 2-D bin counts, plus the binned mean of y"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    result = {'trend': binned_trend(x, y, bins)}
+    if x.size <= MAX_POINTS:
+        result['points'] = (x, y)
+    else:
+        result['grid'] = np.histogram2d(x, y, bins=bins)
+    return result
+
+def influence_sample(cooks, size=MAX_POINTS, seed=0):
+    """Row indices to draw: the most influential fifth of `size`, plus a uniform sample of the rest"""
+    if cooks.size <= size:
+        return np.arange(cooks.size)
+    top = np.argpartition(cooks, cooks.size - size // 5)[-(size // 5):]
+    rest = np.random.default_rng(seed).choice(cooks.size, size - top.size, replace=False)
+    return np.union1d(top, rest)
+
+@tracer.traced('residual_diagnostics')
+def residual_diagnostics(run, split):
+    """Diagnostics dict for a run record, cached in run['diagnostics']"""
+    if run['diagnostics'] is not None:
+        return run['diagnostics']
+
+    y_test = np.asarray(split['y_test'], dtype=np.float64)
+    predictions = np.asarray(run['predictions'], dtype=np.float64)
+    residuals = y_test - predictions
+
+    X_train = split['X_train_scaled']
+    hat = leverage(split)
+    train_residuals = np.asarray(split['y_train'], dtype=np.float64) - run['model'].predict(X_train)
+    studentized, cooks = influence(train_residuals, hat, X_train.shape[1] + 1)
+    rows = influence_sample(cooks)
+
+    diagnostics = {
+        'n': residuals.size,
+        'histogram': np.histogram(residuals, bins=RESIDUAL_BINS),
+        'qq': normal_qq(residuals),
+        'fitted': density(predictions, residuals),
+        'influence': {
+            'leverage': hat[rows],
+            'studentized': studentized[rows],
+            'cooks': cooks[rows],
+            'n': cooks.size,
+            'influential': int((cooks > 4 / cooks.size).sum()),
+        },
+        'breusch_pagan': breusch_pagan(residuals, split['X_test']),
+        'goldfeld_quandt': goldfeld_quandt(residuals, predictions),
+    }
+    run['diagnostics'] = diagnostics
+    return diagnostics
+
+@tracer.traced('feature_residuals')
+def feature_residuals(run, split, limit=FEATURE_PLOTS):
+    """Binned residuals against the `limit` features most related to the residual spread.
+
+    Features are ranked by the larger of the correlations of |residual| with
+    x and with |x - mean(x)|. Returns a list of (feature name, score, density dict).
+    """
+    X = split['X_test']
+    residuals = np.asarray(split['y_test'], dtype=np.float64) - np.asarray(run['predictions'], dtype=np.float64)
+    spread = np.abs(residuals)
+    spread -= spread.mean()
+    spread_std = spread.std() or 1.0
+
+    def correlation(values):
+        means = values.mean(axis=0, dtype=np.float64)
+        covariance = (spread @ values) / spread.size - spread.mean() * means
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.nan_to_num(covariance / (values.std(axis=0, dtype=np.float64) * spread_std))
+
+    X_mean = X.mean(axis=0, dtype=np.float64)
+    linear = correlation(X)
+    distance = correlation(np.abs(X - X_mean))
+    score = np.where(np.abs(distance) > np.abs(linear), distance, linear)
+
+    order = np.argsort(-np.abs(score))[:limit]
+    names = split['feature_names']
+    return [(names[j], float(score[j]), density(X[:, j], residuals)) for j in order]
+
+def _draw_density(ax, result, color):
+    if 'points' in result:
+        ax.scatter(*result['points'], s=8, alpha=0.5, color=color)
+    else:
+        counts, x_edges, y_edges = result['grid']
+        ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap='Blues', norm='log')
+    ax.plot(*result['trend'], color='orange', lw=1.5, label='binned mean')
+    ax.axhline(0, color='r', linestyle='--', lw=1)
+
+def build_diagnostics_figure(diagnostics, color='#2d5f8d', title='Residual Diagnostics'):
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 7), dpi=100)
+    axes = fig.subplots(2, 2)
+
+    ax = axes[0, 0]
+    _draw_density(ax, diagnostics['fitted'], color)
+    ax.set_title('Residuals vs Predicted', fontweight='bold')
+    ax.set_xlabel('Predicted Values')
+    ax.set_ylabel('Residuals')
+
+    ax = axes[0, 1]
+    counts, edges = diagnostics['histogram']
+    ax.stairs(counts, edges, fill=True, color=color, alpha=0.7)
+    ax.set_title('Residual Histogram', fontweight='bold')
+    ax.set_xlabel('Residual')
+    ax.set_ylabel('Frequency')
+
+    ax = axes[1, 0]
+    theoretical, sample = diagnostics['qq']
+    ax.plot(theoretical, sample, '.', color=color, markersize=3)
+    lims = [min(theoretical[0], sample[0]), max(theoretical[-1], sample[-1])]
+    ax.plot(lims, lims, '--r', lw=1)
+    ax.set_title('Normal Q-Q', fontweight='bold')
+    ax.set_xlabel('Theoretical Quantiles')
+    ax.set_ylabel('Standardized Residuals')
+
+    ax = axes[1, 1]
+    info = diagnostics['influence']
+    points = ax.scatter(info['leverage'], info['studentized'], c=info['cooks'], s=8, cmap='viridis')
+    fig.colorbar(points, ax=ax, label="Cook's distance")
+    ax.set_title(f"Leverage ({info['influential']:,} of {info['n']:,} with D > 4/n)", fontweight='bold')
+    ax.set_xlabel('Leverage (training rows)')
+    ax.set_ylabel('Studentized Residual')
+
+    for ax in axes.flat:
+        ax.grid(True, alpha=0.3)
+
+    bp, bp_p = diagnostics['breusch_pagan']
+    gq, gq_p = diagnostics['goldfeld_quandt']
+    fig.suptitle(f"{title}  ·  Breusch-Pagan LM={bp:.1f} (p={bp_p:.3g})  ·  "
+                 f"Goldfeld-Quandt F={gq:.2f} (p={gq_p:.3g})", fontsize=10, fontweight='bold')
+    fig.tight_layout()
+    return fig
+
+def build_feature_residuals_figure(features, color='#2d5f8d'):
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 7), dpi=100)
+    cols = min(3, len(features))
+    rows = -(-len(features) // cols)
+    axes = np.atleast_1d(fig.subplots(rows, cols)).ravel()
+    for ax, (name, score, result) in zip(axes, features):
+        _draw_density(ax, result, color)
+        ax.set_title(f'{name} (r={score:+.2f} with |residual|)', fontsize=9)
+        ax.grid(True, alpha=0.3)
+    for ax in axes[len(features):]:
+        ax.set_visible(False)
+    fig.suptitle('Residuals vs Features', fontweight='bold')
+    fig.tight_layout()
+    return fig
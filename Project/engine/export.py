@@ -0,0 +1,101 @@
+"""Batch chart export across worker processes.
+
+batch_export renders a set of chart types for one or more datasets, one
+(dataset, chart) task per worker call, and writes each figure as PNG, SVG or
+PDF. A dataset source is a CSV path or a workspace cache directory (see
+engine.workspace.Workspace.path); cache directories are memory-mapped, so
+every worker shares the same pages instead of parsing the data again. Each
+worker also keeps the last dataset it opened, since consecutive tasks are
+usually for the same dataset.
+
+With report_path, the figures are also sent back to the parent process and
+written as the pages of one PDF.
+"""
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import charts
+from engine.profiling import tracer
+
+EXPORT_FORMATS = ('png', 'svg', 'pdf')
+
+# (source, DataFrame, ColumnSummaries) last opened by this worker process
+_worker_dataset = None
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+def open_dataset(source, exact=False):
+    """DataFrame and column summaries of a CSV file or workspace cache directory, reused across tasks"""
+    global _worker_dataset
+    if _worker_dataset is None or _worker_dataset[0] != source:
+        from engine import dataset, summary, workspace
+        if os.path.isdir(source):
+            df = workspace.load_dataset_dir(source)
+        else:
+            df = dataset.read_dataset(source)
+        _worker_dataset = (source, df, summary.ColumnSummaries(df, exact=exact))
+    return _worker_dataset[1], _worker_dataset[2]
+
+def file_stem(name):
+    """A file-name-safe version of a dataset name"""
+    return re.sub(r'[^\w.-]+', '_', os.path.splitext(name)[0]).strip('_') or 'dataset'
+
+def render_chart(task):
+    """Build one chart and save it; returns a result dict, with the figure if task['keep_figure']"""
+    result = {'dataset': task['name'], 'chart': task['chart']}
+    try:
+        df, summaries = open_dataset(task['source'], task['exact'])
+        fig = charts.CHART_BUILDERS[task['chart']](df, task['color'], summaries=summaries)
+        if task['format']:
+            path = os.path.join(task['out_dir'], f"{file_stem(task['name'])}_{task['chart']}.{task['format']}")
+            fig.savefig(path, dpi=task['dpi'], bbox_inches='tight')
+            result['path'] = path
+        if task['keep_figure']:
+            result['figure'] = fig
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+@tracer.traced('batch_export')
+def batch_export(datasets, chart_types=None, fmt='png', out_dir='.', dpi=300, report_path=None,
+                 color=charts.DEFAULT_CHART_COLOR, exact=False, jobs=None):
+    """Render chart_types (default: all) for each (name, source) in datasets.
+
+    fmt may be None to write only the PDF report. Returns one result dict per
+    (dataset, chart) in order, with 'path' or 'error'.
+    """
+    global _worker_dataset
+    chart_types = list(chart_types or charts.CHART_BUILDERS)
+    if fmt is not None and fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt is None and report_path is None:
+        raise ValueError("Choose an export format or a PDF report")
+    if fmt:
+        os.makedirs(out_dir, exist_ok=True)
+
+    tasks = [{'name': name, 'source': source, 'chart': chart, 'format': fmt, 'out_dir': out_dir,
+              'dpi': dpi, 'color': color, 'exact': exact, 'keep_figure': report_path is not None}
+             for name, source in datasets for chart in chart_types]
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+    if jobs <= 1:
+        results = [render_chart(task) for task in tasks]
+        _worker_dataset = None
+    else:
+        # spawn: the parent may be a Tk process with running threads, which must not be forked
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker) as pool:
+            results = list(pool.map(render_chart, tasks))
+
+    if report_path is not None:
+        from matplotlib.backends.backend_pdf import PdfPages
+        with PdfPages(report_path) as pdf:
+            for result in results:
+                fig = result.pop('figure', None)
+                if fig is not None:
+                    fig.text(0.01, 0.99, result['dataset'], fontsize=8, va='top', color='gray')
+                    pdf.savefig(fig)
+    return results
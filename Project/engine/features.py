@@ -0,0 +1,334 @@
+"""Feature engineering for the regression tab.
+
+A FeaturePipeline turns a DataFrame of raw columns into a numeric feature
+matrix:
+
+- numeric columns have missing values imputed with the column mean, median
+  or a constant, optionally with a 0/1 missing-indicator feature for each
+  column that had missing values;
+- categorical and text columns with at most `max_onehot` levels are one-hot
+  encoded (first level dropped, missing values as a level of their own);
+  columns with more levels are target encoded with smoothed category means;
+- optionally, pairwise products and squares of the numeric columns are added.
+
+fit_transform reads each used column once, computes every statistic with
+vectorized reductions over it (np.bincount over category codes, nan-aware
+column statistics) and writes the features into a single preallocated array.
+Only the pipeline's columns are looked at, and only rows with a missing
+target are dropped. Target encoding of the fitted rows is out-of-fold, so a
+row's own target never leaks into its encoding. engineer_features fits the
+pipeline on the training rows of the later train/test split only, and
+transforms the test rows with those statistics.
+transform(df, sparse=True) returns a scipy CSR matrix instead, built
+directly from the category codes, for estimators that accept sparse input.
+
+engineer_features caches its results per dataset fingerprint, so choosing
+the same dataset and target again does not recompute anything.
+"""
+import collections
+import hashlib
+import itertools
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from engine.model import split_indices
+from engine.profiling import tracer
+from engine.summary import category_codes
+
+MAX_ONEHOT = 20
+TARGET_SMOOTHING = 10.0
+TARGET_FOLDS = 5
+IMPUTE_STRATEGIES = ('mean', 'median', 'constant')
+# Columns whose distinct values exceed this fraction of the rows are free text and not used
+MAX_LEVEL_RATIO = 0.5
+# At most this many numeric columns (those most correlated with the target) get interaction terms
+MAX_INTERACTION_COLUMNS = 30
+CACHE_SIZE = 4
+
+_cache = collections.OrderedDict()
+
+def is_text(dtype):
+    return (isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(dtype)
+            or pd.api.types.is_object_dtype(dtype))
+
+def feature_columns(df, target_col):
+    """(numeric, categorical) columns of df usable as features for target_col"""
+    numeric, categorical = [], []
+    for col, dtype in df.dtypes.items():
+        if col == target_col:
+            continue
+        if pd.api.types.is_numeric_dtype(dtype):
+            numeric.append(col)
+        elif is_text(dtype):
+            categorical.append(col)
+    return numeric, categorical
+
+def _levels_codes(series, levels):
+    """Codes of series against the fitted levels: -1 for unseen, -2 for missing"""
+    codes = pd.Index(levels).get_indexer(series).astype(np.intp, copy=False)
+    codes[series.isna().to_numpy()] = -2
+    return codes
+
+class FeaturePipeline:
+    def __init__(self, numeric, categorical, max_onehot=MAX_ONEHOT, interactions=False, impute='mean',
+                 fill_value=0.0, indicators=False, smoothing=TARGET_SMOOTHING, folds=TARGET_FOLDS, seed=0):
+        if impute not in IMPUTE_STRATEGIES:
+            raise ValueError(f"Unknown imputation strategy: {impute}")
+        self.numeric = list(numeric)
+        self.categorical = list(categorical)
+        self.impute = impute
+        self.fill_value = fill_value
+        self.indicators = indicators
+        self.max_onehot = max_onehot
+        self.interactions = interactions
+        self.smoothing = smoothing
+        self.folds = folds
+        self.seed = seed
+        self.fill = {}
+        self.flagged = []
+        self.encoders = {}
+        self.pairs = []
+        self.feature_names = []
+        # Row positions the pipeline was fitted on and held out from, when set by engineer_features
+        self.train_rows = None
+        self.test_rows = None
+
+    def _fit_numeric(self, df):
+        """Fit the fill values and return the imputed numeric block with its missing mask"""
+        values = df[self.numeric].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        missing = np.isnan(values)
+        if self.impute == 'constant' or not len(values):
+            fill = np.full(len(self.numeric), self.fill_value, dtype=np.float64)
+        else:
+            reduce = np.nanmean if self.impute == 'mean' else np.nanmedian
+            with np.errstate(invalid='ignore'), warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)  # all-missing columns
+                fill = np.nan_to_num(reduce(values, axis=0), nan=self.fill_value)
+        self.fill = dict(zip(self.numeric, fill.tolist()))
+        has_missing = missing.any(axis=0)
+        self.flagged = [col for col, flag in zip(self.numeric, has_missing) if flag] if self.indicators else []
+        return self._impute(values, missing), missing
+
+    def _fit_categorical(self, series, y):
+        codes, levels = category_codes(series)
+        codes = np.asarray(codes, dtype=np.intp)
+        if len(levels) > MAX_LEVEL_RATIO * max(len(series), 1) and len(levels) > self.max_onehot:
+            return None
+        missing = codes < 0
+        if len(levels) <= self.max_onehot:
+            return {'kind': 'onehot', 'levels': levels, 'missing': bool(missing.any()),
+                    'fitted': np.where(missing, -2, codes)}
+
+        k = len(levels)
+        codes = np.where(missing, k, codes)  # missing values form level k
+        prior = float(y.mean())
+        counts = np.bincount(codes, minlength=k + 1)
+        sums = np.bincount(codes, weights=y, minlength=k + 1)
+        m = self.smoothing
+        encoding = (sums + m * prior) / (counts + m)
+
+        # Out-of-fold encoding of the fitted rows: subtract each row's fold from the
+        # totals, the prior included
+        fold = np.random.default_rng(self.seed).integers(self.folds, size=codes.size)
+        index = fold * (k + 1) + codes
+        fold_counts = np.bincount(index, minlength=self.folds * (k + 1))[index]
+        fold_sums = np.bincount(index, weights=y, minlength=self.folds * (k + 1))[index]
+        rest = codes.size - np.bincount(fold, minlength=self.folds)
+        rest_sums = y.sum() - np.bincount(fold, weights=y, minlength=self.folds)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fold_prior = np.where(rest > 0, rest_sums / rest, prior)[fold]
+        fitted = (sums[codes] - fold_sums + m * fold_prior) / (counts[codes] - fold_counts + m)
+        return {'kind': 'target', 'levels': levels, 'encoding': encoding, 'prior': prior, 'fitted': fitted}
+
+    def _choose_pairs(self, values, y):
+        columns = self.numeric
+        if len(columns) > MAX_INTERACTION_COLUMNS:
+            values = values - values.mean(axis=0)
+            centered = y - y.mean()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr = np.nan_to_num((centered @ values) / (values.std(axis=0) * (centered.std() or 1.0)))
+            columns = [self.numeric[j] for j in np.argsort(-np.abs(corr))[:MAX_INTERACTION_COLUMNS]]
+        return list(itertools.combinations_with_replacement(columns, 2))
+
+    @tracer.traced('fit_features')
+    def fit_transform(self, df, y, dtype=np.float64):
+        """Fit on df and the target y, and return the fitted rows' features as a DataFrame"""
+        y = np.asarray(y, dtype=np.float64)
+        numeric = self._fit_numeric(df)
+        self.encoders = {}
+        for col in self.categorical:
+            encoder = self._fit_categorical(df[col], y)
+            if encoder is not None:
+                self.encoders[col] = encoder
+        self.categorical = list(self.encoders)
+        self.pairs = self._choose_pairs(numeric[0], y) if self.interactions else []
+        self.feature_names = self._names()
+
+        X = self._dense(df, dtype, numeric, fitted=True)
+        for encoder in self.encoders.values():
+            encoder.pop('fitted', None)
+        return X
+
+    def _names(self):
+        names = list(self.numeric) + [f'{col}_missing' for col in self.flagged]
+        for col, encoder in self.encoders.items():
+            if encoder['kind'] == 'target':
+                names.append(f'{col}_target')
+                continue
+            names.extend(f'{col}={level}' for level in encoder['levels'][1:])
+            if encoder['missing']:
+                names.append(f'{col}=<missing>')
+        names.extend(f'{a}*{b}' if a != b else f'{a}^2' for a, b in self.pairs)
+        return names
+
+    def _impute(self, values, missing):
+        if missing.any():
+            fill = np.array([self.fill[col] for col in self.numeric])
+            values[missing] = np.broadcast_to(fill, values.shape)[missing]
+        return values
+
+    def _numeric_block(self, df):
+        """Imputed numeric columns of new rows and their missing mask"""
+        values = df[self.numeric].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        missing = np.isnan(values)
+        return self._impute(values, missing), missing
+
+    def _indicator_block(self, missing):
+        position = {col: j for j, col in enumerate(self.numeric)}
+        return missing[:, [position[col] for col in self.flagged]]
+
+    def _onehot_columns(self, encoder, codes):
+        """(row, column) positions of the ones for a one-hot encoder, relative to its first column"""
+        n_levels = len(encoder['levels'])
+        rows = np.arange(codes.size)
+        # Level 0 is the dropped reference level; missing values get the column after the last level
+        columns = np.where(codes == -2, n_levels - 1 if encoder['missing'] else -1, codes - 1)
+        keep = columns >= 0
+        return rows[keep], columns[keep]
+
+    def _width(self, encoder):
+        if encoder['kind'] == 'target':
+            return 1
+        return len(encoder['levels']) - 1 + encoder['missing']
+
+    def _dense(self, df, dtype, numeric=None, fitted=False):
+        n = len(df)
+        X = np.zeros((n, len(self.feature_names)), dtype=dtype)
+        numeric, missing = numeric if numeric is not None else self._numeric_block(df)
+        X[:, :len(self.numeric)] = numeric
+        offset = len(self.numeric)
+        X[:, offset:offset + len(self.flagged)] = self._indicator_block(missing)
+        offset += len(self.flagged)
+
+        for col, encoder in self.encoders.items():
+            if encoder['kind'] == 'target':
+                if fitted:
+                    X[:, offset] = encoder['fitted']
+                else:
+                    codes = _levels_codes(df[col], encoder['levels'])
+                    k = len(encoder['levels'])
+                    values = encoder['encoding'][np.where(codes == -2, k, codes)]
+                    values[codes == -1] = encoder['prior']
+                    X[:, offset] = values
+            else:
+                codes = encoder['fitted'] if fitted else _levels_codes(df[col], encoder['levels'])
+                rows, columns = self._onehot_columns(encoder, codes)
+                X[rows, offset + columns] = 1
+            offset += self._width(encoder)
+
+        position = {col: j for j, col in enumerate(self.numeric)}
+        for a, b in self.pairs:
+            np.multiply(numeric[:, position[a]], numeric[:, position[b]], out=X[:, offset], casting='unsafe')
+            offset += 1
+        return pd.DataFrame(X, columns=self.feature_names, index=df.index, copy=False)
+
+    def _sparse(self, df, dtype):
+        from scipy import sparse
+        numeric, missing = self._numeric_block(df)
+        blocks = [sparse.csr_matrix(numeric.astype(dtype)),
+                  sparse.csr_matrix(self._indicator_block(missing).astype(dtype))]
+        for col, encoder in self.encoders.items():
+            codes = _levels_codes(df[col], encoder['levels'])
+            if encoder['kind'] == 'target':
+                k = len(encoder['levels'])
+                values = encoder['encoding'][np.where(codes == -2, k, codes)]
+                values[codes == -1] = encoder['prior']
+                blocks.append(sparse.csr_matrix(values.astype(dtype)[:, None]))
+            else:
+                rows, columns = self._onehot_columns(encoder, codes)
+                blocks.append(sparse.csr_matrix((np.ones(rows.size, dtype=dtype), (rows, columns)),
+                                                shape=(len(df), self._width(encoder))))
+        if self.pairs:
+            position = {col: j for j, col in enumerate(self.numeric)}
+            products = np.column_stack([numeric[:, position[a]] * numeric[:, position[b]] for a, b in self.pairs])
+            blocks.append(sparse.csr_matrix(products.astype(dtype)))
+        return sparse.hstack(blocks, format='csr')
+
+    def transform(self, df, dtype=np.float64, sparse=False):
+        """Features of new rows with the fitted statistics; a CSR matrix when sparse=True"""
+        missing = [col for col in self.numeric + self.categorical if col not in df.columns]
+        if missing:
+            raise ValueError(f"Missing feature columns: {', '.join(map(str, missing))}")
+        if sparse:
+            return self._sparse(df, dtype)
+        return self._dense(df, dtype)
+
+def fingerprint(df):
+    """Content hash of a DataFrame's values, column names and dtypes"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+@tracer.traced('engineer_features')
+def engineer_features(df, target_col, feature_dtype=np.float64, encode_text=True, interactions=False,
+                      impute='mean', indicators=False, max_onehot=MAX_ONEHOT, test_size=0.2, random_state=42):
+    """Fit a FeaturePipeline on df to predict target_col, as (X, y, pipeline).
+
+    Rows with a missing target are dropped; missing feature values are imputed
+    (see FeaturePipeline). With encode_text=False only the numeric columns are
+    used. The rows are split with engine.model.split_indices(test_size,
+    random_state) and the pipeline is fitted on the training rows alone, so
+    no test value or target informs the features; pipeline.train_rows and
+    pipeline.test_rows record the split for split_regression. Results are
+    cached per (dataset fingerprint, options).
+    """
+    if target_col not in df.columns:
+        raise ValueError(f"Column '{target_col}' not found")
+    if not pd.api.types.is_numeric_dtype(df[target_col]):
+        raise ValueError(f"Target column '{target_col}' must be numeric")
+
+    key = (fingerprint(df), target_col, np.dtype(feature_dtype).name, encode_text, interactions, impute, indicators,
+           max_onehot, test_size, random_state)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    known = df[target_col].notna().to_numpy()
+    if not known.all():
+        df = df[known]
+    y = df[target_col].astype(np.float64)
+
+    numeric, categorical = feature_columns(df, target_col)
+    if not encode_text:
+        categorical = []
+    pipeline = FeaturePipeline(numeric, categorical, max_onehot, interactions, impute, indicators=indicators)
+    train_rows, test_rows = split_indices(len(df), test_size, random_state)
+    train = pipeline.fit_transform(df.iloc[train_rows], y.to_numpy()[train_rows], feature_dtype)
+    if train.shape[1] == 0:
+        raise ValueError("No usable features found in the data")
+    pipeline.train_rows, pipeline.test_rows = train_rows, test_rows
+
+    # Training and test features back in the rows' original order
+    values = np.empty((len(df), train.shape[1]), dtype=feature_dtype)
+    values[train_rows] = train.to_numpy()
+    del train
+    values[test_rows] = pipeline.transform(df.iloc[test_rows], feature_dtype).to_numpy()
+    X = pd.DataFrame(values, columns=pipeline.feature_names, index=df.index, copy=False)
+
+    _cache[key] = (X, y, pipeline)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return _cache[key]
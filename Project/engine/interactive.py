@@ -0,0 +1,103 @@
+"""Responsive pan/zoom for embedded figures with many points.
+
+InteractiveRedraw attaches to a FigureCanvas that has a navigation toolbar.
+While the user drags in pan mode, large line and scatter artists are swapped
+for decimated copies and marked animated. Each redraw the toolbar requests
+then rasterises only the static parts (axes, ticks, grid); the decimated
+artists are blitted over that background in the canvas's draw_event. On
+release the full data is restored, and one full-resolution redraw is
+scheduled after the pointer settles, so quick successive drags cost a
+single expensive draw.
+"""
+import numpy as np
+from matplotlib.collections import PathCollection
+
+# Artists with more points than this are decimated while dragging
+DECIMATE_ABOVE = 20000
+DRAG_POINTS = 5000
+SETTLE_MS = 150
+
+class InteractiveRedraw:
+    """Decimates and blits the large artists of canvas.figure during pan drags"""
+
+    def __init__(self, canvas, threshold=DECIMATE_ABOVE, drag_points=DRAG_POINTS, settle_ms=SETTLE_MS, seed=0):
+        self.canvas = canvas
+        self.dragging = False
+        self.swaps = []
+
+        rng = np.random.default_rng(seed)
+        for ax in canvas.figure.axes:
+            for line in ax.lines:
+                n = len(line.get_xdata())
+                if n > threshold:
+                    step = -(-n // drag_points)
+                    full = line.get_data()
+                    self.swaps.append((line, full, (full[0][::step], full[1][::step])))
+            for collection in ax.collections:
+                if isinstance(collection, PathCollection) and len(collection.get_offsets()) > threshold:
+                    # Offsets and any per-point colours, colour-mapped values and
+                    # sizes are subsampled with the same rows so points keep their look
+                    full = (collection.get_offsets(), collection.get_facecolors(),
+                            collection.get_array(), collection.get_sizes())
+                    n = len(full[0])
+                    rows = np.sort(rng.choice(n, min(drag_points, n), replace=False))
+                    decimated = tuple(v[rows] if v is not None and len(v) == n else v for v in full)
+                    self.swaps.append((collection, full, decimated))
+
+        self.timer = canvas.new_timer(interval=settle_ms)
+        self.timer.single_shot = True
+        self.timer.add_callback(self.settle)
+        self.connections = [
+            canvas.mpl_connect('button_press_event', self.on_press),
+            canvas.mpl_connect('button_release_event', self.on_release),
+            canvas.mpl_connect('draw_event', self.on_draw),
+        ]
+
+    @staticmethod
+    def _apply(artist, data):
+        if isinstance(artist, PathCollection):
+            offsets, colors, values, sizes = data
+            artist.set_offsets(offsets)
+            artist.set_facecolors(colors)
+            artist.set_array(values)
+            artist.set_sizes(sizes)
+        else:
+            artist.set_data(*data)
+
+    def _panning(self):
+        toolbar = getattr(self.canvas, 'toolbar', None)
+        return toolbar is not None and toolbar.mode == 'pan/zoom'
+
+    def on_press(self, event):
+        if not self.swaps or not self._panning() or event.inaxes is None:
+            return
+        self.timer.stop()
+        self.dragging = True
+        for artist, _, decimated in self.swaps:
+            self._apply(artist, decimated)
+            artist.set_animated(True)
+
+    def on_draw(self, event):
+        """A full draw during a drag skipped the animated artists; blit them over it"""
+        if not self.dragging:
+            return
+        for artist, _, _ in self.swaps:
+            artist.axes.draw_artist(artist)
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def on_release(self, event):
+        if not self.dragging:
+            return
+        self.dragging = False
+        for artist, full, _ in self.swaps:
+            artist.set_animated(False)
+            self._apply(artist, full)
+        self.timer.start()
+
+    def settle(self):
+        self.canvas.draw_idle()
+
+    def disconnect(self):
+        self.timer.stop()
+        for cid in self.connections:
+            self.canvas.mpl_disconnect(cid)
@@ -0,0 +1,38 @@
+"""Deferred imports, so heavy libraries load the first time a feature needs them"""
+import importlib
+import threading
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access"""
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+    
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+def lazy_import(name):
+    """Return a LazyModule proxy for the named module"""
+    return LazyModule(name)
+
+def warm_imports(modules):
+    """Load LazyModule proxies (or module names) in a background daemon thread"""
+    def worker():
+        for module in modules:
+            try:
+                if isinstance(module, LazyModule):
+                    module.load()
+                else:
+                    importlib.import_module(module)
+            except ImportError:
+                pass
+    
+    thread = threading.Thread(target=worker, name="import-warmup", daemon=True)
+    thread.start()
+    return thread
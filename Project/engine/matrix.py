@@ -0,0 +1,42 @@
+"""Matrix parsing and arithmetic"""
+import numpy as np
+
+def parse_matrix_text(text):
+    """Parse a matrix written one row per line, values separated by commas or whitespace"""
+    elements = []
+    for line in text.strip().split('\n'):
+        if line.strip():
+            row = [float(x) for x in line.replace(',', ' ').split()]
+            elements.append(row)
+    
+    if not elements:
+        raise ValueError("Matrix is empty")
+    if any(len(row) != len(elements[0]) for row in elements):
+        raise ValueError(f"Each row must have {len(elements[0])} columns")
+    
+    return np.array(elements)
+
+MATRIX_OPERATIONS = ('add', 'subtract', 'multiply', 'transpose', 'determinant')
+
+def matrix_operation(op, a, b=None):
+    """Apply a named matrix operation; transpose and determinant use only a"""
+    if op in ('add', 'subtract', 'multiply') and (a is None or b is None):
+        raise ValueError("Both matrices needed")
+    if a is None:
+        raise ValueError("Matrix not loaded")
+    
+    if op == 'add' or op == 'subtract':
+        if a.shape != b.shape:
+            raise ValueError("Same dimensions required")
+        return a + b if op == 'add' else a - b
+    if op == 'multiply':
+        if a.shape[1] != b.shape[0]:
+            raise ValueError("Column of A must equal row of B")
+        return np.dot(a, b)
+    if op == 'transpose':
+        return a.T
+    if op == 'determinant':
+        if a.shape[0] != a.shape[1]:
+            raise ValueError("Must be square")
+        return np.linalg.det(a)
+    raise ValueError(f"Unknown matrix operation '{op}'")
@@ -0,0 +1,364 @@
+"""Regression models: estimator registry, fused scoring kernel and metrics"""
+import importlib
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+from engine.profiling import begin_peak, end_peak, tracer
+
+class FusedLinearPredictor:
+    """StandardScaler + linear model folded into one coefficient vector and intercept.
+
+    coef_eff = coef / scale and intercept_eff = intercept - coef_eff . mean, so
+    predict() is a single matrix-vector product on the raw (unscaled) features
+    and never materialises a scaled copy of X. With dtype=None, predict()
+    computes in the dtype of its float input; np.float32 is the opt-in
+    compact mode.
+    """
+
+    def __init__(self, scaler, model, dtype=None):
+        coef = np.ravel(model.coef_).astype(np.float64)
+
+        if getattr(scaler, 'scale_', None) is not None:
+            coef = coef / scaler.scale_
+
+        intercept = float(np.ravel(model.intercept_)[0])
+        if getattr(scaler, 'mean_', None) is not None:
+            intercept -= float(np.dot(scaler.mean_, coef))
+
+        self.dtype = dtype
+        self.coef_ = coef if dtype is None else coef.astype(dtype)
+        self.intercept_ = intercept
+
+    def predict(self, X):
+        """Predict from raw features; no copy is made when X already has self.dtype (or is float)"""
+        X = np.asarray(X, dtype=self.dtype)
+        if not np.issubdtype(X.dtype, np.floating):
+            X = X.astype(np.float64)
+        return X @ self.coef_.astype(X.dtype, copy=False) + self.intercept_
+
+# Registered regression estimators. Each entry holds a zero-argument factory,
+# a rough peak-memory estimate in bytes for an (n_samples, n_features) float64
+# training matrix, and whether the model is linear (so it can use the fused kernel).
+ESTIMATOR_REGISTRY = {}
+
+def lazy_estimator(module, class_name, **params):
+    """Estimator factory that imports scikit-learn only when a model is built"""
+    def factory():
+        return getattr(importlib.import_module(module), class_name)(**params)
+    return factory
+
+def register_estimator(name, factory, memory_estimate, linear=False):
+    """Add an estimator to the regression model registry"""
+    ESTIMATOR_REGISTRY[name] = {
+        'factory': factory,
+        'memory_estimate': memory_estimate,
+        'linear': linear,
+    }
+
+register_estimator("Linear Regression", lazy_estimator('sklearn.linear_model', 'LinearRegression'),
+                   lambda n, p: 8 * n * p * 2 + 8 * p * p, linear=True)
+register_estimator("Ridge", lazy_estimator('sklearn.linear_model', 'Ridge', alpha=1.0),
+                   lambda n, p: 8 * n * p * 2 + 8 * p * p, linear=True)
+register_estimator("Lasso", lazy_estimator('sklearn.linear_model', 'Lasso', alpha=0.01),
+                   lambda n, p: 8 * n * p * 2 + 8 * p * p, linear=True)
+register_estimator("SGD Regressor", lazy_estimator('sklearn.linear_model', 'SGDRegressor', random_state=42),
+                   lambda n, p: 8 * n * p + 8 * p, linear=True)
+register_estimator("Hist Gradient Boosting",
+                   lazy_estimator('sklearn.ensemble', 'HistGradientBoostingRegressor', random_state=42),
+                   lambda n, p: n * p + 8 * n * 4 + 256 * p * 48)
+register_estimator("Random Forest",
+                   lazy_estimator('sklearn.ensemble', 'RandomForestRegressor',
+                                  n_estimators=100, n_jobs=-1, random_state=42),
+                   lambda n, p: 8 * n * p + 100 * n * 2 * 64)
+
+def available_memory_bytes():
+    """Best-effort available system memory in bytes, or None when unknown"""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def measure_call(func, *args, **kwargs):
+    """Run func and return (result, wall seconds, peak traced bytes).
+    
+    When tracemalloc is already running (the profiler's memory mode, or an
+    enclosing measure_call) it is left running and the peak is measured from
+    the current traced size. Nested calls do not lose the enclosing peak.
+    """
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    token = begin_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    finally:
+        peak = end_peak(token)
+        if not already_tracing:
+            tracemalloc.stop()
+    return result, elapsed, peak - base
+
+def regression_metrics(y_true, y_pred):
+    """MSE, RMSE, MAE and R² from sums over the residuals and the centred target.
+    
+    The total sum of squares is taken over y_true - mean(y_true) rather than
+    expanded as sum(y²) - sum(y)²/n, which cancels catastrophically when the
+    target has a large offset. All sums accumulate in float64.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    residuals = y_true - np.asarray(y_pred, dtype=np.float64)
+    n = residuals.size
+    
+    sse = float(residuals @ residuals)
+    sae = float(np.abs(residuals).sum())
+    centred = y_true - y_true.mean()
+    sst = float(centred @ centred)
+    
+    mse = sse / n
+    return {
+        'mse': mse,
+        'rmse': mse ** 0.5,
+        'mae': sae / n,
+        'r2': 1.0 - sse / sst if sst > 0 else 0.0,
+        'n': n,
+    }
+
+@tracer.traced('bootstrap_metric_intervals')
+def bootstrap_metric_intervals(y_true, y_pred, n_boot=None, confidence=0.95, seed=42,
+                               max_block_elements=1 << 24):
+    """Percentile bootstrap confidence intervals for MSE, RMSE, MAE and R².
+    
+    Replicates are drawn as a (replicates, n) resampling index matrix and all
+    metrics are reduced along axis 1. Replicates are processed in blocks of at
+    most max_block_elements indices so memory stays bounded on large test sets.
+    When n_boot is None it defaults to 1000, reduced (to no fewer than 100) so
+    that about 1e8 indices are drawn in total. Returns {metric: (low, high)}.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    residuals = y_true - np.asarray(y_pred, dtype=np.float64)
+    # Shifting by the mean keeps a large target offset out of the per-replicate sums
+    centred = y_true - y_true.mean()
+    n = residuals.size
+    if n_boot is None:
+        n_boot = min(1000, max(100, 10 ** 8 // max(n, 1)))
+    rng = np.random.default_rng(seed)
+    index_dtype = np.int32 if n < np.iinfo(np.int32).max else np.int64
+    block = max(1, min(n_boot, max_block_elements // max(n, 1)))
+    
+    mse = np.empty(n_boot)
+    mae = np.empty(n_boot)
+    r2 = np.empty(n_boot)
+    for start in range(0, n_boot, block):
+        stop = min(start + block, n_boot)
+        idx = rng.integers(0, n, size=(stop - start, n), dtype=index_dtype)
+        
+        r = residuals[idx]
+        sse = np.einsum('ij,ij->i', r, r)
+        mae[start:stop] = np.abs(r).sum(axis=1) / n
+        del r
+        
+        y = centred[idx]
+        y -= y.mean(axis=1, keepdims=True)
+        sst = np.einsum('ij,ij->i', y, y)
+        del y
+        
+        mse[start:stop] = sse / n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r2[start:stop] = np.where(sst > 0, 1.0 - sse / sst, 0.0)
+    
+    tail = (1.0 - confidence) / 2 * 100
+    bounds = [tail, 100 - tail]
+    mse_bounds = np.percentile(mse, bounds)
+    return {
+        'mse': tuple(mse_bounds.tolist()),
+        'rmse': tuple(np.sqrt(mse_bounds).tolist()),
+        'mae': tuple(np.percentile(mae, bounds).tolist()),
+        'r2': tuple(np.percentile(r2, bounds).tolist()),
+    }
+
+def split_indices(n, test_size=0.2, random_state=42):
+    """(train, test) row position arrays for a random train/test split of n rows"""
+    from sklearn.model_selection import train_test_split
+    return train_test_split(np.arange(n), test_size=test_size, random_state=random_state)
+
+@tracer.traced('split_regression')
+def split_regression(X, y, dtype=np.float64, test_size=0.2, random_state=42, pipeline=None):
+    """Split features and target into train and test sets and fit the scaler.
+    
+    The split is done on row index arrays over a single feature matrix, so no
+    intermediate DataFrames are copied. The training rows are scaled in place;
+    'X_test' keeps the raw features for the fused kernel. `pipeline` is the
+    engine.features.FeaturePipeline that produced X, if any; it is kept with
+    the split and its runs so new raw rows can be scored, and when it records
+    the rows it was fitted on, those are the training rows. Returns a dict.
+    """
+    from sklearn.preprocessing import StandardScaler
+    
+    X_values = X.to_numpy(dtype=dtype)
+    y_values = y.to_numpy()
+    
+    if pipeline is not None and pipeline.train_rows is not None:
+        train_idx, test_idx = pipeline.train_rows, pipeline.test_rows
+    else:
+        train_idx, test_idx = split_indices(len(X_values), test_size, random_state)
+    
+    X_train = X_values[train_idx]
+    X_test = X_values[test_idx]
+    del X_values
+    
+    scaler = StandardScaler(copy=False)
+    X_train_scaled = scaler.fit_transform(X_train)
+    scaler.set_params(copy=True)
+    
+    return {
+        'feature_names': X.columns.tolist(),
+        'train_idx': train_idx,
+        'test_idx': test_idx,
+        'X_train_scaled': X_train_scaled,
+        'X_test': X_test,
+        'y_train': y_values[train_idx],
+        'y_test': y_values[test_idx],
+        'scaler': scaler,
+        'pipeline': pipeline,
+    }
+
+def fit_registered_estimator(name, split, memory_budget_fraction=0.5):
+    """Fit a registered estimator on a split and record its cost.
+    
+    Returns a run record dict, or None when the estimator's memory estimate
+    does not fit in the remaining memory budget.
+    """
+    spec = ESTIMATOR_REGISTRY[name]
+    scaler = split['scaler']
+    X_test = split['X_test']
+    n_samples, n_features = split['X_train_scaled'].shape
+    
+    required = spec['memory_estimate'](n_samples, n_features)
+    available = available_memory_bytes()
+    if available is not None and required > available * memory_budget_fraction:
+        return None
+    
+    model = spec['factory']()
+    with tracer.span('fit', model=name, samples=n_samples, features=n_features):
+        _, fit_time, fit_mem = measure_call(model.fit, split['X_train_scaled'], split['y_train'])
+    
+    with tracer.span('predict', model=name):
+        if spec['linear']:
+            # Score through the folded scaler+model kernel on the raw features
+            # Compact splits opt in to float32 scoring; otherwise the kernel keeps X_test's dtype
+            dtype = np.float32 if X_test.dtype == np.float32 else None
+            fused = FusedLinearPredictor(scaler, model, dtype=dtype)
+            predictions, predict_time, predict_mem = measure_call(fused.predict, X_test)
+        else:
+            fused = None
+            predictions, predict_time, predict_mem = measure_call(
+                lambda X: model.predict(scaler.transform(X)), X_test)
+    
+    return {
+        'name': name,
+        'model': model,
+        'fused_model': fused,
+        'scaler': scaler,
+        'pipeline': split.get('pipeline'),
+        'feature_names': split['feature_names'],
+        'predictions': predictions,
+        'fit_time': fit_time,
+        'fit_memory': fit_mem,
+        'predict_time': predict_time,
+        'predict_memory': predict_mem,
+        'metrics': regression_metrics(split['y_test'], predictions),
+        'metrics_ci': None,
+        'diagnostics': None,
+        'importance': None,
+    }
+
+def predict_run(run, X):
+    """Score new raw rows (DataFrame with the training columns) with a fitted run.
+    
+    When the run was trained on engineered features, its pipeline imputes and
+    encodes the raw columns with the statistics fitted on the training data.
+    """
+    if run.get('pipeline') is not None:
+        X = run['pipeline'].transform(X)
+    X = X[run['feature_names']]
+    if run['fused_model'] is not None:
+        return run['fused_model'].predict(X.to_numpy(dtype=run['fused_model'].dtype))
+    return run['model'].predict(run['scaler'].transform(X.to_numpy()))
+
+def predict_array(run, X):
+    """Score a raw feature array (columns in training order) with a fitted run"""
+    if run['fused_model'] is not None:
+        return run['fused_model'].predict(X)
+    return run['model'].predict(run['scaler'].transform(X))
+
+@tracer.traced('permutation_importance')
+def permutation_importance(run, X, y, n_repeats=5, seed=42, jobs=None):
+    """Drop in test R² when each feature column is shuffled, n_repeats times per feature.
+    
+    X is scaled once; features are split into contiguous blocks, one per worker
+    thread, and each worker gets a single Fortran-ordered copy of the scaled
+    features in which it permutes one column in place, restoring it after every
+    score. The fitted model predicts on that buffer directly, so no per-feature
+    or per-repeat copy or transform of X is made. Prediction runs in
+    NumPy/scikit-learn code that releases the GIL, so the threads score
+    concurrently. Each feature draws from its own seeded generator, so results
+    do not depend on the number of workers.
+    Returns a dict with the (n_features, n_repeats) 'importances', their
+    'mean' and 'std', and the unpermuted 'baseline' R².
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    y = np.asarray(y, dtype=np.float64)
+    n_features = X.shape[1]
+    predict = run['model'].predict
+    X = np.asarray(X)
+    dtype = X.dtype if np.issubdtype(X.dtype, np.floating) else np.float64
+    scaled = run['scaler'].transform(np.array(X, dtype=dtype, order='F'), copy=False)
+    baseline = regression_metrics(y, predict(scaled))['r2']
+    importances = np.empty((n_features, n_repeats))
+    
+    def score_block(features, buffer):
+        for j in features:
+            rng = np.random.default_rng([seed, j])
+            column = buffer[:, j].copy()
+            for r in range(n_repeats):
+                buffer[:, j] = column[rng.permutation(column.size)]
+                importances[j, r] = baseline - regression_metrics(y, predict(buffer))['r2']
+            buffer[:, j] = column
+    
+    jobs = max(1, min(jobs or os.cpu_count() or 1, n_features))
+    blocks = np.array_split(np.arange(n_features), jobs)
+    # The first worker permutes the scaled array itself; the others need their own copy
+    buffers = [scaled] + [scaled.copy(order='F') for _ in blocks[1:]]
+    if jobs == 1:
+        score_block(blocks[0], buffers[0])
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            list(pool.map(score_block, blocks, buffers))
+    
+    return {
+        'importances': importances,
+        'mean': importances.mean(axis=1),
+        'std': importances.std(axis=1),
+        'baseline': baseline,
+        'n_repeats': n_repeats,
+    }
+
+def run_importance(run, split, n_repeats=5):
+    """Permutation importance of a run on its test split, cached in the run record"""
+    cached = run['importance']
+    if cached is None or cached['n_repeats'] != n_repeats:
+        run['importance'] = permutation_importance(run, split['X_test'], split['y_test'], n_repeats)
+    return run['importance']
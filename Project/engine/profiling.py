@@ -0,0 +1,180 @@
+"""Lightweight timing/memory spans for the hot paths.
+
+    with tracer.span('parse_csv'):
+        ...
+
+    @tracer.traced('charts.build_bar_chart')
+    def build_bar_chart(df): ...
+
+While the tracer is disabled (the default) span() returns a shared no-op
+context manager and traced functions are called straight through, so the
+instrumentation costs one attribute check. When enabled, finished spans are
+kept in a bounded buffer and can be exported as a Chrome trace
+(chrome://tracing, Perfetto).
+"""
+import collections
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SPAN = _NullSpan()
+
+# Highest tracemalloc peak wiped by a nested begin_peak() that enclosing regions have not read yet
+_wiped_peak = 0
+
+def begin_peak():
+    """Start a peak-memory region by resetting tracemalloc's peak; returns a token for end_peak.
+    
+    tracemalloc has a single process-wide peak, so a nested region's reset
+    would wipe the peak its enclosing regions have seen. The wiped value is
+    kept and folded back in by end_peak, so regions can nest freely.
+    """
+    global _wiped_peak
+    outer = max(_wiped_peak, tracemalloc.get_traced_memory()[1])
+    _wiped_peak = 0
+    tracemalloc.reset_peak()
+    return outer
+
+def end_peak(token):
+    """Peak traced bytes since the matching begin_peak, including any nested region's peak"""
+    global _wiped_peak
+    peak = max(tracemalloc.get_traced_memory()[1], _wiped_peak)
+    _wiped_peak = max(token, peak)
+    return peak
+
+class Span:
+    """A single timed region; created by Tracer.span()"""
+
+    __slots__ = ('tracer', 'name', 'args', 'start', 'depth', 'memory_start', 'peak_token')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        local = self.tracer._local
+        self.depth = getattr(local, 'depth', 0)
+        local.depth = self.depth + 1
+
+        self.memory_start = None
+        if self.tracer.track_memory and tracemalloc.is_tracing():
+            if self.depth == 0:
+                self.peak_token = begin_peak()
+            self.memory_start = tracemalloc.get_traced_memory()[0]
+
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.tracer._local.depth = self.depth
+
+        record = {
+            'name': self.name,
+            'start': self.start - self.tracer.epoch,
+            'duration': end - self.start,
+            'depth': self.depth,
+            'thread': threading.get_ident(),
+            'args': self.args,
+        }
+        if self.memory_start is not None:
+            record['memory_delta'] = tracemalloc.get_traced_memory()[0] - self.memory_start
+            if self.depth == 0:
+                record['memory_peak'] = end_peak(self.peak_token) - self.memory_start
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+
+        self.tracer._finish(record)
+        return False
+
+class Tracer:
+    """Collects spans; disabled by default"""
+
+    def __init__(self, max_spans=100000):
+        self.enabled = False
+        self.track_memory = False
+        self.epoch = time.perf_counter()
+        self.spans = collections.deque(maxlen=max_spans)
+        self.listeners = []
+        self._local = threading.local()
+        self._started_tracemalloc = False
+
+    def enable(self, track_memory=False):
+        self.track_memory = track_memory
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self.track_memory = False
+
+    def clear(self):
+        self.spans.clear()
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def traced(self, name=None):
+        """Decorator that wraps every call of a function in a span"""
+        def decorator(func):
+            return self.wrap(func, name or func.__qualname__)
+        return decorator
+
+    def wrap(self, func, name):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            with Span(self, name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def _finish(self, record):
+        self.spans.append(record)
+        # Listeners hear only top-level spans, e.g. one per button press
+        if record['depth'] == 0:
+            for listener in self.listeners:
+                listener(record)
+
+    def to_chrome_trace(self):
+        pid = os.getpid()
+        events = []
+        for s in self.spans:
+            args = dict(s['args'])
+            for key in ('memory_delta', 'memory_peak', 'error'):
+                if key in s:
+                    args[key] = s[key]
+            events.append({
+                'name': s['name'],
+                'ph': 'X',
+                'ts': s['start'] * 1e6,
+                'dur': s['duration'] * 1e6,
+                'pid': pid,
+                'tid': s['thread'],
+                'args': {k: v if isinstance(v, (int, float, str, bool)) else str(v) for k, v in args.items()},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+tracer = Tracer()
@@ -0,0 +1,131 @@
+"""Charts that are updated chunk by chunk while a file is still loading.
+
+Each progressive chart is built from the first chunk, then fed every chunk
+with update(chunk) and redrawn onto an Axes with draw(ax) as often as the
+caller likes. Their state is bounded: histograms keep a StreamingStats per
+column, line charts keep a stride-decimated copy of the series, and the
+scatter density keeps a uniform random sample of the points.
+"""
+import numpy as np
+
+from engine.sketch import StreamingStats
+from engine.summary import HISTOGRAM_BINS
+
+MAX_LINE_POINTS = 20000
+MAX_SCATTER_POINTS = 100000
+
+def numeric_chunk_columns(chunk, columns=None, limit=3):
+    numeric = chunk.select_dtypes(include=[np.number]).columns.tolist()
+    if columns:
+        numeric = [col for col in columns if col in numeric]
+    else:
+        numeric = numeric[:limit]
+    if not numeric:
+        raise ValueError("No numeric columns found")
+    return numeric
+
+class ProgressiveHistogram:
+    def __init__(self, first_chunk, columns=None):
+        self.columns = numeric_chunk_columns(first_chunk, columns)
+        self.stats = {col: StreamingStats() for col in self.columns}
+        self.rows = 0
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        for col in self.columns:
+            self.stats[col].update(chunk[col].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    def draw(self, ax):
+        ax.clear()
+        for col, stats in self.stats.items():
+            if stats.count:
+                counts, edges = stats.histogram.histogram(HISTOGRAM_BINS, stats.min, stats.max)
+                ax.stairs(counts, edges, fill=True, alpha=0.6, label=col)
+        ax.set_title(f'Histogram ({self.rows:,} rows)', fontweight='bold')
+        ax.set_xlabel('Value')
+        ax.set_ylabel('Frequency')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+class ProgressiveLine:
+    """Keeps every `stride`-th row; the stride doubles whenever more than max_points are held"""
+
+    def __init__(self, first_chunk, columns=None, max_points=MAX_LINE_POINTS):
+        self.columns = numeric_chunk_columns(first_chunk, columns)
+        self.max_points = max_points
+        self.stride = 1
+        self.rows = 0
+        self.x = np.empty(0, dtype=np.int64)
+        self.y = {col: np.empty(0) for col in self.columns}
+
+    def update(self, chunk):
+        offset = self.rows
+        self.rows += len(chunk)
+        rows = np.arange((-offset) % self.stride, len(chunk), self.stride)
+        self.x = np.concatenate([self.x, offset + rows])
+        for col in self.columns:
+            values = chunk[col].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+            self.y[col] = np.concatenate([self.y[col], values])
+
+        while self.x.size > self.max_points:
+            self.stride *= 2
+            keep = self.x % self.stride == 0
+            self.x = self.x[keep]
+            for col in self.columns:
+                self.y[col] = self.y[col][keep]
+
+    def draw(self, ax):
+        ax.clear()
+        for col in self.columns:
+            ax.plot(self.x, self.y[col], label=col, linewidth=1)
+        title = 'Line Chart' if self.stride == 1 else f'Line Chart (every {self.stride}th row)'
+        ax.set_title(f'{title}, {self.rows:,} rows', fontweight='bold')
+        ax.set_xlabel('Index')
+        ax.set_ylabel('Value')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+class ProgressiveScatterDensity:
+    """Hexbin density of two numeric columns from a uniform sample of the rows seen.
+
+    The sample keeps the max_points rows with the smallest random keys
+    (bottom-k sampling), so it stays uniform however the rows arrive.
+    """
+
+    def __init__(self, first_chunk, columns=None, max_points=MAX_SCATTER_POINTS, seed=42):
+        self.columns = numeric_chunk_columns(first_chunk, columns, limit=2)
+        if len(self.columns) < 2:
+            raise ValueError("CSV needs at least 2 numeric columns")
+        self.columns = self.columns[:2]
+        self.max_points = max_points
+        self.rng = np.random.default_rng(seed)
+        self.rows = 0
+        self.keys = np.empty(0)
+        self.points = np.empty((0, 2))
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        points = np.column_stack([chunk[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in self.columns])
+        points = points[~np.isnan(points).any(axis=1)]
+        keys = np.concatenate([self.keys, self.rng.random(len(points))])
+        points = np.concatenate([self.points, points])
+        if keys.size > self.max_points:
+            keep = np.argpartition(keys, self.max_points)[:self.max_points]
+            keys, points = keys[keep], points[keep]
+        self.keys, self.points = keys, points
+
+    def draw(self, ax):
+        ax.clear()
+        x_col, y_col = self.columns
+        if len(self.points):
+            ax.hexbin(self.points[:, 0], self.points[:, 1], gridsize=60, cmap='Blues', mincnt=1)
+        ax.set_title(f'{y_col} vs {x_col} density ({len(self.points):,} of {self.rows:,} rows)', fontweight='bold')
+        ax.set_xlabel(x_col)
+        ax.set_ylabel(y_col)
+        ax.grid(True, alpha=0.3)
+
+PROGRESSIVE_CHARTS = {
+    'histogram': ProgressiveHistogram,
+    'line': ProgressiveLine,
+    'scatter': ProgressiveScatterDensity,
+}
@@ -0,0 +1,146 @@
+"""Single-pass streaming statistics for numeric columns.
+
+Every class here is fed with update(values) one chunk at a time and keeps a
+bounded amount of state however many values it has seen. This lets box plots
+and histograms be drawn from compact summaries of data that is too large to
+copy, or that is read chunk by chunk.
+"""
+import math
+
+import numpy as np
+
+SKETCH_SIZE = 2048
+HISTOGRAM_RESOLUTION = 1024
+
+class QuantileSketch:
+    """Approximate quantile sketch (KLL-style compactor levels).
+
+    Level h holds items that each stand for 2**h input values. When a level
+    grows past `k` items it is sorted and every other item, from a random
+    offset, is promoted to the next level. A large chunk is sorted once and
+    strided straight into the level where it fits. Rank error is roughly
+    log2(n / k) / k.
+    """
+
+    def __init__(self, k=SKETCH_SIZE, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def _add(self, level, items):
+        while len(self.levels) <= level:
+            self.levels.append(np.empty(0))
+        self.levels[level] = np.concatenate([self.levels[level], items])
+
+    def update(self, values):
+        values = np.sort(np.asarray(values, dtype=np.float64))
+        if values.size == 0:
+            return
+        level = max(0, math.ceil(math.log2(values.size / self.k)))
+        if level:
+            stride = 1 << level
+            values = values[self.rng.integers(stride)::stride]
+        self._add(level, values)
+        self._compact()
+
+    def _compact(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size > self.k:
+                items = np.sort(items)
+                even = items.size - items.size % 2
+                self.levels[level] = items[even:]
+                self._add(level + 1, items[self.rng.integers(2):even:2])
+            level += 1
+
+    def quantiles(self, qs):
+        """Approximate values at the given quantiles (0..1)"""
+        items = np.concatenate(self.levels)
+        if items.size == 0:
+            return np.full(len(qs), np.nan)
+        weights = np.concatenate([np.full(level.size, 1 << h, dtype=np.float64)
+                                  for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        targets = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        positions = np.searchsorted(cumulative, targets, side='left')
+        return items[np.minimum(positions, items.size - 1)]
+
+    def retained(self):
+        """Items currently held (a weighted sample of the input)"""
+        return np.concatenate(self.levels)
+
+class StreamingHistogram:
+    """Fixed-resolution histogram whose range grows to cover every value seen.
+
+    The fine bins always cover [low, low + width * resolution). When a value
+    falls outside, adjacent bin pairs are merged and the range doubles toward
+    it, so counts stay exact at the current bin width.
+    """
+
+    def __init__(self, resolution=HISTOGRAM_RESOLUTION):
+        self.resolution = resolution
+        self.counts = np.zeros(resolution, dtype=np.int64)
+        self.low = None
+        self.width = None
+
+    def _cover(self, low, high):
+        half = np.zeros(self.resolution // 2, dtype=np.int64)
+        while low < self.low or high >= self.low + self.width * self.resolution:
+            merged = self.counts.reshape(-1, 2).sum(axis=1)
+            if low < self.low:
+                self.low -= self.width * self.resolution
+                self.counts = np.concatenate([half, merged])
+            else:
+                self.counts = np.concatenate([merged, half])
+            self.width *= 2
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        low, high = float(values.min()), float(values.max())
+        if self.low is None:
+            self.low = low
+            # The range is half-open, so pad it by one bin to take in the maximum
+            # rather than having _cover double it straight away
+            self.width = (high - low) / (self.resolution - 1) or max(abs(low), 1.0) / self.resolution
+        self._cover(low, high)
+
+        index = ((values - self.low) / self.width).astype(np.intp)
+        np.clip(index, 0, self.resolution - 1, out=index)
+        self.counts += np.bincount(index, minlength=self.resolution)
+
+    def histogram(self, bins, low, high):
+        """Re-bin the fine counts into `bins` equal bins over [low, high], as (counts, edges)"""
+        if self.low is None:
+            return np.histogram([], bins=bins, range=(low, high))
+        centers = self.low + (np.arange(self.resolution) + 0.5) * self.width
+        np.clip(centers, low, high, out=centers)
+        counts, edges = np.histogram(centers, bins=bins, range=(low, high), weights=self.counts)
+        return counts.astype(np.int64), edges
+
+class StreamingStats:
+    """Count, mean, min/max, quantile sketch and histogram of the finite values seen"""
+
+    def __init__(self, k=SKETCH_SIZE, resolution=HISTOGRAM_RESOLUTION):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch(k)
+        self.histogram = StreamingHistogram(resolution)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return
+        self.count += values.size
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sketch.update(values)
+        self.histogram.update(values)
@@ -0,0 +1,216 @@
+"""Per-column aggregate cache for the visualization tab.
+
+ColumnSummaries computes, once per dataset, the aggregates the distribution
+charts are drawn from: quantiles, box-plot whiskers and histogram bins for
+numeric columns, and value counts for the others. A background thread fills
+the cache after a dataset is loaded; a column that is asked for before the
+thread reaches it is computed on demand. Charts drawn from the cache never
+rescan the data, so switching columns costs only the drawing.
+
+Numeric summaries are approximate by default: one streaming pass over the
+column with the quantile sketch and histogram from engine.sketch, so no
+NaN-free copy is made and nothing is sorted in full. Set `exact` for
+summaries computed from the full sorted data.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from engine.profiling import tracer
+from engine.sketch import StreamingStats
+
+HISTOGRAM_BINS = 15
+TOP_CATEGORIES = 50
+MAX_FLIERS = 1000
+CHUNK_ROWS = 1 << 18
+AGGREGATIONS = ('sum', 'mean', 'count')
+OTHER_LABEL = 'Other'
+
+def thin_fliers(fliers):
+    if fliers.size > MAX_FLIERS:
+        fliers = np.sort(fliers)[np.linspace(0, fliers.size - 1, MAX_FLIERS).astype(np.intp)]
+    return fliers
+
+def exact_numeric_summary(values, bins=HISTOGRAM_BINS):
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {'kind': 'numeric', 'count': 0}
+
+    low, q1, median, q3, high = np.quantile(values, [0.0, 0.25, 0.5, 0.75, 1.0])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    fliers = values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)]
+    counts, edges = np.histogram(values, bins=bins, range=(low, high))
+
+    return {
+        'kind': 'numeric',
+        'approximate': False,
+        'count': int(values.size),
+        'mean': float(values.mean()),
+        'quantiles': {'min': low, 'q1': q1, 'median': median, 'q3': q3, 'max': high},
+        'whiskers': (float(inside.min()), float(inside.max())),
+        'fliers': thin_fliers(fliers),
+        'histogram': (counts, edges),
+    }
+
+def stats_summary(stats, bins=HISTOGRAM_BINS):
+    """Numeric column summary from a StreamingStats.
+
+    Min, max, count and mean are exact. Quartiles come from the sketch;
+    whiskers and fliers are taken from the sketch's retained items, except
+    that a whisker reaching the exact min or max uses it.
+    """
+    if stats.count == 0:
+        return {'kind': 'numeric', 'count': 0}
+
+    q1, median, q3 = stats.sketch.quantiles([0.25, 0.5, 0.75]).tolist()
+    iqr = q3 - q1
+    low_fence, high_fence = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    retained = stats.sketch.retained()
+    inside = retained[(retained >= low_fence) & (retained <= high_fence)]
+    fliers = retained[(retained < low_fence) | (retained > high_fence)]
+
+    whisker_low = stats.min if stats.min >= low_fence or inside.size == 0 else float(inside.min())
+    whisker_high = stats.max if stats.max <= high_fence or inside.size == 0 else float(inside.max())
+
+    return {
+        'kind': 'numeric',
+        'approximate': True,
+        'count': stats.count,
+        'mean': stats.total / stats.count,
+        'quantiles': {'min': stats.min, 'q1': q1, 'median': median, 'q3': q3, 'max': stats.max},
+        'whiskers': (whisker_low, whisker_high),
+        'fliers': thin_fliers(fliers),
+        'histogram': stats.histogram.histogram(bins, stats.min, stats.max),
+    }
+
+def summarize_numeric(series, bins=HISTOGRAM_BINS, exact=False):
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    if exact:
+        return exact_numeric_summary(values, bins)
+
+    stats = StreamingStats()
+    for start in range(0, values.size, CHUNK_ROWS):
+        stats.update(values[start:start + CHUNK_ROWS])
+    return stats_summary(stats, bins)
+
+def summarize_categorical(series, top=TOP_CATEGORIES):
+    counts = series.value_counts()
+    return counts_summary(counts[counts > 0], top)
+
+def counts_summary(counts, top=TOP_CATEGORIES):
+    return {
+        'kind': 'categorical',
+        'count': int(counts.sum()),
+        'unique': len(counts),
+        'value_counts': counts.head(top),
+    }
+
+def summarize_column(series, bins=HISTOGRAM_BINS, exact=False):
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return summarize_numeric(series, bins, exact)
+    return summarize_categorical(series)
+
+def box_stats(summary, label):
+    """Statistics dict for Axes.bxp from a numeric column summary, or None for an empty column"""
+    if summary['count'] == 0:
+        return None
+    q = summary['quantiles']
+    return {
+        'label': label,
+        'med': q['median'],
+        'q1': q['q1'],
+        'q3': q['q3'],
+        'whislo': summary['whiskers'][0],
+        'whishi': summary['whiskers'][1],
+        'fliers': summary['fliers'],
+    }
+
+def category_codes(series):
+    """Integer codes (-1 for missing) and labels of a categorical or text column"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    return pd.factorize(series)
+
+def group_aggregate(categories, values=None, agg='sum', top=None):
+    """Sum, mean or count of values per category, largest first, as a Series.
+
+    Categories are turned into integer codes and reduced with np.bincount, so
+    no per-group Python work is done. Rows with a missing category or value
+    are skipped. With `top`, the remaining categories are folded into one
+    'Other' entry (for 'mean', the mean over all of their rows).
+    """
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation '{agg}'")
+    codes, labels = category_codes(categories)
+    valid = codes >= 0
+    if values is not None:
+        values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        valid &= ~np.isnan(values)
+    elif agg != 'count':
+        raise ValueError(f"'{agg}' needs a numeric column")
+
+    codes = codes[valid]
+    counts = np.bincount(codes, minlength=len(labels)).astype(np.float64)
+    sums = counts if agg == 'count' else np.bincount(codes, weights=values[valid], minlength=len(labels))
+    present = np.flatnonzero(counts > 0)
+    counts, sums = counts[present], sums[present]
+    labels = np.asarray(labels, dtype=object)[present]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = sums / counts if agg == 'mean' else sums
+    order = np.argsort(-result, kind='stable')
+    if top is None or len(order) <= top:
+        return pd.Series(result[order], index=labels[order], name=agg)
+
+    head, rest = order[:top], order[top:]
+    other = sums[rest].sum() / counts[rest].sum() if agg == 'mean' else sums[rest].sum()
+    return pd.Series(np.append(result[head], other),
+                     index=np.append(labels[head], OTHER_LABEL), name=agg)
+
+class ColumnSummaries:
+    """Aggregate cache for the columns of one DataFrame"""
+
+    def __init__(self, df, bins=HISTOGRAM_BINS, exact=False):
+        self.df = df
+        self.bins = bins
+        self.exact = exact
+        self._cache = {}
+        self._cancelled = False
+        self.thread = None
+
+    def get(self, column):
+        key = (column, self.exact)
+        summary = self._cache.get(key)
+        if summary is None:
+            with tracer.span('summarize_column', column=column, exact=self.exact):
+                summary = summarize_column(self.df[column], self.bins, self.exact)
+            self._cache[key] = summary
+        return summary
+
+    def grouped(self, category, value=None, agg='sum', top=None):
+        """Cached group_aggregate of column `value` (None for counts) by column `category`"""
+        key = ('group', category, value, agg, top)
+        result = self._cache.get(key)
+        if result is None:
+            with tracer.span('group_aggregate', category=category, value=value, agg=agg):
+                values = None if value is None else self.df[value]
+                result = group_aggregate(self.df[category], values, agg, top)
+            self._cache[key] = result
+        return result
+
+    def compute_all(self):
+        for column in self.df.columns:
+            if self._cancelled:
+                return
+            self.get(column)
+
+    def start(self):
+        """Fill the cache in a daemon thread"""
+        self.thread = threading.Thread(target=self.compute_all, name='column-summaries', daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self._cancelled = True
@@ -0,0 +1,144 @@
+"""Virtual table view over a DataFrame for the data preview grid.
+
+A TableView keeps the full DataFrame untouched and tracks the visible rows as
+an integer position array. Sorting and filtering are vectorized NumPy/pandas
+operations that only rebuild that array; page() then materialises just the
+requested block of cells, so the cost of drawing a screenful does not depend
+on the size of the data.
+"""
+import operator
+import re
+
+import numpy as np
+import pandas as pd
+
+from engine.profiling import tracer
+
+FILTER_OPERATORS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '!=': operator.ne,
+    '==': operator.eq,
+    '>': operator.gt,
+    '<': operator.lt,
+    '=': operator.eq,
+}
+
+_FILTER_PATTERN = re.compile(r'^\s*(>=|<=|!=|==|>|<|=)?\s*(.+?)\s*$')
+
+def format_cell(value):
+    if isinstance(value, (float, np.floating)):
+        return '' if np.isnan(value) else f'{value:.6g}'
+    if value is None or value is pd.NA or value is pd.NaT:
+        return ''
+    return str(value)
+
+class TableView:
+    """Sorted/filtered window onto a DataFrame; the DataFrame itself is never copied"""
+
+    def __init__(self, df):
+        self.df = df
+        self.columns = [str(col) for col in df.columns]
+        self.filters = {}
+        self.sort_column = None
+        self.sort_ascending = True
+        self.order = None
+        self._codes = {}
+
+    @property
+    def n_rows(self):
+        return len(self.df) if self.order is None else len(self.order)
+
+    @property
+    def n_columns(self):
+        return len(self.columns)
+
+    def _column(self, position):
+        return self.df.iloc[:, position]
+
+    def _numeric(self, position):
+        return pd.api.types.is_numeric_dtype(self._column(position).dtype)
+
+    def _factorized(self, position):
+        """Sorted category codes (-1 for missing) and labels of a column, cached"""
+        if position not in self._codes:
+            self._codes[position] = pd.factorize(self._column(position), sort=True)
+        return self._codes[position]
+
+    def filter_mask(self, position, text):
+        """Boolean row mask for one filter expression.
+
+        Numeric columns accept a comparison such as '>= 10' (a bare number means
+        equality); other columns match a case-insensitive substring.
+        """
+        if self._numeric(position):
+            op, operand = _FILTER_PATTERN.match(text).groups()
+            try:
+                operand = float(operand)
+            except ValueError:
+                raise ValueError(f"'{text}' is not a numeric filter, e.g. '> 10'")
+            values = self._column(position).to_numpy(dtype=np.float64, na_value=np.nan)
+            return FILTER_OPERATORS[op or '='](values, operand)
+
+        codes, labels = self._factorized(position)
+        hits = pd.Index(labels).astype(str).str.contains(text, case=False, regex=False)
+        hits = np.append(np.asarray(hits, dtype=bool), False)  # code -1 (missing) never matches
+        return hits[codes]
+
+    def set_filter(self, position, text):
+        """Set (or with empty text clear) the filter for a column position"""
+        if text.strip():
+            self.filters[position] = text
+        else:
+            self.filters.pop(position, None)
+        self.refresh()
+
+    def sort(self, position, ascending=True):
+        self.sort_column = position
+        self.sort_ascending = ascending
+        self.refresh()
+
+    def reset(self):
+        self.filters.clear()
+        self.sort_column = None
+        self.refresh()
+
+    def sort_key(self, position):
+        """Per-row key whose ascending argsort gives the requested order with missing values last"""
+        if self._numeric(position):
+            key = self._column(position).to_numpy(dtype=np.float64, na_value=np.nan)
+            return key if self.sort_ascending else -key
+
+        codes, labels = self._factorized(position)
+        if self.sort_ascending:
+            return np.where(codes < 0, len(labels), codes)
+        return np.where(codes < 0, 1, -codes)
+
+    @tracer.traced('table_refresh')
+    def refresh(self):
+        """Recompute the visible row positions from the current filters and sort"""
+        order = None
+        if self.filters:
+            mask = np.ones(len(self.df), dtype=bool)
+            for position, text in self.filters.items():
+                mask &= self.filter_mask(position, text)
+            order = np.flatnonzero(mask)
+
+        if self.sort_column is not None:
+            key = self.sort_key(self.sort_column)
+            if order is None:
+                order = np.argsort(key, kind='stable')
+            else:
+                order = order[np.argsort(key[order], kind='stable')]
+        self.order = order
+
+    def page(self, row_start, row_count, column_start, column_count):
+        """Formatted cells for a block of visible rows and columns, as (row labels, rows)"""
+        row_stop = min(row_start + row_count, self.n_rows)
+        if row_start >= row_stop:
+            return [], []
+        rows = np.arange(row_start, row_stop) if self.order is None else self.order[row_start:row_stop]
+        block = self.df.iloc[rows, column_start:column_start + column_count]
+        labels = [format_cell(label) for label in block.index]
+        cells = [[format_cell(value) for value in row] for row in block.itertuples(index=False, name=None)]
+        return labels, cells
@@ -0,0 +1,199 @@
+"""Named in-memory datasets shared by the visualization and regression tabs.
+
+A Workspace holds each dataset once. When the resident datasets exceed the
+memory budget, the least recently used ones are spilled to an on-disk cache
+and dropped from memory; the next get() maps them back in.
+
+The cache stores one .npy file per column: numeric columns as-is, and
+categorical columns as their integer codes plus a list of categories, and
+nullable extension columns (Int64, Float64, boolean) as values plus a mask.
+Those files are opened with np.load(mmap_mode='r'), so a reloaded dataset is
+backed by the page cache rather than a private copy, and worker processes
+that call load_dataset_dir() on the same directory share that memory
+zero-copy. Other columns (free text) are pickled.
+"""
+import collections
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from engine.profiling import tracer
+
+# Default budget when none is given: this fraction of the available memory
+DEFAULT_BUDGET_FRACTION = 0.25
+
+def dataset_nbytes(df):
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+def join_columns(X, y, default_name='Target'):
+    """X with y appended as a column; the new frame shares the column data instead of copying it"""
+    columns = dict(X.items())
+    columns[str(y.name or default_name)] = y
+    return pd.DataFrame(columns, copy=False)
+
+def save_dataset_dir(df, path):
+    """Write df to a cache directory of per-column files"""
+    os.makedirs(path, exist_ok=True)
+    manifest = {'index': None, 'columns': []}
+    for i, (col, series) in enumerate(df.items()):
+        stem = f'col{i}'
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            np.save(os.path.join(path, stem + '.npy'), series.cat.codes.to_numpy())
+            with open(os.path.join(path, stem + '.categories'), 'wb') as f:
+                pickle.dump(dtype.categories.tolist(), f)
+            kind = 'categorical'
+        elif pd.api.types.is_numeric_dtype(dtype) and isinstance(dtype, np.dtype):
+            np.save(os.path.join(path, stem + '.npy'), series.to_numpy())
+            kind = 'numpy'
+        elif isinstance(dtype, pd.api.extensions.ExtensionDtype) and hasattr(dtype, 'numpy_dtype'):
+            # Masked arrays: the values with missing entries zeroed, and the mask
+            np.save(os.path.join(path, stem + '.npy'), series.to_numpy(dtype=dtype.numpy_dtype, na_value=0))
+            np.save(os.path.join(path, stem + '.mask.npy'), series.isna().to_numpy())
+            kind = 'masked'
+        else:
+            series.to_pickle(os.path.join(path, stem + '.pkl'))
+            kind = 'pickle'
+        manifest['columns'].append({'name': col, 'file': stem, 'kind': kind, 'dtype': str(dtype)})
+
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        pd.Series(df.index).to_pickle(os.path.join(path, 'index.pkl'))
+        manifest['index'] = 'index.pkl'
+    with open(os.path.join(path, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f)
+
+def load_dataset_dir(path, mmap=True):
+    """Read a cache directory written by save_dataset_dir; numeric data is memory-mapped"""
+    with open(os.path.join(path, 'manifest.json')) as f:
+        manifest = json.load(f)
+    mmap_mode = 'r' if mmap else None
+
+    columns = {}
+    for entry in manifest['columns']:
+        stem = os.path.join(path, entry['file'])
+        if entry['kind'] == 'numpy':
+            columns[entry['name']] = np.load(stem + '.npy', mmap_mode=mmap_mode)
+        elif entry['kind'] == 'categorical':
+            with open(stem + '.categories', 'rb') as f:
+                categories = pickle.load(f)
+            codes = np.load(stem + '.npy', mmap_mode=mmap_mode)
+            columns[entry['name']] = pd.Categorical.from_codes(codes, categories=categories)
+        elif entry['kind'] == 'masked':
+            array_type = pd.api.types.pandas_dtype(entry['dtype']).construct_array_type()
+            columns[entry['name']] = array_type(np.load(stem + '.npy', mmap_mode=mmap_mode),
+                                                np.load(stem + '.mask.npy', mmap_mode=mmap_mode))
+        else:
+            columns[entry['name']] = pd.read_pickle(stem + '.pkl').array
+
+    index = None
+    if manifest['index']:
+        index = pd.Index(pd.read_pickle(os.path.join(path, manifest['index'])))
+    return pd.DataFrame(columns, index=index, copy=False)
+
+class Workspace:
+    """LRU store of named DataFrames with a resident-memory budget"""
+
+    def __init__(self, memory_budget=None, cache_dir=None, on_evict=None):
+        if memory_budget is None:
+            from engine.model import available_memory_bytes
+            available = available_memory_bytes()
+            memory_budget = int(available * DEFAULT_BUDGET_FRACTION) if available else 1 << 30
+        self.memory_budget = memory_budget
+        self._own_cache_dir = cache_dir is None
+        self.cache_dir = cache_dir or tempfile.mkdtemp(prefix='workspace-')
+        self.entries = collections.OrderedDict()
+        self._lock = threading.RLock()
+        self._next_id = 0
+        # Called with the name of each dataset spilled out of memory
+        self.on_evict = on_evict
+
+    def _entry_dir(self, entry):
+        return os.path.join(self.cache_dir, entry['id'])
+
+    @property
+    def resident_bytes(self):
+        return sum(e['nbytes'] for e in self.entries.values() if e['df'] is not None)
+
+    def add(self, name, df, source=None):
+        """Store df under name (replacing any dataset of that name) and return it"""
+        with self._lock:
+            if name in self.entries:
+                self.remove(name)
+            entry = {
+                'id': f'ds{self._next_id}',
+                'df': df,
+                'nbytes': dataset_nbytes(df),
+                'rows': len(df),
+                'columns': df.shape[1],
+                'source': source,
+                'cached': False,
+            }
+            self._next_id += 1
+            self.entries[name] = entry
+            self._evict(keep=name)
+            return df
+
+    def get(self, name):
+        """The named dataset, mapped back from the disk cache if it was evicted"""
+        with self._lock:
+            entry = self.entries[name]
+            self.entries.move_to_end(name)
+            if entry['df'] is None:
+                with tracer.span('workspace_load', dataset=name):
+                    entry['df'] = load_dataset_dir(self._entry_dir(entry))
+                self._evict(keep=name)
+            return entry['df']
+
+    def path(self, name):
+        """Cache directory of the named dataset, written if needed, for load_dataset_dir in other processes"""
+        with self._lock:
+            entry = self.entries[name]
+            self._write_cache(name, entry)
+            return self._entry_dir(entry)
+
+    def _write_cache(self, name, entry):
+        if not entry['cached']:
+            with tracer.span('workspace_spill', dataset=name):
+                save_dataset_dir(entry['df'], self._entry_dir(entry))
+            entry['cached'] = True
+
+    def _evict(self, keep=None):
+        """Spill least recently used datasets until the resident ones fit the budget"""
+        for name, entry in list(self.entries.items()):
+            if self.resident_bytes <= self.memory_budget:
+                break
+            if name == keep or entry['df'] is None:
+                continue
+            self._write_cache(name, entry)
+            entry['df'] = None
+            if self.on_evict is not None:
+                self.on_evict(name)
+
+    def set_memory_budget(self, memory_budget):
+        with self._lock:
+            self.memory_budget = memory_budget
+            self._evict(keep=next(reversed(self.entries), None))
+
+    def remove(self, name):
+        with self._lock:
+            entry = self.entries.pop(name)
+            shutil.rmtree(self._entry_dir(entry), ignore_errors=True)
+
+    def names(self):
+        return list(self.entries)
+
+    def info(self):
+        """One dict per dataset, least recently used first"""
+        return [{'name': name, 'rows': e['rows'], 'columns': e['columns'], 'nbytes': e['nbytes'],
+                 'resident': e['df'] is not None, 'source': e['source']}
+                for name, e in self.entries.items()]
+
+    def close(self):
+        if self._own_cache_dir:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
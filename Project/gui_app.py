@@ -1,19 +1,59 @@
+import time
+APP_START = time.perf_counter()
+
+import os
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.figure import Figure
-import os
-from sklearn.datasets import fetch_california_housing
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+from engine.lazy import lazy_import, warm_imports
+from engine.matrix import parse_matrix_text, matrix_operation
+from engine.profiling import tracer
+
+# Heavy libraries are imported the first time a tab or feature needs them and
+# warmed in a background thread once the window is up (see start_import_warmup).
+pd = lazy_import('pandas')
+mpl_figure = lazy_import('matplotlib.figure')
+backend_tkagg = lazy_import('matplotlib.backends.backend_tkagg')
+dataset = lazy_import('engine.dataset')
+charts = lazy_import('engine.charts')
+model = lazy_import('engine.model')
+table = lazy_import('engine.table')
+summary = lazy_import('engine.summary')
+workspace = lazy_import('engine.workspace')
+progressive = lazy_import('engine.progressive')
+interactive = lazy_import('engine.interactive')
+export = lazy_import('engine.export')
+diagnostics = lazy_import('engine.diagnostics')
+features = lazy_import('engine.features')
 
 class MatrixGUI:
+    # Button handlers wrapped in a profiling span (see instrument_handlers)
+    TRACED_HANDLERS = (
+        'input_matrix_a', 'input_matrix_b', 'matrix_add', 'matrix_subtract', 'matrix_multiply',
+        'transpose_a', 'transpose_b', 'determinant_a', 'determinant_b', 'swap_matrices', 'clear_matrices',
+        'load_sample_data', 'load_csv', 'preview_data', 'show_bar_chart', 'show_scatter_plot',
+        'show_line_chart', 'show_histogram', 'show_heatmap', 'show_pie_chart', 'show_box_plot',
+        'show_area_chart', 'save_chart', 'add_toolbar', 'load_predefined_data',
+        'load_custom_regression_data', 'generate_sample_data', 'train_regression_model', 'compare_models',
+        'show_lr_predictions', 'show_residuals', 'show_feature_importance', 'show_metrics',
+        'save_lr_chart', 'add_lr_toolbar', 'select_dataset', 'load_workspace_regression_data',
+        'load_csv_progressive', 'batch_export_charts', 'show_feature_residuals',
+    )
+    
+    # Columns shown at once in the data preview grid; the rest scroll horizontally
+    PREVIEW_COLUMNS = 10
+    # Minimum time between live chart redraws during a progressive load
+    PROGRESSIVE_FRAME_MS = 200
+    # Features shown in the importance chart
+    IMPORTANCE_FEATURES = 20
+    # File dialog filter for every format engine.dataset can read
+    DATA_FILETYPES = [
+        ("Data files", "*.csv *.tsv *.txt *.gz *.bz2 *.xz *.zip *.zst *.parquet *.pq *.feather *.arrow *.xlsx *.xlsm *.xls"),
+        ("CSV files", "*.csv"),
+        ("All files", "*.*"),
+    ]
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Data Analysis & Visualization Tool")
@@ -43,10 +83,105 @@ class MatrixGUI:
         
         self.matrix_a = None
         self.matrix_b = None
-        self.df = None
+        self.dataset_name = None
+        self.datasets = None
+        self.column_summaries = None
+        self.X = None
+        self.y = None
+        self.feature_pipeline = None
+        self.model = None
+        self.model_runs = []
+        self.memory_budget_fraction = 0.5
         self.panel_open = True
         
+        self.instrument_handlers()
         self.create_ui()
+        
+        self.startup_time = None
+        self.root.after_idle(self.report_startup_time)
+        self.root.after(500, self.start_import_warmup)
+    
+    def report_startup_time(self):
+        """Record and show the time from process start to the first idle window"""
+        self.startup_time = time.perf_counter() - APP_START
+        self.status_label.config(text=f"✓ Ready in {self.startup_time:.2f}s")
+    
+    def instrument_handlers(self):
+        """Wrap the button handlers in profiling spans; must run before create_ui binds them"""
+        for name in self.TRACED_HANDLERS:
+            setattr(self, name, tracer.wrap(getattr(self, name), name))
+        tracer.listeners.append(self.report_span)
+    
+    def report_span(self, record):
+        """Show the cost of the last handler next to the system status"""
+        if threading.current_thread() is not threading.main_thread():
+            return
+        text = f"⏱ {record['name']}: {record['duration'] * 1000:.1f} ms"
+        if 'memory_peak' in record:
+            text += f", peak {record['memory_peak'] / 1e6:.1f} MB"
+        self.perf_label.config(text=text)
+    
+    def toggle_profiling(self):
+        if self.profiling_enabled.get():
+            tracer.enable(track_memory=self.profile_memory.get())
+            self.perf_label.config(text="⏱ Profiling on")
+        else:
+            tracer.disable()
+            self.perf_label.config(text="⏱ Profiling off")
+    
+    def show_performance_panel(self):
+        """Window listing recorded spans, nested by call depth, with Chrome trace export"""
+        window = tk.Toplevel(self.root)
+        window.title("Performance")
+        window.geometry("720x480")
+        
+        tree = ttk.Treeview(window, columns=('duration', 'memory'), height=20)
+        tree.heading('#0', text='Span')
+        tree.heading('duration', text='Duration (ms)')
+        tree.heading('memory', text='Memory Δ (MB)')
+        tree.column('duration', width=120, anchor=tk.E)
+        tree.column('memory', width=120, anchor=tk.E)
+        
+        def refresh():
+            tree.delete(*tree.get_children())
+            parents = {}
+            for record in sorted(tracer.spans, key=lambda s: (s['thread'], s['start'])):
+                parent = parents.get((record['thread'], record['depth'] - 1), '')
+                memory = f"{record['memory_delta'] / 1e6:.2f}" if 'memory_delta' in record else ''
+                item = tree.insert(parent, tk.END, text=record['name'],
+                                   values=(f"{record['duration'] * 1000:.2f}", memory))
+                parents[(record['thread'], record['depth'])] = item
+        
+        def clear():
+            tracer.clear()
+            refresh()
+        
+        def export():
+            file_path = filedialog.asksaveasfilename(
+                parent=window,
+                defaultextension=".json",
+                filetypes=[("Chrome trace", "*.json"), ("All files", "*.*")]
+            )
+            if file_path:
+                try:
+                    tracer.export_chrome_trace(file_path)
+                    messagebox.showinfo("Success", f"Trace saved to:\n{file_path}", parent=window)
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to save: {str(e)}", parent=window)
+        
+        controls = ttk.Frame(window)
+        controls.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(controls, text="🔄 Refresh", command=refresh, style='Secondary.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="🗑️ Clear", command=clear, style='Secondary.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="💾 Export Chrome Trace", command=export, style='Secondary.TButton').pack(side=tk.RIGHT, padx=5)
+        
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        refresh()
+    
+    def start_import_warmup(self):
+        """Import the heavy libraries in the background after the window is shown"""
+        warm_imports([pd, mpl_figure, backend_tkagg, dataset, charts, model, table, summary,
+                      'sklearn.model_selection', 'sklearn.preprocessing', 'sklearn.linear_model'])
     
     def setup_styles(self):
         style = ttk.Style()
@@ -236,6 +371,21 @@ class MatrixGUI:
                                      font=('Segoe UI', 9, 'bold'))
         self.status_label.pack(anchor=tk.W)
         
+        self.perf_label = ttk.Label(status_frame,
+                                   text="⏱ Profiling off",
+                                   foreground=self.text_light,
+                                   font=('Segoe UI', 8))
+        self.perf_label.pack(anchor=tk.W, pady=(5, 0))
+        
+        self.profiling_enabled = tk.BooleanVar(value=False)
+        self.profile_memory = tk.BooleanVar(value=False)
+        ttk.Checkbutton(status_frame, text="Profile handlers", variable=self.profiling_enabled,
+                        command=self.toggle_profiling).pack(anchor=tk.W)
+        ttk.Checkbutton(status_frame, text="Track memory", variable=self.profile_memory,
+                        command=self.toggle_profiling).pack(anchor=tk.W)
+        ttk.Button(status_frame, text="⏱ Performance", command=self.show_performance_panel,
+                   style='Secondary.TButton').pack(fill=tk.X, pady=(5, 0))
+        
 
        
         settings_header = ttk.Label(self.side_panel,
@@ -290,6 +440,11 @@ class MatrixGUI:
                   command=self.show_guide,
                   style='Secondary.TButton').pack(fill=tk.X, pady=2)
         
+        ttk.Button(help_frame,
+                  text="🗂 Workspace",
+                  command=self.show_workspace_panel,
+                  style='Secondary.TButton').pack(fill=tk.X, pady=2)
+        
         ttk.Button(help_frame,
                   text="🔄 Reset Layout",
                   command=self.reset_layout,
@@ -471,12 +626,60 @@ class MatrixGUI:
         ttk.Button(load_section, text="📊 Sample Dataset", command=self.load_sample_data, style='TButton').pack(fill=tk.X, pady=5)
         ttk.Button(load_section, text="📁 Load CSV File", command=self.load_csv, style='TButton').pack(fill=tk.X, pady=5)
         
+        progressive_frame = ttk.Frame(load_section)
+        progressive_frame.pack(fill=tk.X, pady=5)
+        self.progressive_chart_var = tk.StringVar(value="histogram")
+        ttk.Combobox(progressive_frame,
+                     textvariable=self.progressive_chart_var,
+                     values=["histogram", "line", "scatter"],
+                     state="readonly",
+                     width=10).pack(side=tk.RIGHT)
+        ttk.Button(progressive_frame, text="⚡ Live Load", command=self.load_csv_progressive,
+                   style='Secondary.TButton').pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        
         self.data_label = ttk.Label(load_section, text="No data loaded", foreground=self.warning_color, font=('Segoe UI', 9, 'bold'))
         self.data_label.pack(pady=10)
         
+        dataset_frame = ttk.Frame(load_section)
+        dataset_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(dataset_frame, text="Dataset:", font=('Segoe UI', 9)).pack(side=tk.LEFT)
+        self.dataset_var = tk.StringVar()
+        self.dataset_combo = ttk.Combobox(dataset_frame, textvariable=self.dataset_var, values=[], state="readonly", width=20)
+        self.dataset_combo.pack(side=tk.RIGHT)
+        self.dataset_combo.bind('<<ComboboxSelected>>', lambda e: self.select_dataset())
+        
         ttk.Button(load_section, text="👁️ Preview Data", command=self.preview_data, style='Secondary.TButton').pack(fill=tk.X, pady=5)
         
         
+        columns_section = ttk.LabelFrame(left_panel, text=" Chart Columns ", padding=10)
+        columns_section.pack(fill=tk.X, padx=5, pady=5)
+        
+        list_frame = ttk.Frame(columns_section)
+        list_frame.pack(fill=tk.X)
+        self.column_listbox = tk.Listbox(list_frame, selectmode=tk.EXTENDED, height=6, exportselection=False)
+        columns_scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.column_listbox.yview)
+        self.column_listbox.configure(yscrollcommand=columns_scrollbar.set)
+        self.column_listbox.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        columns_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        ttk.Label(columns_section, text="None selected = automatic", font=('Segoe UI', 8), foreground=self.text_light).pack(anchor=tk.W)
+        aggregation_frame = ttk.Frame(columns_section)
+        aggregation_frame.pack(fill=tk.X, pady=(5, 0))
+        ttk.Label(aggregation_frame, text="Bar/Pie:", font=('Segoe UI', 9)).pack(side=tk.LEFT)
+        self.aggregation_var = tk.StringVar(value="auto")
+        ttk.Combobox(aggregation_frame,
+                     textvariable=self.aggregation_var,
+                     values=["auto", "sum", "mean", "count"],
+                     state="readonly",
+                     width=10).pack(side=tk.RIGHT)
+        
+        self.exact_statistics = tk.BooleanVar(value=False)
+        ttk.Checkbutton(columns_section, text="Exact statistics (box plot, histogram)", variable=self.exact_statistics,
+                        command=self.toggle_exact_statistics).pack(anchor=tk.W, pady=(5, 0))
+        ttk.Button(columns_section, text="Clear Selection", command=lambda: self.column_listbox.selection_clear(0, tk.END),
+                   style='Secondary.TButton').pack(fill=tk.X, pady=(5, 0))
+        
+        
         viz_controls = ttk.LabelFrame(left_panel, text=" Visualization Types ", padding=15)
         viz_controls.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
@@ -539,6 +742,7 @@ class MatrixGUI:
         
         ttk.Button(canvas_controls, text="🗑️ Clear", command=self.clear_canvas, style='Secondary.TButton').pack(side=tk.RIGHT, padx=5)
         ttk.Button(canvas_controls, text="🖼️ Save", command=self.save_chart, style='Secondary.TButton').pack(side=tk.RIGHT, padx=5)
+        ttk.Button(canvas_controls, text="📦 Batch Export", command=self.batch_export_charts, style='Secondary.TButton').pack(side=tk.RIGHT, padx=5)
         ttk.Button(canvas_controls, text="🔍 Zoom", command=self.add_toolbar, style='Secondary.TButton').pack(side=tk.RIGHT, padx=5)
         
         
@@ -577,12 +781,13 @@ class MatrixGUI:
         sources = [
             ("🏠 California Housing", self.load_predefined_data, "Built-in dataset"),
             ("📁 Custom CSV", self.load_custom_regression_data, "Your own data"),
-            ("📊 Generate Sample", self.generate_sample_data, "Random data")
+            ("📊 Generate Sample", self.generate_sample_data, "Random data"),
+            ("🗂 Workspace", self.load_workspace_regression_data, "Loaded dataset")
         ]
         
         for i, (text, command, tooltip) in enumerate(sources):
             frame = ttk.Frame(source_frame)
-            frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10) if i < 2 else 0)
+            frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10) if i < len(sources) - 1 else 0)
             
             btn = ttk.Button(frame, text=text, command=command, style='TButton' if i == 0 else 'Secondary.TButton')
             btn.pack(fill=tk.BOTH, expand=True)
@@ -593,9 +798,25 @@ class MatrixGUI:
         training_frame = ttk.Frame(data_section)
         training_frame.pack(fill=tk.X, pady=(15, 0))
         
+        ttk.Label(training_frame, text="Model:", font=('Segoe UI', 9)).pack(side=tk.LEFT, padx=(0, 5))
+
+        self.estimator_var = tk.StringVar(value="Linear Regression")
+        self.compact_precision = tk.BooleanVar(value=False)
+        estimator_combo = ttk.Combobox(training_frame,
+                                       textvariable=self.estimator_var,
+                                       values=list(model.ESTIMATOR_REGISTRY.keys()),
+                                       state="readonly",
+                                       width=22)
+        estimator_combo.pack(side=tk.LEFT, padx=(0, 10))
+
         train_btn = ttk.Button(training_frame, text="🎯 Train Model", command=self.train_regression_model, style='TButton')
         train_btn.pack(side=tk.LEFT, padx=(0, 10))
-        
+
+        compare_btn = ttk.Button(training_frame, text="⚖️ Compare Models", command=self.compare_models, style='Secondary.TButton')
+        compare_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+        ttk.Checkbutton(training_frame, text="Compact (float32)", variable=self.compact_precision).pack(side=tk.LEFT, padx=(0, 10))
+
 
 
         self.lr_label = ttk.Label(training_frame,
@@ -612,7 +833,8 @@ class MatrixGUI:
         viz_options = [
             ("📈 Predictions", self.show_lr_predictions, "Actual vs Predicted"),
             ("📊 Residuals", self.show_residuals, "Error distribution"),
-            ("⭐ Importance", self.show_feature_importance, "Feature coefficients"),
+            ("🧪 Feature Residuals", self.show_feature_residuals, "Residuals vs features"),
+            ("⭐ Importance", self.show_feature_importance, "Permutation importance"),
             ("📋 Metrics", self.show_metrics, "Performance metrics")
         ]
         
@@ -665,15 +887,20 @@ class MatrixGUI:
             
             for widget in self.canvas_container.winfo_children():
                 if isinstance(widget, tk.Frame) and widget.winfo_children():
-                    if isinstance(widget.winfo_children()[0], NavigationToolbar2Tk):
+                    if isinstance(widget.winfo_children()[0], backend_tkagg.NavigationToolbar2Tk):
                         widget.destroy()
             
             
             toolbar_frame = ttk.Frame(self.canvas_container)
             toolbar_frame.pack(side=tk.BOTTOM, fill=tk.X)
             
-            toolbar = NavigationToolbar2Tk(self.current_canvas, toolbar_frame)
+            toolbar = backend_tkagg.NavigationToolbar2Tk(self.current_canvas, toolbar_frame)
             toolbar.update()
+            
+            # Decimate and blit large scatters/lines while panning
+            if getattr(self, 'interaction', None) is not None:
+                self.interaction.disconnect()
+            self.interaction = interactive.InteractiveRedraw(self.current_canvas)
     
     def add_lr_toolbar(self):
         """Add matplotlib navigation toolbar to ML tab"""
@@ -681,86 +908,44 @@ class MatrixGUI:
             
             for widget in self.lr_canvas_container.winfo_children():
                 if isinstance(widget, tk.Frame) and widget.winfo_children():
-                    if isinstance(widget.winfo_children()[0], NavigationToolbar2Tk):
+                    if isinstance(widget.winfo_children()[0], backend_tkagg.NavigationToolbar2Tk):
                         widget.destroy()
             
             
             toolbar_frame = ttk.Frame(self.lr_canvas_container)
             toolbar_frame.pack(side=tk.BOTTOM, fill=tk.X)
             
-            toolbar = NavigationToolbar2Tk(self.lr_current_canvas, toolbar_frame)
+            toolbar = backend_tkagg.NavigationToolbar2Tk(self.lr_current_canvas, toolbar_frame)
             toolbar.update()
+            
+            # Decimate and blit large scatters/lines while panning
+            if getattr(self, 'lr_interaction', None) is not None:
+                self.lr_interaction.disconnect()
+            self.lr_interaction = interactive.InteractiveRedraw(self.lr_current_canvas)
     
     def show_box_plot(self):
         """Show box plot"""
-        if self.df is None:
+        df = self.df
+        if df is None:
             messagebox.showerror("Error", "Load data first")
             return
         
         self.clear_canvas()
         try:
-            numeric_cols = self.df.select_dtypes(include=[np.number]).columns.tolist()
-            
-            if len(numeric_cols) == 0:
-                messagebox.showerror("Error", "No numeric columns found")
-                return
-            
-            fig = Figure(figsize=(10, 6), dpi=100)
-            ax = fig.add_subplot(111)
-            
-            
-            plot_data = [self.df[col].dropna() for col in numeric_cols[:5]]
-            ax.boxplot(plot_data, labels=numeric_cols[:5])
-            
-            ax.set_title('Box Plot', fontweight='bold')
-            ax.set_ylabel('Value')
-            ax.grid(True, alpha=0.3)
-            ax.tick_params(axis='x', rotation=45)
-            
-            fig.tight_layout()
-            
-            self.current_figure = fig
-            self.current_canvas = FigureCanvasTkAgg(fig, self.canvas_container)
-            self.current_canvas.draw()
-            self.current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
+            self.display_chart(charts.build_box_plot(df, self.primary_color, **self.chart_options(df)))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create box plot: {str(e)}")
     
     def show_area_chart(self):
         """Show area chart"""
-        if self.df is None:
+        df = self.df
+        if df is None:
             messagebox.showerror("Error", "Load data first")
             return
         
         self.clear_canvas()
         try:
-            numeric_cols = self.df.select_dtypes(include=[np.number]).columns.tolist()
-            
-            if len(numeric_cols) == 0:
-                messagebox.showerror("Error", "No numeric columns found")
-                return
-            
-            fig = Figure(figsize=(10, 6), dpi=100)
-            ax = fig.add_subplot(111)
-            
-            
-            for i, col in enumerate(numeric_cols[:3]):
-                ax.fill_between(self.df.index, 0, self.df[col], alpha=0.5, label=col)
-            
-            ax.set_title('Area Chart', fontweight='bold')
-            ax.set_xlabel('Index')
-            ax.set_ylabel('Value')
-            ax.legend()
-            ax.grid(True, alpha=0.3)
-            
-            fig.tight_layout()
-            
-            self.current_figure = fig
-            self.current_canvas = FigureCanvasTkAgg(fig, self.canvas_container)
-            self.current_canvas.draw()
-            self.current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
+            self.display_chart(charts.build_area_chart(df, self.primary_color, **self.chart_options(df)))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create area chart: {str(e)}")
     
@@ -774,6 +959,22 @@ class MatrixGUI:
         for widget in self.lr_canvas_container.winfo_children():
             widget.destroy()
     
+    def display_chart(self, fig):
+        """Embed a figure in the visualization canvas"""
+        self.current_figure = fig
+        self.current_canvas = backend_tkagg.FigureCanvasTkAgg(fig, self.canvas_container)
+        with tracer.span('canvas_draw'):
+            self.current_canvas.draw()
+        self.current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    
+    def display_lr_chart(self, fig):
+        """Embed a figure in the model analysis canvas"""
+        self.lr_current_figure = fig
+        self.lr_current_canvas = backend_tkagg.FigureCanvasTkAgg(fig, self.lr_canvas_container)
+        with tracer.span('canvas_draw'):
+            self.lr_current_canvas.draw()
+        self.lr_current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    
     def save_chart(self):
         """Save current chart as image"""
         if hasattr(self, 'current_figure'):
@@ -808,6 +1009,108 @@ class MatrixGUI:
         else:
             messagebox.showinfo("Save Chart", "No chart to save.")
     
+    def batch_export_charts(self):
+        """Export a set of chart types for several workspace datasets in worker processes"""
+        ws = self.get_workspace()
+        if not ws.names():
+            messagebox.showinfo("Batch Export", "Load a dataset first.")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Batch Export")
+        window.geometry("520x420")
+        
+        body = ttk.Frame(window, padding=10)
+        body.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(body, text="Datasets:", font=('Segoe UI', 10, 'bold')).grid(row=0, column=0, sticky=tk.W)
+        dataset_list = tk.Listbox(body, selectmode=tk.EXTENDED, exportselection=False, height=10)
+        dataset_list.grid(row=1, column=0, sticky=tk.NSEW, padx=(0, 10))
+        for i, name in enumerate(ws.names()):
+            dataset_list.insert(tk.END, name)
+            if name == self.dataset_var.get():
+                dataset_list.selection_set(i)
+        
+        ttk.Label(body, text="Charts:", font=('Segoe UI', 10, 'bold')).grid(row=0, column=1, sticky=tk.W)
+        chart_frame = ttk.Frame(body)
+        chart_frame.grid(row=1, column=1, sticky=tk.NW)
+        chart_vars = {}
+        for chart in charts.CHART_BUILDERS:
+            chart_vars[chart] = tk.BooleanVar(value=True)
+            ttk.Checkbutton(chart_frame, text=chart.capitalize(), variable=chart_vars[chart]).pack(anchor=tk.W)
+        
+        options = ttk.Frame(body)
+        options.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=10)
+        format_var = tk.StringVar(value="png")
+        dpi_var = tk.StringVar(value="300")
+        report_var = tk.BooleanVar(value=False)
+        ttk.Label(options, text="Format:").pack(side=tk.LEFT)
+        ttk.Combobox(options, textvariable=format_var, values=("png", "svg", "pdf", "none"),
+                     state="readonly", width=6).pack(side=tk.LEFT, padx=5)
+        ttk.Label(options, text="DPI:").pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Entry(options, textvariable=dpi_var, width=6).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(options, text="Combined PDF report", variable=report_var).pack(side=tk.LEFT, padx=10)
+        
+        body.columnconfigure(0, weight=1)
+        body.rowconfigure(1, weight=1)
+        
+        def start():
+            names = [dataset_list.get(i) for i in dataset_list.curselection()]
+            chart_types = [chart for chart, var in chart_vars.items() if var.get()]
+            fmt = None if format_var.get() == "none" else format_var.get()
+            if not names or not chart_types:
+                messagebox.showerror("Error", "Select at least one dataset and one chart", parent=window)
+                return
+            if fmt is None and not report_var.get():
+                messagebox.showerror("Error", "Choose a format or the PDF report", parent=window)
+                return
+            try:
+                dpi = int(dpi_var.get())
+            except ValueError:
+                messagebox.showerror("Error", "DPI must be a whole number", parent=window)
+                return
+            out_dir = filedialog.askdirectory(parent=window, title="Export charts to")
+            if not out_dir:
+                return
+            report_path = os.path.join(out_dir, "chart_report.pdf") if report_var.get() else None
+            window.destroy()
+            
+            state = {'results': None, 'error': None}
+            color, exact = self.primary_color, self.exact_statistics.get()
+            
+            def run():
+                try:
+                    datasets = [(name, ws.path(name)) for name in names]
+                    state['results'] = export.batch_export(datasets, chart_types, fmt, out_dir, dpi,
+                                                           report_path, color, exact)
+                except Exception as e:
+                    state['error'] = e
+            
+            def poll():
+                if thread.is_alive():
+                    self.root.after(self.PROGRESSIVE_FRAME_MS, poll)
+                    return
+                if state['error'] is not None:
+                    self.status_label.config(text="Batch export failed")
+                    messagebox.showerror("Error", f"Batch export failed: {state['error']}")
+                    return
+                results = state['results']
+                failed = [f"{r['dataset']} / {r['chart']}: {r['error']}" for r in results if 'error' in r]
+                message = f"Exported {len(results) - len(failed)} of {len(results)} charts to:\n{out_dir}"
+                if report_path:
+                    message += f"\n\nReport: {report_path}"
+                if failed:
+                    message += "\n\nSkipped:\n" + "\n".join(failed[:10])
+                self.status_label.config(text="Batch export finished")
+                messagebox.showinfo("Batch Export", message)
+            
+            self.status_label.config(text=f"Exporting {len(names) * len(chart_types)} charts…")
+            thread = threading.Thread(target=run, name='batch-export', daemon=True)
+            thread.start()
+            self.root.after(self.PROGRESSIVE_FRAME_MS, poll)
+        
+        ttk.Button(body, text="📦 Export", command=start, style='Secondary.TButton').grid(row=3, column=1, sticky=tk.E)
+    
     
 
     
@@ -840,144 +1143,197 @@ class MatrixGUI:
     
     def show_line_chart(self):
         """Show line chart"""
-        if self.df is None:
+        df = self.df
+        if df is None:
             messagebox.showerror("Error", "Load data first")
             return
         
         self.clear_canvas()
         try:
-            numeric_cols = self.df.select_dtypes(include=[np.number]).columns.tolist()
-            
-            if len(numeric_cols) == 0:
-                messagebox.showerror("Error", "No numeric columns found")
-                return
-            
-            fig = Figure(figsize=(10, 6), dpi=100)
-            ax = fig.add_subplot(111)
-            
-            for col in numeric_cols[:3]:
-                ax.plot(self.df.index, self.df[col], label=col, marker='o', markersize=3)
-            
-            ax.set_title('Line Chart', fontweight='bold')
-            ax.set_xlabel('Index')
-            ax.set_ylabel('Value')
-            ax.legend()
-            ax.grid(True, alpha=0.3)
-            fig.tight_layout()
-            
-            self.current_figure = fig
-            self.current_canvas = FigureCanvasTkAgg(fig, self.canvas_container)
-            self.current_canvas.draw()
-            self.current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
+            self.display_chart(charts.build_line_chart(df, self.primary_color, **self.chart_options(df)))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create line chart: {str(e)}")
     
     def show_histogram(self):
         """Show histogram"""
-        if self.df is None:
+        df = self.df
+        if df is None:
             messagebox.showerror("Error", "Load data first")
             return
         
         self.clear_canvas()
         try:
-            numeric_cols = self.df.select_dtypes(include=[np.number]).columns.tolist()
-            
-            if len(numeric_cols) == 0:
-                messagebox.showerror("Error", "No numeric columns found")
-                return
-            
-            fig = Figure(figsize=(10, 6), dpi=100)
-            ax = fig.add_subplot(111)
-            
-            for i, col in enumerate(numeric_cols[:3]):
-                ax.hist(self.df[col].dropna(), alpha=0.6, label=col, bins=15)
-            
-            ax.set_title('Histogram', fontweight='bold')
-            ax.set_xlabel('Value')
-            ax.set_ylabel('Frequency')
-            ax.legend()
-            ax.grid(True, alpha=0.3)
-            fig.tight_layout()
-            
-            self.current_figure = fig
-            self.current_canvas = FigureCanvasTkAgg(fig, self.canvas_container)
-            self.current_canvas.draw()
-            self.current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
+            self.display_chart(charts.build_histogram(df, self.primary_color, **self.chart_options(df)))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create histogram: {str(e)}")
     
     def show_pie_chart(self):
         """Show pie chart"""
-        if self.df is None:
+        df = self.df
+        if df is None:
             messagebox.showerror("Error", "Load data first")
             return
         
         self.clear_canvas()
         try:
-            categorical_cols = [col for col in self.df.columns if self.df[col].dtype == 'object']
-            
-            if not categorical_cols:
-                messagebox.showerror("Error", "No categorical columns found for pie chart")
-                return
-            
-            col = categorical_cols[0]
-            value_counts = self.df[col].value_counts().head(8)
-            
-            fig = Figure(figsize=(8, 6), dpi=100)
-            ax = fig.add_subplot(111)
-            
-            colors = plt.cm.Set3(np.linspace(0, 1, len(value_counts)))
-            ax.pie(value_counts.values, labels=value_counts.index, autopct='%1.1f%%',
-                  colors=colors, startangle=90)
-            ax.set_title(f'Pie Chart: {col}', fontweight='bold')
-            fig.tight_layout()
-            
-            self.current_figure = fig
-            self.current_canvas = FigureCanvasTkAgg(fig, self.canvas_container)
-            self.current_canvas.draw()
-            self.current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
+            self.display_chart(charts.build_pie_chart(df, self.primary_color, agg=self.chart_aggregation(),
+                                                      **self.chart_options(df)))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create pie chart: {str(e)}")
     
     def preview_data(self):
-        """Preview loaded data"""
-        if self.df is None:
+        """Preview loaded data in a virtual grid that only renders the visible cells"""
+        df = self.df
+        if df is None:
             messagebox.showinfo("Data Preview", "No data loaded yet.")
             return
         
+        view = table.TableView(df)
+        if view.n_columns == 0:
+            messagebox.showinfo("Data Preview", "The data has no columns.")
+            return
+        
         preview_window = tk.Toplevel(self.root)
         preview_window.title("Data Preview")
-        preview_window.geometry("800x500")
-        
-        text_widget = tk.Text(preview_window, wrap=tk.NONE)
-        text_widget.pack(fill=tk.BOTH, expand=True)
-        
-        text_widget.insert(tk.END, f"Data Shape: {self.df.shape}\n")
-        text_widget.insert(tk.END, f"Columns: {list(self.df.columns)}\n")
-        text_widget.insert(tk.END, "="*80 + "\n\n")
-        text_widget.insert(tk.END, "First 20 rows:\n")
-        text_widget.insert(tk.END, str(self.df.head(20)))
+        preview_window.geometry("1000x560")
+        
+        n_slots = min(self.PREVIEW_COLUMNS, view.n_columns)
+        slots = [f'c{i}' for i in range(n_slots)]
+        state = {'row': 0, 'column': 0, 'page_rows': 20}
+        
+        filter_bar = ttk.Frame(preview_window)
+        filter_bar.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Label(filter_bar, text="Filter:").pack(side=tk.LEFT)
+        filter_combo = ttk.Combobox(filter_bar, values=view.columns, state="readonly", width=20)
+        filter_combo.current(0)
+        filter_combo.pack(side=tk.LEFT, padx=5)
+        filter_text = tk.StringVar()
+        filter_entry = ttk.Entry(filter_bar, textvariable=filter_text, width=24)
+        filter_entry.pack(side=tk.LEFT, padx=5)
+        
+        info_label = ttk.Label(filter_bar, foreground=self.text_light)
+        
+        grid_frame = ttk.Frame(preview_window)
+        grid_frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        grid_frame.rowconfigure(0, weight=1)
+        grid_frame.columnconfigure(0, weight=1)
+        
+        tree = ttk.Treeview(grid_frame, columns=slots, selectmode='browse')
+        tree.heading('#0', text='Index')
+        tree.column('#0', width=90, stretch=False)
+        for slot in slots:
+            tree.column(slot, width=110, anchor=tk.E)
+        
+        def render():
+            n_rows = view.n_rows
+            page_rows = state['page_rows']
+            state['row'] = max(0, min(state['row'], n_rows - page_rows))
+            state['column'] = max(0, min(state['column'], view.n_columns - n_slots))
+            
+            labels, cells = view.page(state['row'], page_rows, state['column'], n_slots)
+            for i, slot in enumerate(slots):
+                position = state['column'] + i
+                arrow = ''
+                if view.sort_column == position:
+                    arrow = ' ▲' if view.sort_ascending else ' ▼'
+                tree.heading(slot, text=view.columns[position] + arrow,
+                             command=lambda p=position: sort_by(p))
+            
+            # A fixed set of row items is reused; only their values change
+            items = tree.get_children()
+            for i, (label, values) in enumerate(zip(labels, cells)):
+                if i < len(items):
+                    tree.item(items[i], text=label, values=values)
+                else:
+                    tree.insert('', tk.END, text=label, values=values)
+            if len(items) > len(cells):
+                tree.delete(*items[len(cells):])
+            
+            if n_rows:
+                v_scroll.set(state['row'] / n_rows, (state['row'] + len(cells)) / n_rows)
+            else:
+                v_scroll.set(0, 1)
+            h_scroll.set(state['column'] / view.n_columns, (state['column'] + n_slots) / view.n_columns)
+            
+            first = state['row'] + 1 if cells else 0
+            info_label.config(text=f"Rows {first:,}–{state['row'] + len(cells):,} of {n_rows:,} "
+                                   f"(total {len(df):,}) · {view.n_columns:,} columns")
         
-        text_widget.config(state=tk.DISABLED)
+        def scroll_command(key, total, page):
+            def command(action, amount, unit=None):
+                if action == 'moveto':
+                    state[key] = int(float(amount) * total())
+                else:
+                    state[key] += int(amount) * (page() if unit == 'pages' else 1)
+                render()
+            return command
+        
+        def on_wheel(event):
+            if getattr(event, 'num', None) == 4:
+                step = -3
+            elif getattr(event, 'num', None) == 5:
+                step = 3
+            else:
+                step = -3 if event.delta > 0 else 3
+            state['row'] += step
+            render()
+            return "break"
+        
+        def on_resize(event):
+            page_rows = max(1, (event.height - 25) // 20)
+            if page_rows != state['page_rows']:
+                state['page_rows'] = page_rows
+                render()
+        
+        def apply_view_change(change):
+            try:
+                change()
+            except Exception as e:
+                messagebox.showerror("Error", str(e), parent=preview_window)
+            state['row'] = 0
+            render()
+        
+        def sort_by(position):
+            ascending = not (view.sort_column == position and view.sort_ascending)
+            apply_view_change(lambda: view.sort(position, ascending))
+        
+        def apply_filter(event=None):
+            apply_view_change(lambda: view.set_filter(filter_combo.current(), filter_text.get()))
+        
+        def reset_view():
+            filter_text.set("")
+            apply_view_change(view.reset)
+        
+        ttk.Button(filter_bar, text="Apply", command=apply_filter, style='Secondary.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(filter_bar, text="Reset", command=reset_view, style='Secondary.TButton').pack(side=tk.LEFT, padx=5)
+        info_label.pack(side=tk.RIGHT)
+        filter_entry.bind('<Return>', apply_filter)
+        
+        v_scroll = ttk.Scrollbar(grid_frame, orient=tk.VERTICAL,
+                                 command=scroll_command('row', lambda: view.n_rows, lambda: state['page_rows']))
+        h_scroll = ttk.Scrollbar(grid_frame, orient=tk.HORIZONTAL,
+                                 command=scroll_command('column', lambda: view.n_columns, lambda: n_slots))
+        tree.grid(row=0, column=0, sticky="nsew")
+        v_scroll.grid(row=0, column=1, sticky="ns")
+        h_scroll.grid(row=1, column=0, sticky="ew")
+        
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            tree.bind(sequence, on_wheel)
+        tree.bind('<Configure>', on_resize)
+        render()
     
     def generate_sample_data(self):
         """Generate sample regression data"""
         try:
-            np.random.seed(42)
-            n_samples = 100
-            
-            X = np.random.randn(n_samples, 3)
-            coefficients = np.array([2.5, -1.2, 0.8])
-            y = X @ coefficients + np.random.randn(n_samples) * 0.5
-            
-            self.X = pd.DataFrame(X, columns=['Feature_1', 'Feature_2', 'Feature_3'])
-            self.y = pd.Series(y, name='Target')
+            self.X, self.y = dataset.generate_regression_sample()
+            self.feature_pipeline = None
+            if self.compact_precision.get():
+                self.X = dataset.downcast_features(self.X)
             
             self.custom_data_loaded = True
             self.data_features = self.X.columns.tolist()
+            self.store_regression_data("Generated Sample", "generated")
             
             status_text = f"✓ Sample Data Generated | {len(self.X)} samples, {len(self.X.columns)} features"
             self.lr_label.config(text=status_text, foreground=self.success_color)
@@ -987,31 +1343,30 @@ class MatrixGUI:
             messagebox.showerror("Error", f"Failed to generate data: {str(e)}")
     
     def show_residuals(self):
-        """Show residual plot"""
+        """Show residual diagnostics: residuals vs predicted, histogram, Q-Q, leverage and variance tests"""
         if self.model is None:
             messagebox.showerror("Error", "Please train the model first")
             return
         
         self.clear_lr_canvas()
         try:
-            residuals = self.y_test - self.predictions
-            
-            fig = Figure(figsize=(10, 6), dpi=100)
-            ax = fig.add_subplot(111)
-            
-            ax.scatter(self.predictions, residuals, alpha=0.5, color=self.primary_color, s=10)
-            ax.axhline(y=0, color='r', linestyle='--', lw=2)
-            ax.set_title('Residual Plot', fontsize=12, fontweight='bold')
-            ax.set_xlabel('Predicted Values')
-            ax.set_ylabel('Residuals')
-            ax.grid(True, alpha=0.3)
-            
-            fig.tight_layout()
+            results = diagnostics.residual_diagnostics(self.active_run, self.split)
+            fig = diagnostics.build_diagnostics_figure(results, self.primary_color, f'{self.model_name} Residuals')
+            self.display_lr_chart(fig)
             
-            self.lr_current_figure = fig
-            self.lr_current_canvas = FigureCanvasTkAgg(fig, self.lr_canvas_container)
-            self.lr_current_canvas.draw()
-            self.lr_current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+    
+    def show_feature_residuals(self):
+        """Show binned residuals against the features most related to the residual spread"""
+        if self.model is None:
+            messagebox.showerror("Error", "Please train the model first")
+            return
+        
+        self.clear_lr_canvas()
+        try:
+            features = diagnostics.feature_residuals(self.active_run, self.split)
+            self.display_lr_chart(diagnostics.build_feature_residuals_figure(features, self.primary_color))
             
         except Exception as e:
             messagebox.showerror("Error", str(e))
@@ -1023,9 +1378,13 @@ class MatrixGUI:
             return
         
         try:
-            mse = mean_squared_error(self.y_test, self.predictions)
-            mae = mean_absolute_error(self.y_test, self.predictions)
-            r2 = r2_score(self.y_test, self.predictions)
+            run = self.active_run
+            metrics = run['metrics']
+            if run['metrics_ci'] is None:
+                run['metrics_ci'] = model.bootstrap_metric_intervals(self.y_test, self.predictions)
+            ci = run['metrics_ci']
+            
+            mse, mae, r2 = metrics['mse'], metrics['mae'], metrics['r2']
             
             metrics_text = f"""
             ╔══════════════════════════════════╗
@@ -1035,6 +1394,11 @@ class MatrixGUI:
             ║ Mean Absolute Error: {mae:10.4f} ║
             ║ R² Score:            {r2:10.4f}  ║
             ╠══════════════════════════════════╣
+            ║ 95% Bootstrap Intervals:         ║
+            ║ MSE: [{ci['mse'][0]:10.4f}, {ci['mse'][1]:10.4f}]   ║
+            ║ MAE: [{ci['mae'][0]:10.4f}, {ci['mae'][1]:10.4f}]   ║
+            ║ R²:  [{ci['r2'][0]:10.4f}, {ci['r2'][1]:10.4f}]   ║
+            ╠══════════════════════════════════╣
             ║ Interpretation:                  ║
             ║ • R² = {r2:.2%} of variance      ║
             ║   explained by model             ║
@@ -1146,22 +1510,17 @@ class MatrixGUI:
                     messagebox.showerror("Error", "Rows and Columns must be positive")
                     return
                 
-                text = text_widget.get("1.0", tk.END).strip()
-                elements = []
-                for line in text.split('\n'):
-                    if line.strip():
-                        row = [float(x) for x in line.replace(',', ' ').split()]
-                        elements.append(row)
+                matrix = parse_matrix_text(text_widget.get("1.0", tk.END))
                 
-                if len(elements) != rows:
+                if matrix.shape[0] != rows:
                     messagebox.showerror("Error", f"Expected {rows} rows")
                     return
                 
-                if any(len(row) != cols for row in elements):
+                if matrix.shape[1] != cols:
                     messagebox.showerror("Error", f"Each row must have {cols} columns")
                     return
                 
-                self.matrix_result = np.array(elements)
+                self.matrix_result = matrix
                 messagebox.showinfo("Success", f"{matrix_name} saved!")
                 dialog.destroy()
             except ValueError as e:
@@ -1196,110 +1555,286 @@ class MatrixGUI:
         self.result_text.insert("1.0", str(result))
         self.result_text.config(state=tk.DISABLED)
     
-    def matrix_add(self):
-        if self.matrix_a is None or self.matrix_b is None:
-            messagebox.showerror("Error", "Both matrices needed")
-            return
-        if self.matrix_a.shape != self.matrix_b.shape:
-            messagebox.showerror("Error", "Same dimensions required")
+    def run_matrix_operation(self, op, a, b, title):
+        try:
+            result = matrix_operation(op, a, b)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
             return
-        result = self.matrix_a + self.matrix_b
-        self.display_result(f"A + B:\n{result}")
+        if op == 'determinant':
+            self.display_result(f"{title}: {result}")
+        else:
+            self.display_result(f"{title}:\n{result}")
+    
+    def matrix_add(self):
+        self.run_matrix_operation('add', self.matrix_a, self.matrix_b, "A + B")
     
     def matrix_subtract(self):
-        if self.matrix_a is None or self.matrix_b is None:
-            messagebox.showerror("Error", "Both matrices needed")
-            return
-        if self.matrix_a.shape != self.matrix_b.shape:
-            messagebox.showerror("Error", "Same dimensions required")
-            return
-        result = self.matrix_a - self.matrix_b
-        self.display_result(f"A - B:\n{result}")
+        self.run_matrix_operation('subtract', self.matrix_a, self.matrix_b, "A - B")
     
     def matrix_multiply(self):
-        if self.matrix_a is None or self.matrix_b is None:
-            messagebox.showerror("Error", "Both matrices needed")
-            return
-        if self.matrix_a.shape[1] != self.matrix_b.shape[0]:
-            messagebox.showerror("Error", "Column of A must equal row of B")
-            return
-        result = np.dot(self.matrix_a, self.matrix_b)
-        self.display_result(f"A × B:\n{result}")
+        self.run_matrix_operation('multiply', self.matrix_a, self.matrix_b, "A × B")
     
     def transpose_a(self):
         if self.matrix_a is None:
             messagebox.showerror("Error", "Matrix A not loaded")
             return
-        result = self.matrix_a.T
-        self.display_result(f"Transpose of A:\n{result}")
+        self.run_matrix_operation('transpose', self.matrix_a, None, "Transpose of A")
     
     def transpose_b(self):
         if self.matrix_b is None:
             messagebox.showerror("Error", "Matrix B not loaded")
             return
-        result = self.matrix_b.T
-        self.display_result(f"Transpose of B:\n{result}")
+        self.run_matrix_operation('transpose', self.matrix_b, None, "Transpose of B")
     
     def determinant_a(self):
         if self.matrix_a is None:
             messagebox.showerror("Error", "Matrix A not loaded")
             return
-        if self.matrix_a.shape[0] != self.matrix_a.shape[1]:
-            messagebox.showerror("Error", "Must be square")
-            return
-        try:
-            det = np.linalg.det(self.matrix_a)
-            self.display_result(f"Determinant of A: {det}")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        self.run_matrix_operation('determinant', self.matrix_a, None, "Determinant of A")
     
     def determinant_b(self):
         if self.matrix_b is None:
             messagebox.showerror("Error", "Matrix B not loaded")
             return
-        if self.matrix_b.shape[0] != self.matrix_b.shape[1]:
-            messagebox.showerror("Error", "Must be square")
-            return
+        self.run_matrix_operation('determinant', self.matrix_b, None, "Determinant of B")
+    
+    def get_workspace(self):
+        """The shared dataset workspace, created on first use"""
+        if self.datasets is None:
+            self.datasets = workspace.Workspace(on_evict=self.on_dataset_evicted)
+        return self.datasets
+    
+    @property
+    def df(self):
+        """The visualization dataset, looked up in the workspace on each use.
+        
+        The GUI keeps only its name, so a dataset spilled to disk is really
+        freed and is mapped back in the next time a chart needs it.
+        """
+        if self.datasets is None or self.dataset_name not in self.datasets.names():
+            return None
+        return self.datasets.get(self.dataset_name)
+    
+    def start_column_summaries(self, df):
+        """Start computing the column aggregates of the visualization dataset df, replacing any earlier ones"""
+        if self.column_summaries is not None:
+            if self.column_summaries.df is df:
+                return
+            self.column_summaries.cancel()
+        self.column_summaries = summary.ColumnSummaries(df, exact=self.exact_statistics.get()).start()
+    
+    def on_dataset_evicted(self, name):
+        """Drop the column aggregates' reference to an evicted or removed visualization dataset"""
+        if name == self.dataset_name and self.column_summaries is not None:
+            self.column_summaries.cancel()
+            self.column_summaries = None
+    
+    def store_dataset(self, name, df, source=None):
+        """Add a dataset to the workspace, making it available to both tabs"""
+        self.get_workspace().add(name, df, source)
+        self.dataset_combo.config(values=self.datasets.names())
+        if name == self.dataset_name:
+            # Replacing the visualization dataset swaps its aggregates too
+            self.start_column_summaries(df)
+        return df
+    
+    def store_regression_data(self, name, source=None):
+        """Add the regression features and target to the workspace as one dataset"""
+        self.store_dataset(name, workspace.join_columns(self.X, self.y), source)
+    
+    def select_dataset(self):
+        """Show the workspace dataset picked in the visualization tab"""
+        name = self.dataset_var.get()
         try:
-            det = np.linalg.det(self.matrix_b)
-            self.display_result(f"Determinant of B: {det}")
+            df = self.get_workspace().get(name)
+            self.set_dataset(df, name)
+            self.data_label.config(text=f"✓ {name}\n{len(df)} rows, {df.shape[1]} columns", foreground=self.success_color)
+            self.status_label.config(text=f"Dataset: {name}")
         except Exception as e:
-            messagebox.showerror("Error", str(e))
+            messagebox.showerror("Error", f"Failed to open dataset: {str(e)}")
+    
+    def show_workspace_panel(self):
+        """List workspace datasets with their memory state and set the memory budget"""
+        ws = self.get_workspace()
+        window = tk.Toplevel(self.root)
+        window.title("Workspace")
+        window.geometry("640x360")
+        
+        tree = ttk.Treeview(window, columns=('rows', 'columns', 'size', 'state'), height=10)
+        for column, heading, width in (('rows', 'Rows', 100), ('columns', 'Columns', 80),
+                                       ('size', 'Size (MB)', 100), ('state', 'State', 100)):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, anchor=tk.E)
+        
+        budget_var = tk.StringVar(value=f"{ws.memory_budget / 1e6:.0f}")
+        usage_label = ttk.Label(window, foreground=self.text_light)
+        
+        def refresh():
+            tree.delete(*tree.get_children())
+            for info in reversed(ws.info()):
+                tree.insert('', tk.END, iid=info['name'], text=info['name'],
+                            values=(f"{info['rows']:,}", info['columns'], f"{info['nbytes'] / 1e6:.1f}",
+                                    "in memory" if info['resident'] else "on disk"))
+            usage_label.config(text=f"{ws.resident_bytes / 1e6:.1f} MB in memory of {ws.memory_budget / 1e6:.0f} MB budget · "
+                                    f"cache: {ws.cache_dir}")
+            self.dataset_combo.config(values=ws.names())
+        
+        def apply_budget():
+            try:
+                ws.set_memory_budget(int(float(budget_var.get()) * 1e6))
+            except ValueError:
+                messagebox.showerror("Error", "Enter the budget in MB", parent=window)
+            refresh()
+        
+        def remove_selected():
+            for name in tree.selection():
+                ws.remove(name)
+                self.on_dataset_evicted(name)
+            refresh()
+        
+        tree.heading('#0', text='Dataset')
+        tree.column('#0', width=180)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        controls = ttk.Frame(window)
+        controls.pack(fill=tk.X, padx=10)
+        ttk.Label(controls, text="Memory budget (MB):").pack(side=tk.LEFT)
+        ttk.Entry(controls, textvariable=budget_var, width=10).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Apply", command=apply_budget, style='Secondary.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="🗑️ Remove", command=remove_selected, style='Secondary.TButton').pack(side=tk.RIGHT, padx=5)
+        ttk.Button(controls, text="🔄 Refresh", command=refresh, style='Secondary.TButton').pack(side=tk.RIGHT, padx=5)
+        usage_label.pack(anchor=tk.W, padx=10, pady=10)
+        refresh()
+    
+    def set_dataset(self, df, name):
+        """Make workspace dataset `name` (df) the visualization dataset and start computing its column aggregates"""
+        self.dataset_var.set(name)
+        self.dataset_name = name
+        self.start_column_summaries(df)
+        
+        self.column_listbox.delete(0, tk.END)
+        for col in df.columns:
+            self.column_listbox.insert(tk.END, str(col))
+    
+    def toggle_exact_statistics(self):
+        if self.column_summaries is not None:
+            self.column_summaries.exact = self.exact_statistics.get()
+    
+    def chart_aggregation(self):
+        """Bar/pie aggregation, or None to let the chart choose (sum for bars, count for pies)"""
+        agg = self.aggregation_var.get()
+        return None if agg == "auto" else agg
+    
+    def chart_options(self, df):
+        """Selected columns (None for automatic) and the aggregate cache of df, as chart builder keywords"""
+        if self.column_summaries is None:
+            # The aggregates were dropped when df was evicted; df is mapped back in now
+            self.start_column_summaries(df)
+        selection = self.column_listbox.curselection()
+        columns = [df.columns[i] for i in selection] if selection else None
+        return {'columns': columns, 'summaries': self.column_summaries}
     
     def load_sample_data(self):
         try:
-            sample_data = {
-                'Product': ['Laptop', 'Mouse', 'Monitor', 'Keyboard', 'Webcam', 'Headset'],
-                'Category': ['Electronics', 'Accessories', 'Electronics', 'Accessories', 'Accessories', 'Accessories'],
-                'Units_Sold': [50, 150, 80, 120, 90, 110],
-                'Revenue': [60000, 3750, 24000, 9000, 4500, 8800]
-            }
-            self.df = pd.DataFrame(sample_data)
-            
-            numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-            avg_info = "\n".join([f"{col}: {self.df[col].mean():.2f}" for col in numeric_cols])
-            
-            self.data_label.config(text=f"✓ {len(self.df)} products loaded\nAverage:\n{avg_info}", 
+            df = self.store_dataset("Sample Sales", dataset.sample_sales_data(), "built-in")
+            self.set_dataset(df, "Sample Sales")
+            
+            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            avg_info = "\n".join([f"{col}: {df[col].mean():.2f}" for col in numeric_cols])
+            
+            self.data_label.config(text=f"✓ {len(df)} products loaded\nAverage:\n{avg_info}", 
                                   foreground=self.success_color)
             self.status_label.config(text="Sample data ready")
             messagebox.showinfo("Success", f"Sample data loaded!\n\nAverages:\n{avg_info}")
         except Exception as e:
             messagebox.showerror("Error", str(e))
     
+    def load_csv_progressive(self):
+        """Load a data file in chunks on a background thread, drawing a live chart as the chunks arrive"""
+        file = filedialog.askopenfilename(filetypes=self.DATA_FILETYPES)
+        if not file:
+            return
+        
+        kind = self.progressive_chart_var.get()
+        self.clear_canvas()
+        fig = mpl_figure.Figure(figsize=(10, 6), dpi=100)
+        ax = fig.add_subplot(111)
+        self.display_chart(fig)
+        canvas = self.current_canvas
+        
+        lock = threading.Lock()
+        state = {'chart': None, 'chunks': [], 'rows': 0, 'dirty': False, 'done': False, 'error': None}
+        
+        def load():
+            try:
+                for chunk in dataset.read_dataset_chunks(file):
+                    with lock:
+                        if state['chart'] is None:
+                            state['chart'] = progressive.PROGRESSIVE_CHARTS[kind](chunk)
+                        state['chart'].update(chunk)
+                        state['chunks'].append(chunk)
+                        state['rows'] += len(chunk)
+                        state['dirty'] = True
+            except Exception as e:
+                state['error'] = e
+            finally:
+                state['done'] = True
+        
+        def redraw():
+            with lock:
+                if state['dirty']:
+                    state['chart'].draw(ax)
+                    state['dirty'] = False
+                    changed = True
+                else:
+                    changed = False
+            if changed and canvas is self.current_canvas:
+                fig.tight_layout()
+                canvas.draw_idle()
+        
+        def tick():
+            # Read 'done' before redrawing: once it is set every chunk is in the
+            # chart, so this last redraw also draws chunks that arrived after the previous one
+            done = state['done']
+            redraw()
+            if not done:
+                self.status_label.config(text=f"Loading… {state['rows']:,} rows")
+                self.root.after(self.PROGRESSIVE_FRAME_MS, tick)
+                return
+            
+            if state['error'] is not None:
+                messagebox.showerror("Error", str(state['error']))
+                return
+            try:
+                name = os.path.basename(file)
+                df = dataset.combine_chunks(state['chunks'])
+                state['chunks'].clear()
+                self.set_dataset(self.store_dataset(name, df, file), name)
+                self.data_label.config(text=f"✓ {len(df)} rows", foreground=self.success_color)
+                self.status_label.config(text="CSV loaded")
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+        
+        threading.Thread(target=load, name='progressive-load', daemon=True).start()
+        self.root.after(self.PROGRESSIVE_FRAME_MS, tick)
+    
     def load_csv(self):
-        file = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+        file = filedialog.askopenfilename(filetypes=self.DATA_FILETYPES)
         if file:
             try:
-                self.df = pd.read_csv(file)
+                name = os.path.basename(file)
+                df = self.store_dataset(name, dataset.read_dataset(file), file)
+                self.set_dataset(df, name)
                 
-                numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+                numeric_cols = df.select_dtypes(include=[np.number]).columns
                 if len(numeric_cols) > 0:
-                    avg_info = "\n".join([f"{col}: {self.df[col].mean():.2f}" for col in numeric_cols])
-                    self.data_label.config(text=f"✓ {len(self.df)} rows\nAverage:\n{avg_info}", 
+                    avg_info = "\n".join([f"{col}: {df[col].mean():.2f}" for col in numeric_cols])
+                    self.data_label.config(text=f"✓ {len(df)} rows\nAverage:\n{avg_info}", 
                                           foreground=self.success_color)
                     messagebox.showinfo("Success", f"CSV loaded successfully!\n\nAverages:\n{avg_info}")
                 else:
-                    self.data_label.config(text=f"✓ {len(self.df)} rows (no numeric columns)", 
+                    self.data_label.config(text=f"✓ {len(df)} rows (no numeric columns)", 
                                           foreground=self.success_color)
                     messagebox.showinfo("Success", "CSV loaded successfully (no numeric columns)")
                 
@@ -1308,126 +1843,46 @@ class MatrixGUI:
                 messagebox.showerror("Error", str(e))
     
     def show_bar_chart(self):
-        if self.df is None:
+        df = self.df
+        if df is None:
             messagebox.showerror("Error", "Load data first")
             return
+        
         self.clear_canvas()
         try:
-            categorical_col = None
-            numeric_col = None
-            
-            for col in self.df.columns:
-                if categorical_col is None and self.df[col].dtype == 'object':
-                    categorical_col = col
-                if numeric_col is None and self.df[col].dtype in [np.number, np.int64, np.float64]:
-                    numeric_col = col
-            
-            if categorical_col is None or numeric_col is None:
-                messagebox.showerror("Error", "CSV must have categorical and numeric columns")
-                return
-            
-            fig = Figure(figsize=(10, 6), dpi=100)
-            ax = fig.add_subplot(111)
-            ax.bar(self.df[categorical_col], self.df[numeric_col], color=self.primary_color)
-            ax.set_title(f'{numeric_col} by {categorical_col}', fontweight='bold')
-            ax.set_ylabel(numeric_col)
-            ax.tick_params(axis='x', rotation=45)
-            ax.grid(True, alpha=0.3)
-            fig.tight_layout()
-            
-            self.current_figure = fig
-            self.current_canvas = FigureCanvasTkAgg(fig, self.canvas_container)
-            self.current_canvas.draw()
-            self.current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
+            self.display_chart(charts.build_bar_chart(df, self.primary_color, agg=self.chart_aggregation(),
+                                                      **self.chart_options(df)))
         except Exception as e:
             messagebox.showerror("Error", str(e))
     
     def show_scatter_plot(self):
-        if self.df is None:
+        df = self.df
+        if df is None:
             messagebox.showerror("Error", "Load data first")
             return
+        
         self.clear_canvas()
         try:
-            numeric_cols = self.df.select_dtypes(include=[np.number]).columns.tolist()
-            
-            if len(numeric_cols) < 2:
-                messagebox.showerror("Error", "CSV needs at least 2 numeric columns")
-                return
-            
-            x_col = numeric_cols[0]
-            y_col = numeric_cols[1]
-            
-            categorical_col = None
-            for col in self.df.columns:
-                if self.df[col].dtype == 'object':
-                    categorical_col = col
-                    break
-            
-            fig = Figure(figsize=(10, 6), dpi=100)
-            ax = fig.add_subplot(111)
-            
-            if categorical_col is not None:
-                for category in self.df[categorical_col].unique():
-                    cat_data = self.df[self.df[categorical_col] == category]
-                    ax.scatter(cat_data[x_col], cat_data[y_col], label=str(category), s=100, alpha=0.6)
-                ax.legend()
-            else:
-                ax.scatter(self.df[x_col], self.df[y_col], s=100, alpha=0.6, color=self.primary_color)
-            
-            ax.set_title(f'{y_col} vs {x_col}', fontweight='bold')
-            ax.set_xlabel(x_col)
-            ax.set_ylabel(y_col)
-            ax.grid(True, alpha=0.3)
-            fig.tight_layout()
-            
-            self.current_figure = fig
-            self.current_canvas = FigureCanvasTkAgg(fig, self.canvas_container)
-            self.current_canvas.draw()
-            self.current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
+            self.display_chart(charts.build_scatter_plot(df, self.primary_color, **self.chart_options(df)))
         except Exception as e:
             messagebox.showerror("Error", str(e))
     
     def show_heatmap(self):
-        if self.df is None:
+        df = self.df
+        if df is None:
             messagebox.showerror("Error", "Load data first")
             return
+        
         self.clear_canvas()
         try:
-            fig = Figure(figsize=(10, 6), dpi=100)
-            ax = fig.add_subplot(111)
-            
-            numeric_df = self.df.select_dtypes(include=[np.number])
-            corr = numeric_df.corr()
-            
-            im = ax.imshow(corr, cmap='Blues', aspect='auto')
-            ax.set_xticks(range(len(corr.columns)))
-            ax.set_yticks(range(len(corr.columns)))
-            ax.set_xticklabels(corr.columns, rotation=45, ha='right')
-            ax.set_yticklabels(corr.columns)
-            ax.set_title('Correlation Heatmap', fontweight='bold')
-            
-            for i in range(len(corr)):
-                for j in range(len(corr)):
-                    ax.text(j, i, f'{corr.iloc[i, j]:.2f}', ha='center', va='center', 
-                           color='white' if abs(corr.iloc[i, j]) > 0.5 else 'black', fontsize=9)
-            
-            fig.colorbar(im, ax=ax)
-            fig.tight_layout()
-            
-            self.current_figure = fig
-            self.current_canvas = FigureCanvasTkAgg(fig, self.canvas_container)
-            self.current_canvas.draw()
-            self.current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
+            self.display_chart(charts.build_heatmap(df, self.primary_color, **self.chart_options(df)))
         except Exception as e:
             messagebox.showerror("Error", str(e))
     
     def load_custom_regression_data(self):
         file_path = filedialog.askopenfilename(
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-            title="Select CSV file for regression"
+            filetypes=self.DATA_FILETYPES,
+            title="Select data file for regression"
         )
         
         if not file_path:
@@ -1436,19 +1891,20 @@ class MatrixGUI:
         try:
             dialog = tk.Toplevel(self.root)
             dialog.title("Select Target Column")
-            dialog.geometry("400x250")
+            dialog.geometry("400x380")
             dialog.transient(self.root)
             dialog.grab_set()
             
-            df = pd.read_csv(file_path)
+            sample = dataset.sniff_file(file_path)
             self.target_column = tk.StringVar()
             
             ttk.Label(dialog, text="Select the target column (dependent variable):", 
                      font=('Segoe UI', 10, 'bold')).pack(pady=15)
             
             combo = ttk.Combobox(dialog, textvariable=self.target_column, 
-                                values=df.columns.tolist(), state='readonly', width=30)
+                                values=sample.columns.tolist(), state='readonly', width=30)
             combo.pack(pady=10)
+            feature_options = self.add_feature_options(dialog)
             
             def confirm_selection():
                 if not self.target_column.get():
@@ -1457,20 +1913,13 @@ class MatrixGUI:
                 
                 target_col = self.target_column.get()
                 try:
-                    if target_col not in df.columns:
-                        raise ValueError(f"Column '{target_col}' not found")
-                    
-                    df_clean = df.dropna()
-                    self.X = df_clean.drop(target_col, axis=1)
-                    self.y = df_clean[target_col]
-                    
-                    self.X = self.X.select_dtypes(include=[np.number])
-                    
-                    if len(self.X.columns) == 0:
-                        raise ValueError("No numeric features found in the data")
+                    feature_dtype = np.float32 if self.compact_precision.get() else np.float64
+                    df = dataset.load_feature_frame(file_path, target_col, sample, feature_dtype)
+                    self.engineer_regression_data(df, target_col, feature_dtype, feature_options())
                     
                     self.custom_data_loaded = True
                     self.data_features = self.X.columns.tolist()
+                    self.store_regression_data(f"{os.path.basename(file_path)} [{target_col}]", file_path)
                     
                     status_text = f"✓ Custom Data Loaded | {len(self.X)} samples, {len(self.X.columns)} features"
                     self.lr_label.config(text=status_text, foreground=self.success_color)
@@ -1485,19 +1934,94 @@ class MatrixGUI:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load file: {str(e)}")
     
+    def load_workspace_regression_data(self):
+        """Use a dataset already in the workspace for regression, without re-reading it"""
+        if self.datasets is None or not self.datasets.names():
+            messagebox.showinfo("Workspace", "No datasets loaded yet.")
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Select Dataset and Target")
+        dialog.geometry("400x430")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        dataset_var = tk.StringVar()
+        target_var = tk.StringVar()
+        
+        ttk.Label(dialog, text="Dataset:", font=('Segoe UI', 10, 'bold')).pack(pady=(15, 5))
+        dataset_combo = ttk.Combobox(dialog, textvariable=dataset_var, values=self.datasets.names(),
+                                     state='readonly', width=30)
+        dataset_combo.pack(pady=5)
+        
+        ttk.Label(dialog, text="Target column (dependent variable):", font=('Segoe UI', 10, 'bold')).pack(pady=(15, 5))
+        target_combo = ttk.Combobox(dialog, textvariable=target_var, state='readonly', width=30)
+        target_combo.pack(pady=5)
+        feature_options = self.add_feature_options(dialog)
+        
+        def dataset_selected(event=None):
+            df = self.datasets.get(dataset_var.get())
+            target_combo.config(values=df.select_dtypes(include=[np.number]).columns.tolist())
+            target_var.set("")
+        
+        def confirm_selection():
+            if not dataset_var.get() or not target_var.get():
+                messagebox.showerror("Error", "Please select a dataset and a target column", parent=dialog)
+                return
+            try:
+                df = self.datasets.get(dataset_var.get())
+                feature_dtype = np.float32 if self.compact_precision.get() else np.float64
+                self.engineer_regression_data(df, target_var.get(), feature_dtype, feature_options())
+                
+                self.custom_data_loaded = True
+                self.data_features = self.X.columns.tolist()
+                
+                status_text = f"✓ {dataset_var.get()} | {len(self.X)} samples, {len(self.X.columns)} features"
+                self.lr_label.config(text=status_text, foreground=self.success_color)
+                dialog.destroy()
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to load data: {str(e)}", parent=dialog)
+        
+        dataset_combo.bind('<<ComboboxSelected>>', dataset_selected)
+        ttk.Button(dialog, text="Confirm", command=confirm_selection).pack(pady=15)
+    
+    def add_feature_options(self, dialog):
+        """Feature engineering checkboxes for a regression data dialog; returns a function giving their keywords"""
+        encode_text = tk.BooleanVar(value=True)
+        interactions = tk.BooleanVar(value=False)
+        impute = tk.StringVar(value='mean')
+        indicators = tk.BooleanVar(value=False)
+        ttk.Checkbutton(dialog, text="Encode text columns (one-hot / target encoding)",
+                        variable=encode_text).pack(anchor=tk.W, padx=40)
+        ttk.Checkbutton(dialog, text="Add pairwise interaction features",
+                        variable=interactions).pack(anchor=tk.W, padx=40)
+        
+        impute_frame = ttk.Frame(dialog)
+        impute_frame.pack(anchor=tk.W, padx=40)
+        ttk.Label(impute_frame, text="Fill missing values with:").pack(side=tk.LEFT)
+        ttk.Combobox(impute_frame, textvariable=impute, values=features.IMPUTE_STRATEGIES,
+                     state='readonly', width=10).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(dialog, text="Add missing-value indicator features",
+                        variable=indicators).pack(anchor=tk.W, padx=40)
+        return lambda: {'encode_text': encode_text.get(), 'interactions': interactions.get(),
+                        'impute': impute.get(), 'indicators': indicators.get()}
+    
+    def engineer_regression_data(self, df, target_col, feature_dtype, options):
+        """Build self.X / self.y from raw columns with the feature pipeline (cached per dataset)"""
+        self.X, self.y, self.feature_pipeline = features.engineer_features(df, target_col, feature_dtype, **options)
+    
     def load_predefined_data(self):
         try:
             self.lr_label.config(text="Loading predefined data...", foreground=self.accent_color)
             self.root.update()
             
-            data = fetch_california_housing()
-            df = pd.DataFrame(data.data, columns=data.feature_names)
-            df['Price'] = data.target
-            
-            self.X = df.drop('Price', axis=1)
-            self.y = df['Price']
+            self.X, self.y = dataset.load_california_housing()
+            self.feature_pipeline = None
+            if self.compact_precision.get():
+                self.X = dataset.downcast_features(self.X)
             self.custom_data_loaded = False
-            self.data_features = data.feature_names
+            self.data_features = self.X.columns.tolist()
+            self.store_regression_data("California Housing", "built-in")
             
             status_text = f"✓ Predefined Data Loaded | {len(self.X)} samples, {len(self.X.columns)} features"
             self.lr_label.config(text=status_text, foreground=self.success_color)
@@ -1507,41 +2031,119 @@ class MatrixGUI:
             self.lr_label.config(text=f"Error: {str(e)}", foreground=self.accent_color)
             messagebox.showerror("Error", f"Failed to load data: {str(e)}")
     
+    def split_regression_data(self):
+        """Split self.X / self.y into train and test sets and fit the scaler"""
+        dtype = np.float32 if self.compact_precision.get() else np.float64
+        self.split = model.split_regression(self.X, self.y, dtype=dtype, pipeline=self.feature_pipeline)
+        
+        self.feature_names = self.split['feature_names']
+        self.scaler = self.split['scaler']
+        self.X_test = self.split['X_test']
+        self.y_train = self.split['y_train']
+        self.y_test = self.split['y_test']
+    
+    def fit_estimator(self, name):
+        """Fit a registered estimator on the current split"""
+        return model.fit_registered_estimator(name, self.split, self.memory_budget_fraction)
+    
+    def use_run(self, run):
+        """Make a fitted run record the active model"""
+        self.active_run = run
+        self.model_name = run['name']
+        self.model = run['model']
+        self.fused_model = run['fused_model']
+        self.predictions = run['predictions']
+    
     def train_regression_model(self):
         if self.X is None or self.y is None:
             messagebox.showerror("Error", "Please load data first (Predefined or Custom)")
             return
         
         try:
-            self.lr_label.config(text="Training model... Please wait", foreground=self.accent_color)
+            name = self.estimator_var.get()
+            self.lr_label.config(text=f"Training {name}... Please wait", foreground=self.accent_color)
             self.root.update()
             
-            self.feature_names = self.X.columns.tolist()
+            self.split_regression_data()
+            run = self.fit_estimator(name)
+            if run is None:
+                self.lr_label.config(text=f"Skipped {name}: exceeds memory budget", foreground=self.accent_color)
+                messagebox.showerror("Error", f"{name} is estimated to exceed the available memory budget for this dataset")
+                return
             
-            self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
-                self.X, self.y, test_size=0.2, random_state=42
-            )
+            self.model_runs.append(run)
+            self.use_run(run)
+            
+            metrics = run['metrics']
+            mse, mae, r2 = metrics['mse'], metrics['mae'], metrics['r2']
+            
+            status_text = f"✓ {name} Trained | MAE: {mae:,.4f} | MSE: {mse:.4f} | R²: {r2:.4f} | Fit: {run['fit_time']:.2f}s"
+            self.lr_label.config(text=status_text, foreground=self.success_color)
+            messagebox.showinfo("Success", f"Model trained successfully!\nR² Score: {r2:.4f}\nMAE: {mae:,.4f}")
+            
+        except Exception as e:
+            self.lr_label.config(text=f"Error: {str(e)}", foreground=self.accent_color)
+            messagebox.showerror("Error", f"Failed to train model: {str(e)}")
+    
+    def compare_models(self):
+        """Fit every registered estimator and show accuracy vs cost"""
+        if self.X is None or self.y is None:
+            messagebox.showerror("Error", "Please load data first (Predefined or Custom)")
+            return
+        
+        try:
+            self.split_regression_data()
             
-            self.scaler = StandardScaler()
-            X_train_scaled = self.scaler.fit_transform(self.X_train)
-            X_test_scaled = self.scaler.transform(self.X_test)
+            runs = []
+            skipped = []
+            for name in model.ESTIMATOR_REGISTRY:
+                self.lr_label.config(text=f"Comparing models... fitting {name}", foreground=self.accent_color)
+                self.root.update()
+                
+                run = self.fit_estimator(name)
+                if run is None:
+                    skipped.append(name)
+                else:
+                    runs.append(run)
             
-            self.model = LinearRegression()
-            self.model.fit(X_train_scaled, self.y_train)
+            if not runs:
+                messagebox.showerror("Error", "No model fits in the available memory budget")
+                return
             
-            self.predictions = self.model.predict(X_test_scaled)
+            self.model_runs.extend(runs)
+            best = max(runs, key=lambda r: r['metrics']['r2'])
+            self.use_run(best)
+            self.estimator_var.set(best['name'])
+            
+            lines = [f"{'Model':<24}{'R²':>9}{'MAE':>11}{'Fit (s)':>10}{'Pred (ms)':>11}{'Fit MB':>9}",
+                     "─" * 74]
+            for run in sorted(runs, key=lambda r: -r['metrics']['r2']):
+                lines.append(f"{run['name']:<24}{run['metrics']['r2']:>9.4f}{run['metrics']['mae']:>11.4f}"
+                             f"{run['fit_time']:>10.3f}{run['predict_time'] * 1000:>11.2f}"
+                             f"{run['fit_memory'] / 1e6:>9.1f}")
+            for name in skipped:
+                lines.append(f"{name:<24}  skipped: exceeds memory budget")
+            lines.append("")
+            lines.append(f"Active model: {best['name']} (best R²)")
             
-            mse = mean_squared_error(self.y_test, self.predictions)
-            mae = mean_absolute_error(self.y_test, self.predictions)
-            r2 = r2_score(self.y_test, self.predictions)
+            self.clear_lr_canvas()
+            text_widget = tk.Text(self.lr_canvas_container,
+                                 font=("Consolas", 11),
+                                 bg=self.card_bg,
+                                 fg=self.text_color,
+                                 borderwidth=0,
+                                 padx=20,
+                                 pady=20)
+            text_widget.pack(fill=tk.BOTH, expand=True)
+            text_widget.insert(1.0, "\n".join(lines))
+            text_widget.config(state=tk.DISABLED)
             
-            status_text = f"✓ Model Trained | MAE: {mae:,.4f} | MSE: {mse:.4f} | R²: {r2:.4f}"
+            status_text = f"✓ Compared {len(runs)} models | Best: {best['name']} (R²: {best['metrics']['r2']:.4f})"
             self.lr_label.config(text=status_text, foreground=self.success_color)
-            messagebox.showinfo("Success", f"Model trained successfully!\nR² Score: {r2:.4f}\nMAE: {mae:,.4f}")
             
         except Exception as e:
             self.lr_label.config(text=f"Error: {str(e)}", foreground=self.accent_color)
-            messagebox.showerror("Error", f"Failed to train model: {str(e)}")
+            messagebox.showerror("Error", f"Failed to compare models: {str(e)}")
     
     def show_lr_predictions(self):
         if self.model is None:
@@ -1550,7 +2152,7 @@ class MatrixGUI:
         
         self.clear_lr_canvas()
         try:
-            fig = Figure(figsize=(10, 6), dpi=100)
+            fig = mpl_figure.Figure(figsize=(10, 6), dpi=100)
             ax = fig.add_subplot(111)
             
             ax.scatter(self.y_test, self.predictions, alpha=0.5, color=self.primary_color, s=10)
@@ -1565,47 +2167,78 @@ class MatrixGUI:
             
             fig.tight_layout()
             
-            self.lr_current_figure = fig
-            self.lr_current_canvas = FigureCanvasTkAgg(fig, self.lr_canvas_container)
-            self.lr_current_canvas.draw()
-            self.lr_current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            self.display_lr_chart(fig)
             
         except Exception as e:
             messagebox.showerror("Error", str(e))
     
     def show_feature_importance(self):
+        """Permutation importance on the test set, with standardized coefficients for linear models"""
         if self.model is None:
             messagebox.showerror("Error", "Please train the model first")
             return
+        if not hasattr(self, 'feature_names') or self.feature_names is None:
+            messagebox.showerror("Error", "Feature names not found. Please train the model again.")
+            return
         
         self.clear_lr_canvas()
-        try:
-            fig = Figure(figsize=(10, 6), dpi=100)
-            ax = fig.add_subplot(111)
-            
-            if not hasattr(self, 'feature_names') or self.feature_names is None:
-                messagebox.showerror("Error", "Feature names not found. Please train the model again.")
+        # Score on a worker thread so the window stays responsive; the run and
+        # names are captured now in case the model is retrained meanwhile
+        run, split = self.active_run, self.split
+        feature_names, model_name = self.feature_names, self.model_name
+        state = {'result': None, 'error': None}
+        
+        def compute():
+            try:
+                state['result'] = model.run_importance(run, split)
+            except Exception as e:
+                state['error'] = e
+        
+        def poll():
+            if thread.is_alive():
+                self.root.after(self.PROGRESSIVE_FRAME_MS, poll)
                 return
-            
-            if len(self.model.coef_) != len(self.feature_names):
-                messagebox.showerror("Error", f"Feature mismatch: Model has {len(self.model.coef_)} coefficients but {len(self.feature_names)} feature names. Please train the model again.")
+            if state['error'] is not None:
+                self.status_label.config(text="Permutation importance failed")
+                messagebox.showerror("Error", str(state['error']))
                 return
-            
-            coefficients = pd.Series(self.model.coef_, index=self.feature_names).sort_values()
-            coefficients.plot(kind='barh', ax=ax, color=self.primary_color)
-            ax.set_title('Feature Importance (Coefficients)', fontsize=12, fontweight='bold')
-            ax.set_xlabel('Coefficient Value')
+            try:
+                self.draw_feature_importance(state['result'], run['model'], feature_names)
+                self.status_label.config(text=f"{model_name}: baseline R² {state['result']['baseline']:.4f}")
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+        
+        self.status_label.config(text="Computing permutation importance…")
+        thread = threading.Thread(target=compute, name='permutation-importance', daemon=True)
+        thread.start()
+        self.root.after(self.PROGRESSIVE_FRAME_MS, poll)
+    
+    def draw_feature_importance(self, result, estimator, feature_names):
+        # Most important features first, at most IMPORTANCE_FEATURES of them
+        order = np.argsort(-result['mean'])[:self.IMPORTANCE_FEATURES][::-1]
+        names = [feature_names[j] for j in order]
+        
+        fig = mpl_figure.Figure(figsize=(10, 6), dpi=100)
+        coefficients = np.ravel(estimator.coef_) if hasattr(estimator, 'coef_') else None
+        ax = fig.add_subplot(121 if coefficients is not None else 111)
+        
+        ax.barh(names, result['mean'][order], xerr=result['std'][order], color=self.primary_color)
+        ax.set_title(f"Permutation Importance ({result['n_repeats']} repeats)", fontsize=12, fontweight='bold')
+        ax.set_xlabel('Decrease in R²')
+        ax.grid(True, alpha=0.3, axis='x')
+        
+        if coefficients is not None:
+            # The model was fitted on standardized features, so coef_ is already standardized
+            ax = fig.add_subplot(122, sharey=ax)
+            ax.barh(names, coefficients[order], color=self.secondary_color)
+            ax.set_title('Standardized Coefficients', fontsize=12, fontweight='bold')
+            ax.set_xlabel('Change per standard deviation')
+            ax.tick_params(labelleft=False)
             ax.grid(True, alpha=0.3, axis='x')
-            
-            fig.tight_layout()
-            
-            self.lr_current_figure = fig
-            self.lr_current_canvas = FigureCanvasTkAgg(fig, self.lr_canvas_container)
-            self.lr_current_canvas.draw()
-            self.lr_current_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        
+        fig.tight_layout()
+        
+        self.display_lr_chart(fig)
     
     def show_about(self):
         about_text = """📊 DATA ANALYSIS & VISUALIZATION TOOL
@@ -1692,4 +2325,6 @@ Built with Python, scikit-learn, pandas, and matplotlib.
 if __name__ == "__main__":
     root = tk.Tk()
     app = MatrixGUI(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    if app.datasets is not None:
+        app.datasets.close()
\ No newline at end of file
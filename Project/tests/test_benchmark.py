@@ -0,0 +1,23 @@
+"""Smoke test for the benchmark suite"""
+import benchmark
+from engine import model
+
+def benchmark_data():
+    from engine import dataset
+    n_rows, n_numeric, n_categorical, _ = benchmark.SIZES['small']
+    df = dataset.generate_synthetic_dataset(n_rows, n_numeric, n_categorical)
+    return df[[f'Feature_{i + 1}' for i in range(n_numeric)]], df['Target']
+
+def test_small_preset():
+    results = benchmark.benchmark_size('small', 1, ['Linear Regression'])
+    by_name = {r['name']: r for r in results}
+    
+    assert {'regression_split', 'train_Linear Regression', 'score_Linear Regression', 'metrics'} <= set(by_name)
+    assert any(name.startswith('chart_') for name in by_name)
+    assert any(name.startswith('matrix_') for name in by_name)
+    assert all(r['seconds_min'] <= r['seconds_median'] and r['peak_bytes'] >= 0 for r in results)
+    
+    # The outer measurement must include the fit's own (nested) peak
+    split = model.split_regression(*benchmark_data())
+    run = model.fit_registered_estimator('Linear Regression', split)
+    assert by_name['train_Linear Regression']['peak_bytes'] >= 0.9 * run['fit_memory']
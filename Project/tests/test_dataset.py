@@ -0,0 +1,119 @@
+"""Tests for CSV format sniffing and reading in engine.dataset"""
+import bz2
+import gzip
+import lzma
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine import dataset
+
+def write(tmp_path, data, name='data.csv'):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+@pytest.mark.parametrize('sep', [',', ';', '\t', '|'])
+def test_sniff_delimiter(tmp_path, sep):
+    rows = ['name,value,ratio', 'a,1,0.5', 'b,2,1.5', 'c,3,2.5']
+    path = write(tmp_path, '\n'.join(rows).replace(',', sep).encode())
+    assert dataset.sniff_format(path)['sep'] == sep
+
+@pytest.mark.parametrize('data, encoding', [
+    ('city,n\nZürich,1\n'.encode('utf-8'), 'utf-8'),
+    ('city,n\nZürich,1\n'.encode('utf-8-sig'), 'utf-8-sig'),
+    ('city,n\nZürich,1\n'.encode('latin-1'), 'latin-1'),
+])
+def test_sniff_encoding(tmp_path, data, encoding):
+    path = write(tmp_path, data)
+    assert dataset.sniff_format(path)['encoding'] == encoding
+    assert dataset.sniff_csv(path)['city'][0] == 'Zürich'
+
+def test_sniff_text_header(tmp_path):
+    path = write(tmp_path, b'x,y\n1,2\n3,4\n')
+    sample = dataset.sniff_csv(path)
+    assert list(sample.columns) == ['x', 'y']
+    assert len(sample) == 2
+
+def test_sniff_headerless_numbers(tmp_path):
+    path = write(tmp_path, b'1.5,2.25\n3.5,4.75\n5.5,6.25\n')
+    sample = dataset.sniff_csv(path)
+    assert list(sample.columns) == ['Column1', 'Column2']
+    assert len(sample) == 3
+
+def test_sniff_integer_header_over_float_data(tmp_path):
+    lines = ['2020,2021'] + [f'{i + 0.5},{i * 2 + 0.25}' for i in range(20)]
+    path = write(tmp_path, '\n'.join(lines).encode())
+    sample = dataset.sniff_csv(path)
+    assert list(sample.columns) == ['2020', '2021']
+    assert len(sample) == 20
+
+def frame():
+    return pd.DataFrame({
+        'id': np.arange(250),
+        'value': np.arange(250) / 8,
+        'group': np.tile(['a', 'b', 'c', 'd', 'e'], 50),
+    })
+
+def compress(tmp_path, data, compression):
+    path = tmp_path / f'data.{compression}'
+    if compression == 'gzip':
+        path.write_bytes(gzip.compress(data))
+    elif compression == 'bz2':
+        path.write_bytes(bz2.compress(data))
+    elif compression == 'xz':
+        path.write_bytes(lzma.compress(data))
+    else:
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr('data.csv', data)
+    return str(path)
+
+@pytest.mark.parametrize('compression', ['gzip', 'bz2', 'xz', 'zip'])
+def test_compressed_csv_detected_from_magic_bytes(tmp_path, compression):
+    df = frame()
+    path = compress(tmp_path, df.to_csv(index=False).encode(), compression)
+    with open(path, 'rb') as f:
+        head = f.read(6)
+    
+    magic = {name: magic for magic, name in dataset.COMPRESSION_MAGIC.items()}[compression]
+    assert head.startswith(magic)
+    assert dataset.csv_compression(path) == compression
+    assert dataset.file_format(path) == 'csv'
+    read = dataset.read_dataset(path)
+    assert read[['id', 'value']].equals(df[['id', 'value']])
+    assert read['group'].astype(str).tolist() == df['group'].tolist()
+
+@pytest.mark.parametrize('compression', ['gzip', 'bz2'])
+def test_compressed_csv_read_in_chunks(tmp_path, compression):
+    df = frame()
+    path = compress(tmp_path, df.to_csv(index=False).encode(), compression)
+    chunks = list(dataset.read_dataset_chunks(path, chunksize=100))
+    
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+    combined = dataset.combine_chunks(chunks)
+    assert combined[['id', 'value']].equals(df[['id', 'value']])
+    assert combined['group'].astype(str).tolist() == df['group'].tolist()
+
+def test_plain_csv_is_not_compressed(tmp_path):
+    path = write(tmp_path, frame().to_csv(index=False).encode())
+    assert dataset.csv_compression(path) is None
+
+def test_encode_categoricals():
+    df = pd.DataFrame({
+        'city': ['Paris', 'Oslo', None, 'Oslo', 'Lima', 'Paris'] * 10,
+        'label': pd.array(['x', 'y', 'x', None, 'y', 'x'] * 10, dtype='string'),
+        'code': [f'id{i}' for i in range(60)],
+        'value': np.arange(60.0),
+    })
+    encoded = dataset.encode_categoricals(df)
+    
+    assert list(encoded['city'].cat.categories) == ['Lima', 'Oslo', 'Paris']
+    pd.testing.assert_series_equal(encoded['city'].astype(df['city'].dtype), df['city'])
+    assert list(encoded['label'].cat.categories) == ['x', 'y']
+    assert encoded['label'].isna().sum() == 10
+    # Columns with too many distinct values and numeric columns stay as they are
+    for col in ('code', 'value'):
+        assert encoded[col].dtype == df[col].dtype
+    assert not isinstance(df['city'].dtype, pd.CategoricalDtype)
@@ -0,0 +1,86 @@
+"""Tests for the FeaturePipeline in engine.features"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine import features
+
+def raw_frame(n=1_000, seed=5):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'size': rng.normal(50.0, 10.0, n),
+        'rooms': rng.integers(1, 6, n).astype(np.float64),
+        'colour': rng.choice(['red', 'green', 'blue'], n),
+        'zip': rng.choice([f'z{i:03d}' for i in range(60)], n),
+    })
+    df['price'] = 3.0 * df['size'] + 10.0 * df['rooms'] + rng.normal(0.0, 5.0, n)
+    df.loc[::13, 'size'] = np.nan
+    df.loc[::17, 'colour'] = None
+    return df
+
+def fitted_pipeline(df, **options):
+    pipeline = features.FeaturePipeline(['size', 'rooms'], ['colour', 'zip'], indicators=True, **options)
+    pipeline.fit_transform(df, df['price'])
+    return pipeline
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(features, '_cache', features.collections.OrderedDict())
+
+def test_fitted_on_training_rows_only():
+    df = raw_frame()
+    X, y, pipeline = features.engineer_features(df, 'price', indicators=True)
+    train = df.iloc[pipeline.train_rows]
+    
+    assert len(pipeline.train_rows) + len(pipeline.test_rows) == len(df)
+    assert pipeline.fill['size'] == pytest.approx(train['size'].mean())
+    assert pipeline.fill['size'] != pytest.approx(df['size'].mean())
+    test = pipeline.transform(df.iloc[pipeline.test_rows])
+    assert np.allclose(X.iloc[pipeline.test_rows].to_numpy(), test.to_numpy())
+
+def test_target_encoding_is_out_of_fold():
+    df = raw_frame()
+    X = fitted_pipeline(df).fit_transform(df, df['price'])
+    changed = df['price'].copy()
+    changed.iloc[0] += 1e6
+    X_changed = fitted_pipeline(df).fit_transform(df, changed)
+    
+    assert 'zip_target' in X.columns
+    # A row's own target does not reach its encoding, but it does reach other rows of its category
+    assert X_changed['zip_target'].iloc[0] == pytest.approx(X['zip_target'].iloc[0])
+    same_zip = (df['zip'] == df['zip'].iloc[0]).to_numpy()
+    assert not np.allclose(X_changed['zip_target'][same_zip], X['zip_target'][same_zip])
+
+def test_unseen_and_missing_categories():
+    df = raw_frame()
+    pipeline = fitted_pipeline(df)
+    new = df.head(3).copy()
+    new['colour'] = ['purple', None, 'red']
+    new['zip'] = ['z999', None, 'z001']
+    X = pipeline.transform(new)
+    
+    colour = [name for name in X.columns if name.startswith('colour=')]
+    assert colour == ['colour=green', 'colour=red', 'colour=<missing>']
+    assert X.loc[new.index[0], colour].tolist() == [0, 0, 0]
+    assert X.loc[new.index[1], colour].tolist() == [0, 0, 1]
+    assert X.loc[new.index[2], colour].tolist() == [0, 1, 0]
+    assert X['zip_target'].iloc[0] == pytest.approx(pipeline.encoders['zip']['prior'])
+
+def test_sparse_matches_dense():
+    df = raw_frame()
+    pipeline = fitted_pipeline(df, interactions=True)
+    dense = pipeline.transform(df)
+    sparse = pipeline.transform(df, sparse=True)
+    
+    assert sparse.shape == dense.shape
+    assert np.allclose(sparse.toarray(), dense.to_numpy())
+
+def test_results_cached_by_fingerprint():
+    df = raw_frame()
+    first = features.engineer_features(df, 'price')
+    assert features.engineer_features(df.copy(), 'price') is first
+    
+    changed = df.copy()
+    changed.loc[0, 'rooms'] += 1
+    assert features.engineer_features(changed, 'price') is not first
+    assert features.engineer_features(df, 'price', interactions=True) is not first
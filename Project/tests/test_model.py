@@ -0,0 +1,17 @@
+"""Tests for the regression metrics in engine.model"""
+import numpy as np
+from sklearn.metrics import r2_score
+
+from engine import model
+
+def test_r2_with_large_target_offset():
+    rng = np.random.default_rng(0)
+    signal = rng.normal(size=5000)
+    y_true = 1e8 + signal
+    y_pred = 1e8 + 0.9 * signal + rng.normal(scale=0.5, size=signal.size)
+    expected = r2_score(y_true, y_pred)
+    
+    assert abs(model.regression_metrics(y_true, y_pred)['r2'] - expected) < 1e-6
+    
+    low, high = model.bootstrap_metric_intervals(y_true, y_pred, n_boot=200)['r2']
+    assert 0.5 < low < expected < high < 1.0
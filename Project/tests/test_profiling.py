@@ -0,0 +1,33 @@
+"""Tests for peak-memory measurement in engine.profiling and engine.model"""
+import numpy as np
+
+from engine import model
+from engine.profiling import tracer
+
+MB = 1 << 20
+
+def test_nested_measure_call_keeps_outer_peak():
+    def outer():
+        transient = np.ones(80 * MB, dtype=np.uint8)
+        del transient
+        _, _, inner_peak = model.measure_call(lambda: np.ones(MB, dtype=np.uint8))
+        return inner_peak
+    
+    inner_peak, _, outer_peak = model.measure_call(outer)
+    assert MB <= inner_peak < 10 * MB
+    assert outer_peak >= 80 * MB
+
+def test_span_peak_survives_nested_measure_call():
+    tracer.enable(track_memory=True)
+    try:
+        tracer.clear()
+        with tracer.span('outer'):
+            transient = np.ones(40 * MB, dtype=np.uint8)
+            del transient
+            model.measure_call(lambda: None)
+        record = tracer.spans[-1]
+    finally:
+        tracer.disable()
+        tracer.clear()
+    assert record['name'] == 'outer'
+    assert record['memory_peak'] >= 40 * MB
@@ -0,0 +1,39 @@
+"""Accuracy tests for the streaming statistics in engine.sketch"""
+import numpy as np
+
+from engine.sketch import StreamingHistogram, StreamingStats
+
+def streamed(values, chunks=7):
+    stats = StreamingStats()
+    for chunk in np.array_split(values, chunks):
+        stats.update(chunk)
+    return stats
+
+def test_quantiles_match_numpy():
+    values = np.random.default_rng(1).lognormal(size=200_000)
+    stats = streamed(values)
+    qs = np.linspace(0.01, 0.99, 21)
+    estimates = stats.sketch.quantiles(qs)
+    # Compare by rank: the fraction of the data below each estimate
+    ranks = np.searchsorted(np.sort(values), estimates) / values.size
+    assert np.abs(ranks - qs).max() < 0.01
+    assert np.allclose(estimates, np.quantile(values, qs), rtol=0.05)
+
+def test_histogram_matches_numpy():
+    values = np.random.default_rng(2).standard_normal(100_000)
+    stats = streamed(values)
+    counts, edges = stats.histogram.histogram(15, stats.min, stats.max)
+    expected, expected_edges = np.histogram(values, bins=15, range=(values.min(), values.max()))
+    
+    assert counts.sum() == values.size
+    assert np.allclose(edges, expected_edges)
+    # Only the values in the fine bin that straddles each coarse edge can land on the wrong side
+    assert np.all(np.abs(counts - expected) <= 2 * stats.histogram.counts.max())
+
+def test_first_chunk_keeps_full_resolution():
+    values = np.random.default_rng(3).uniform(10, 20, 10_000)
+    histogram = StreamingHistogram(resolution=1024)
+    histogram.update(values)
+    span = values.max() - values.min()
+    assert span < histogram.width * histogram.resolution < span * 1.01
+    assert histogram.counts[0] > 0 and histogram.counts[-1] > 0
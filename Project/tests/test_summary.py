@@ -0,0 +1,57 @@
+"""Tests for the grouped aggregates in engine.summary"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine import summary
+
+def sales():
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({
+        'region': rng.choice(list('ABCDEFGH'), 5_000),
+        'amount': rng.exponential(100.0, 5_000),
+    })
+    df.loc[::97, 'region'] = None
+    df.loc[::89, 'amount'] = np.nan
+    return df
+
+@pytest.mark.parametrize('agg', summary.AGGREGATIONS)
+def test_group_aggregate_matches_groupby(agg):
+    df = sales()
+    values = None if agg == 'count' else df['amount']
+    result = summary.group_aggregate(df['region'], values, agg)
+    
+    rows = df.dropna() if agg != 'count' else df.dropna(subset=['region'])
+    grouped = rows.groupby('region')['amount']
+    expected = grouped.size() if agg == 'count' else getattr(grouped, agg)()
+    assert list(result.index) == list(expected.sort_values(ascending=False).index)
+    assert np.allclose(result.to_numpy(), expected[result.index].to_numpy())
+
+@pytest.mark.parametrize('agg', summary.AGGREGATIONS)
+def test_group_aggregate_folds_the_rest_into_other(agg):
+    df = sales()
+    values = None if agg == 'count' else df['amount']
+    full = summary.group_aggregate(df['region'], values, agg)
+    top = summary.group_aggregate(df['region'], values, agg, top=3)
+    
+    assert list(top.index) == list(full.index[:3]) + [summary.OTHER_LABEL]
+    assert np.allclose(top.to_numpy()[:3], full.to_numpy()[:3])
+    rest = df.loc[df['region'].isin(full.index[3:]), 'amount']
+    other = len(rest) if agg == 'count' else getattr(rest, agg)()
+    assert np.isclose(top[summary.OTHER_LABEL], other)
+
+def test_group_aggregate_needs_values_for_sum():
+    with pytest.raises(ValueError):
+        summary.group_aggregate(sales()['region'], None, 'sum')
+
+def test_grouped_is_cached(monkeypatch):
+    summaries = summary.ColumnSummaries(sales())
+    calls = []
+    aggregate = summary.group_aggregate
+    monkeypatch.setattr(summary, 'group_aggregate', lambda *args: calls.append(args) or aggregate(*args))
+    
+    first = summaries.grouped('region', 'amount', 'mean', 3)
+    assert summaries.grouped('region', 'amount', 'mean', 3) is first
+    assert len(calls) == 1
+    summaries.grouped('region', 'amount', 'sum', 3)
+    assert len(calls) == 2
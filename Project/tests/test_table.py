@@ -0,0 +1,70 @@
+"""Tests for the virtual preview table in engine.table"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine import table
+
+def view():
+    df = pd.DataFrame({
+        'name': ['Pear', 'apple', None, 'Banana', 'pineapple', 'cherry'],
+        'price': [2.5, 1.0, 3.0, np.nan, 4.25, 1.0],
+        'stock': [10, 0, 7, 3, 12, 5],
+    }, index=[f'r{i}' for i in range(6)])
+    return table.TableView(df)
+
+def visible(v, column):
+    return [row[0] for row in v.page(0, v.n_rows, column, 1)[1]]
+
+@pytest.mark.parametrize('text, expected', [
+    ('>= 2.5', ['Pear', '', 'pineapple']),
+    ('< 2', ['apple', 'cherry']),
+    ('1', ['apple', 'cherry']),
+    ('!= 1', ['Pear', '', 'Banana', 'pineapple']),
+])
+def test_numeric_filter(text, expected):
+    v = view()
+    v.set_filter(1, text)
+    assert visible(v, 0) == expected
+
+def test_text_filter_is_case_insensitive_substring():
+    v = view()
+    v.set_filter(0, 'APPLE')
+    assert visible(v, 0) == ['apple', 'pineapple']
+    v.set_filter(2, '> 5')
+    assert visible(v, 0) == ['pineapple']
+    v.set_filter(0, ' ')
+    assert visible(v, 0) == ['Pear', '', 'pineapple']
+
+def test_bad_numeric_filter():
+    with pytest.raises(ValueError):
+        view().set_filter(1, '> cheap')
+
+@pytest.mark.parametrize('column, ascending, expected', [
+    (1, True, ['1', '1', '2.5', '3', '4.25', '']),
+    (1, False, ['4.25', '3', '2.5', '1', '1', '']),
+    (0, True, ['Banana', 'Pear', 'apple', 'cherry', 'pineapple', '']),
+    (0, False, ['pineapple', 'cherry', 'apple', 'Pear', 'Banana', '']),
+])
+def test_sort_puts_missing_last(column, ascending, expected):
+    v = view()
+    v.sort(column, ascending)
+    assert visible(v, column) == expected
+
+def test_sort_is_stable_within_filter():
+    v = view()
+    v.set_filter(2, '>= 5')
+    v.sort(1)
+    labels, _ = v.page(0, 10, 0, 1)
+    assert labels == ['r5', 'r0', 'r2', 'r4']
+    v.reset()
+    assert v.n_rows == 6 and v.order is None
+
+def test_page_returns_only_the_requested_block():
+    v = view()
+    v.sort(2, ascending=False)
+    labels, cells = v.page(1, 2, 1, 2)
+    assert labels == ['r0', 'r2']
+    assert cells == [['2.5', '10'], ['3', '7']]
+    assert v.page(6, 5, 0, 3) == ([], [])
+    assert v.page(4, 5, 0, 1)[0] == ['r3', 'r1']
@@ -0,0 +1,21 @@
+"""Tests for the engine.workspace disk cache"""
+import numpy as np
+import pandas as pd
+
+from engine import workspace
+
+def test_cache_round_trip_keeps_dtypes(tmp_path):
+    df = pd.DataFrame({
+        'count': pd.array([1, None, 3], dtype='Int64'),
+        'ratio': pd.array([0.5, None, 2.0], dtype='Float64'),
+        'flag': pd.array([True, None, False], dtype='boolean'),
+        'label': pd.array(['a', None, 'c'], dtype='string'),
+        'group': pd.Categorical(['x', 'y', 'x']),
+        'value': np.array([1.0, 2.0, 3.0]),
+        'when': pd.to_datetime(['2020-01-01', None, '2021-06-30']),
+    })
+    workspace.save_dataset_dir(df, tmp_path)
+    loaded = workspace.load_dataset_dir(tmp_path)
+    
+    assert loaded.dtypes.equals(df.dtypes)
+    assert loaded.equals(df)